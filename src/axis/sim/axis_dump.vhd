@@ -0,0 +1,69 @@
+--##############################################################################
+--# File : axis_dump.vhd
+--# Auth : David Gussler
+--# ============================================================================
+--# Shrikebyte VHDL Library - https://github.com/shrikebyte/sblib
+--# Copyright (C) Shrikebyte, LLC
+--# Licensed under the Apache 2.0 license, see LICENSE for details.
+--# ============================================================================
+--# Passive AXIS monitor that writes every accepted beat to a binary file, so
+--# that a stream can be checked offline, after the simulation, by the Python
+--# models in tools/models. See tools/models/axis_dump.py for the file format.
+--##############################################################################
+
+library ieee;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+use work.axis_pkg.all;
+use work.axis_file_pkg.all;
+
+entity axis_dump is
+  generic (
+    G_FILE_NAME : string
+  );
+  port (
+    clk : in    std_ulogic;
+    --
+    mon_axis : view mon_axis_v;
+    --
+    -- Number of packets that have been written to the file
+    num_packets : out   natural := 0
+  );
+end entity;
+
+architecture sim of axis_dump is
+
+  constant DW  : integer := mon_axis.tdata'length;
+  constant KW  : integer := mon_axis.tkeep'length;
+  constant UW  : integer := mon_axis.tuser'length;
+  constant DBW : integer := DW / KW;
+  constant UBW : integer := UW / KW;
+
+begin
+
+  -- ---------------------------------------------------------------------------
+  prc_dump : process is
+    file     f     : byte_file_t;
+    variable count : natural := 0;
+  begin
+
+    file_open(f, G_FILE_NAME, write_mode);
+    write_header(f, KW, DBW, UBW);
+    flush(f);
+
+    loop
+      wait until rising_edge(clk);
+      if mon_axis.tvalid = '1' and mon_axis.tready = '1' then
+        write_beat(f, mon_axis.tlast, mon_axis.tkeep, mon_axis.tdata, mon_axis.tuser);
+
+        if mon_axis.tlast = '1' then
+          flush(f);
+          count       := count + 1;
+          num_packets <= count;
+        end if;
+      end if;
+    end loop;
+
+  end process;
+
+end architecture;
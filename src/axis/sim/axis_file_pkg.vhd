@@ -0,0 +1,233 @@
+--##############################################################################
+--# File : axis_file_pkg.vhd
+--# Auth : David Gussler
+--# ============================================================================
+--# Shrikebyte VHDL Library - https://github.com/shrikebyte/sblib
+--# Copyright (C) Shrikebyte, LLC
+--# Licensed under the Apache 2.0 license, see LICENSE for details.
+--# ============================================================================
+--# Reading and writing AXIS beat files. A file holds one record per beat,
+--# with its tlast, tkeep, tdata and tuser. It is written by axis_dump and
+--# bfm_axis_sub, and streamed onto a bus by bfm_axis_man. See
+--# tools/models/axis_dump.py for the file format and the Python side.
+--##############################################################################
+
+library ieee;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+
+package axis_file_pkg is
+
+  type byte_file_t is file of character;
+
+  constant AXIS_FILE_VERSION : natural := 1;
+
+  -- Write the file header for a bus with KW lanes of DBW data bits and UBW
+  -- user bits each
+  procedure write_header (
+    file f : byte_file_t;
+    kw     : natural;
+    dbw    : natural;
+    ubw    : natural
+  );
+
+  -- Read the file header and check that it matches the bus
+  procedure read_header (
+    file f    : byte_file_t;
+    file_name : string;
+    kw        : natural;
+    dbw       : natural;
+    ubw       : natural
+  );
+
+  procedure write_beat (
+    file f : byte_file_t;
+    last   : std_ulogic;
+    keep   : std_ulogic_vector;
+    data   : std_ulogic_vector;
+    user   : std_ulogic_vector
+  );
+
+  -- Read the next beat. The caller checks endfile first.
+  procedure read_beat (
+    file f : byte_file_t;
+    last   : out std_ulogic;
+    keep   : out std_ulogic_vector;
+    data   : out std_ulogic_vector;
+    user   : out std_ulogic_vector
+  );
+
+end package;
+
+package body axis_file_pkg is
+
+  procedure write_byte (
+    file f : byte_file_t;
+    value  : natural
+  ) is
+  begin
+    write(f, character'val(value));
+  end procedure;
+
+  impure function read_byte (
+    file f : byte_file_t
+  ) return natural is
+    variable c : character;
+  begin
+    read(f, c);
+    return character'pos(c);
+  end function;
+
+  procedure write_u16 (
+    file f : byte_file_t;
+    value  : natural
+  ) is
+  begin
+    write_byte(f, value mod 256);
+    write_byte(f, value / 256);
+  end procedure;
+
+  impure function read_u16 (
+    file f : byte_file_t
+  ) return natural is
+    variable low : natural;
+  begin
+    low := read_byte(f);
+    return low + 256 * read_byte(f);
+  end function;
+
+  -- Write a vector as little endian bytes, zero padded to a whole byte.
+  -- Meta values are written as zero.
+  procedure write_bits (
+    file f : byte_file_t;
+    bits   : std_ulogic_vector
+  ) is
+    variable padded : std_ulogic_vector(8 * ((bits'length + 7) / 8) - 1 downto 0) := (others => '0');
+  begin
+    padded(bits'length - 1 downto 0) := to_01(bits);
+    for i in 0 to padded'length / 8 - 1 loop
+      write_byte(f, to_integer(unsigned(padded(8 * i + 7 downto 8 * i))));
+    end loop;
+  end procedure;
+
+  procedure read_bits (
+    file f : byte_file_t;
+    bits   : out std_ulogic_vector
+  ) is
+    variable padded : std_ulogic_vector(8 * ((bits'length + 7) / 8) - 1 downto 0);
+  begin
+    for i in 0 to padded'length / 8 - 1 loop
+      padded(8 * i + 7 downto 8 * i) := std_ulogic_vector(to_unsigned(read_byte(f), 8));
+    end loop;
+    bits := padded(bits'length - 1 downto 0);
+  end procedure;
+
+  procedure write_header (
+    file f : byte_file_t;
+    kw     : natural;
+    dbw    : natural;
+    ubw    : natural
+  ) is
+  begin
+    write_byte(f, character'pos('S'));
+    write_byte(f, character'pos('B'));
+    write_byte(f, character'pos('A'));
+    write_byte(f, character'pos('X'));
+    write_byte(f, AXIS_FILE_VERSION);
+    write_byte(f, 0);
+    write_byte(f, 0);
+    write_byte(f, 0);
+    write_u16(f, kw);
+    write_u16(f, dbw);
+    write_u16(f, ubw);
+    write_u16(f, 0);
+  end procedure;
+
+  procedure read_header (
+    file f    : byte_file_t;
+    file_name : string;
+    kw        : natural;
+    dbw       : natural;
+    ubw       : natural
+  ) is
+    variable magic    : string(1 to 4);
+    variable version  : natural;
+    variable reserved : natural;
+    variable dims     : integer_vector(0 to 3);
+  begin
+    for i in magic'range loop
+      magic(i) := character'val(read_byte(f));
+    end loop;
+    version := read_byte(f);
+    for i in 1 to 3 loop
+      reserved := read_byte(f);
+    end loop;
+    for i in dims'range loop
+      dims(i) := read_u16(f);
+    end loop;
+
+    assert magic = "SBAX"
+      report file_name & ": not an AXIS file"
+      severity failure;
+    assert version = AXIS_FILE_VERSION
+      report file_name & ": unsupported AXIS file version " & to_string(version)
+      severity failure;
+    assert dims(0) = kw and dims(1) = dbw and dims(2) = ubw
+      report file_name & ": file is for KW=" & to_string(dims(0)) & ", DBW=" &
+             to_string(dims(1)) & ", UBW=" & to_string(dims(2)) & ", but the bus has KW=" &
+             to_string(kw) & ", DBW=" & to_string(dbw) & ", UBW=" & to_string(ubw)
+      severity failure;
+  end procedure;
+
+  procedure write_beat (
+    file f : byte_file_t;
+    last   : std_ulogic;
+    keep   : std_ulogic_vector;
+    data   : std_ulogic_vector;
+    user   : std_ulogic_vector
+  ) is
+    constant KW  : natural := keep'length;
+    constant DBW : natural := data'length / KW;
+    constant UBW : natural := user'length / KW;
+    -- Normalize the ranges, the lanes are indexed from 0
+    constant D : std_ulogic_vector(data'length - 1 downto 0) := data;
+    constant U : std_ulogic_vector(user'length - 1 downto 0) := user;
+  begin
+    write_bits(f, (0 => last));
+    write_bits(f, keep);
+    for i in 0 to KW - 1 loop
+      write_bits(f, D(DBW * i + DBW - 1 downto DBW * i));
+    end loop;
+    for i in 0 to KW - 1 loop
+      write_bits(f, U(UBW * i + UBW - 1 downto UBW * i));
+    end loop;
+  end procedure;
+
+  procedure read_beat (
+    file f : byte_file_t;
+    last   : out std_ulogic;
+    keep   : out std_ulogic_vector;
+    data   : out std_ulogic_vector;
+    user   : out std_ulogic_vector
+  ) is
+    constant KW    : natural := keep'length;
+    constant DBW   : natural := data'length / KW;
+    constant UBW   : natural := user'length / KW;
+    variable flags : std_ulogic_vector(7 downto 0);
+    variable d     : std_ulogic_vector(data'length - 1 downto 0);
+    variable u     : std_ulogic_vector(user'length - 1 downto 0);
+  begin
+    read_bits(f, flags);
+    last := flags(0);
+    read_bits(f, keep);
+    for i in 0 to KW - 1 loop
+      read_bits(f, d(DBW * i + DBW - 1 downto DBW * i));
+    end loop;
+    for i in 0 to KW - 1 loop
+      read_bits(f, u(UBW * i + UBW - 1 downto UBW * i));
+    end loop;
+    data := d;
+    user := u;
+  end procedure;
+
+end package body;
@@ -0,0 +1,149 @@
+--##############################################################################
+--# File : axis_perf_mon.vhd
+--# Auth : David Gussler
+--# ============================================================================
+--# Shrikebyte VHDL Library - https://github.com/shrikebyte/sblib
+--# Copyright (C) Shrikebyte, LLC
+--# Licensed under the Apache 2.0 license, see LICENSE for details.
+--# ============================================================================
+--# Passive performance monitor for a stream that passes through a module,
+--# such as a FIFO or a CDC. It logs the timing of every packet on the input
+--# and output handshakes, and every change of the module's fill level, to a
+--# text file. tools/sim_perf.py turns the log into throughput, latency and
+--# occupancy figures after the simulation.
+--#
+--# Log format, one event per line:
+--#   S <first cycle> <last cycle> <beats> <time of the first beat>
+--#     A packet was accepted at the input
+--#   M <first cycle> <last cycle> <beats> <time of the first beat>
+--#     A packet was accepted at the output. The first cycle and time are
+--#     when its first beat became valid, rather than when it was accepted.
+--#   D <cycle> <depth spec> <depth comm>
+--#     The fill level changed
+--# Cycles count rising edges of the clock of the same side, and the depth is
+--# sampled on s_clk. Times are written with their unit, e.g. "1250 ps".
+--##############################################################################
+
+library ieee;
+use ieee.std_logic_1164.all;
+use std.textio.all;
+
+entity axis_perf_mon is
+  generic (
+    G_FILE_NAME : string
+  );
+  port (
+    s_clk   : in    std_ulogic;
+    s_valid : in    std_ulogic;
+    s_ready : in    std_ulogic;
+    -- Tie high for streams without packets, so that every beat is a packet
+    s_last : in    std_ulogic := '1';
+    --
+    m_clk   : in    std_ulogic;
+    m_valid : in    std_ulogic;
+    m_ready : in    std_ulogic;
+    m_last  : in    std_ulogic := '1';
+    --
+    -- Fill level of the module, in the s_clk domain
+    depth_spec : in    natural := 0;
+    depth_comm : in    natural := 0
+  );
+end entity;
+
+architecture sim of axis_perf_mon is
+
+  file f : text open write_mode is G_FILE_NAME;
+
+  -- Write one packet event
+  procedure write_packet (
+    kind        : character;
+    first_cycle : natural;
+    last_cycle  : natural;
+    beats       : natural;
+    first_time  : time
+  ) is
+    variable l : line;
+  begin
+    write(l, kind);
+    write(l, ' ');
+    write(l, first_cycle);
+    write(l, ' ');
+    write(l, last_cycle);
+    write(l, ' ');
+    write(l, beats);
+    write(l, ' ');
+    write(l, first_time, unit => ps);
+    writeline(f, l);
+  end procedure;
+
+begin
+
+  -- ---------------------------------------------------------------------------
+  prc_s : process is
+    variable cycle       : natural := 0;
+    variable first_cycle : natural := 0;
+    variable first_time  : time    := 0 ns;
+    variable beats       : natural := 0;
+    variable spec        : integer := -1;
+    variable comm        : integer := -1;
+    variable l           : line;
+  begin
+    wait until rising_edge(s_clk);
+    cycle := cycle + 1;
+
+    if s_valid = '1' and s_ready = '1' then
+      if beats = 0 then
+        first_cycle := cycle;
+        first_time  := now;
+      end if;
+      beats := beats + 1;
+      if s_last = '1' then
+        write_packet('S', first_cycle, cycle, beats, first_time);
+        beats := 0;
+      end if;
+    end if;
+
+    if depth_spec /= spec or depth_comm /= comm then
+      spec := depth_spec;
+      comm := depth_comm;
+      write(l, 'D');
+      write(l, ' ');
+      write(l, cycle);
+      write(l, ' ');
+      write(l, spec);
+      write(l, ' ');
+      write(l, comm);
+      writeline(f, l);
+    end if;
+  end process;
+
+  -- ---------------------------------------------------------------------------
+  prc_m : process is
+    variable cycle       : natural := 0;
+    variable first_cycle : natural := 0;
+    variable first_time  : time    := 0 ns;
+    variable beats       : natural := 0;
+    variable waiting     : boolean := false;
+  begin
+    wait until rising_edge(m_clk);
+    cycle := cycle + 1;
+
+    -- The first beat of a packet is timed from when it becomes valid
+    if m_valid = '1' and beats = 0 and not waiting then
+      first_cycle := cycle;
+      first_time  := now;
+      waiting     := true;
+    end if;
+
+    if m_valid = '1' and m_ready = '1' then
+      beats := beats + 1;
+      if m_last = '1' then
+        write_packet('M', first_cycle, cycle, beats, first_time);
+        flush(f);
+        beats   := 0;
+        waiting := false;
+      end if;
+    end if;
+  end process;
+
+end architecture;
@@ -42,6 +42,16 @@
 -- just as for the regular data.
 -- The length of packets must be the same as what is pushed to the ``data_queue``.
 --
+--
+-- Packet files
+-- ____________
+--
+-- Instead of the queues, the BFM can stream the beats of a packet file written by
+-- ``tools/models/axis_traffic.py`` or ``axis_dump``. Set ``G_FILE_NAME`` to the path of
+-- the file. Every beat is sent as it is in the file, including its ``tkeep``, so
+-- ``G_PACKED_STREAM`` has no effect. The beats are read as they are sent, so the size
+-- of the file does not matter. Only the handshake stalls are random in this mode.
+--
 -- -------------------------------------------------------------------------------------------------
 
 library ieee;
@@ -60,13 +70,15 @@ use vunit_lib.run_types_pkg.all;
 use work.util_pkg.all;
 use work.axis_pkg.all;
 use work.bfm_pkg.all;
+use work.axis_file_pkg.all;
 
 entity bfm_axis_man is
   generic (
     -- Push data (integer_array_t with push_ref()) to this queue.
     -- The integer arrays will be deallocated after this BFM is done with them.
     -- Each entry to this array is one "byte" of data in a packet.
-    G_DATA_QUEUE : queue_t;
+    -- Not used if G_FILE_NAME is set.
+    G_DATA_QUEUE : queue_t := null_queue;
     -- Push auxiliary user data (integer_array_t with push_ref()) to this queue.
     -- Must be the same length as data queue.
     -- The integer arrays will be deallocated after this BFM is done with them.
@@ -82,7 +94,10 @@ entity bfm_axis_man is
     G_STALL_CONFIG : stall_configuration_t := zero_stall_configuration;
     -- Suffix for error log messages. Can be used to differentiate between
     -- multiple instances.
-    G_LOGGER_NAME_SUFFIX : string := ""
+    G_LOGGER_NAME_SUFFIX : string := "";
+    -- If set - Send the beats of this packet file instead of the packets
+    -- pushed to the queues.
+    G_FILE_NAME : string := ""
   );
   port (
     clk : in    std_ulogic;
@@ -141,6 +156,42 @@ begin
     variable seed                     : string_seed_t;
     variable rnd                      : randomptype;
     variable num_bytes_in_this_beat   : integer         := 0;
+
+    -- Send every beat of the packet file
+    procedure send_file is
+      file     f    : byte_file_t;
+      variable last : std_ulogic;
+      variable keep : std_ulogic_vector(KW - 1 downto 0);
+      variable data : std_ulogic_vector(DW - 1 downto 0);
+      variable user : std_ulogic_vector(UW - 1 downto 0);
+    begin
+      file_open(f, G_FILE_NAME, read_mode);
+      read_header(f, G_FILE_NAME, KW, DBW, UBW);
+
+      while not endfile(f) loop
+        read_beat(f, last, keep, data, user);
+
+        data_is_valid  <= '1';
+        int_axis_tlast <= last;
+        int_axis_tkeep <= keep;
+        int_axis_tdata <= data;
+        int_axis_tuser <= user;
+
+        wait until m_axis.tready = '1' and m_axis.tvalid = '1' and rising_edge(clk);
+
+        if last = '1' then
+          num_packets_sent <= num_packets_sent + 1;
+        end if;
+      end loop;
+
+      file_close(f);
+      data_is_valid  <= '0';
+      int_axis_tlast <= '0';
+      int_axis_tkeep <= (others => '0');
+      int_axis_tdata <= (others => DRIVE_INVALID_VALUE);
+      int_axis_tuser <= (others => DRIVE_INVALID_VALUE);
+    end procedure;
+
   begin
 
     -- Use salt so that parallel instances of this entity get unique random
@@ -148,6 +199,11 @@ begin
     get_seed(seed, salt=> bfm_axis_man'path_name);
     rnd.InitSeed(seed);
 
+    if G_FILE_NAME /= "" then
+      send_file;
+      wait;
+    end if;
+
     loop
 
       while is_empty(G_DATA_QUEUE) loop
@@ -47,6 +47,15 @@
 -- ``user_width`` to a non-zero value and pushing reference data to the ``reference_user_queue``.
 -- Reference user data should be a :doc:`VUnit integer_array <vunit:data_types/integer_array>` just
 -- as for the regular data.
+--
+--
+-- Packet files
+-- ____________
+--
+-- Instead of checking against the queues, the BFM can capture every beat that it accepts to a
+-- packet file, to be checked offline by the Python models in ``tools/models``.
+-- Set ``G_FILE_NAME`` to the path of the file. Nothing is checked in this mode, other than the
+-- AXI-Stream protocol, and ``num_packets_checked`` counts the packets that have been captured.
 -- -------------------------------------------------------------------------------------------------
 
 library ieee;
@@ -65,7 +74,8 @@ entity bfm_axis_sub is
   generic (
     -- Push reference data (integer_array_t with push_ref()) to this queue.
     -- The integer arrays will be deallocated after this BFM is done with them.
-    G_REF_DATA_QUEUE : queue_t;
+    -- Not used if G_FILE_NAME is set.
+    G_REF_DATA_QUEUE : queue_t := null_queue;
     -- Push reference 'user' for each data beat to this queue.
     -- One value for each 'user' byte in each beat.
     -- If 'user_width' is zero, no check will be performed and nothing shall be pushed to
@@ -93,7 +103,10 @@ entity bfm_axis_sub is
     G_WELL_BEHAVED_STALL : boolean := false;
     -- For buses that do not have the 'last' indicator, the check for 'last' on the last beat of
     -- data can be disabled.
-    G_ENABLE_TLAST : boolean := true
+    G_ENABLE_TLAST : boolean := true;
+    -- If set - Capture every accepted beat to this packet file instead of
+    -- checking against the queues.
+    G_FILE_NAME : string := ""
   );
   port (
     clk : in    std_ulogic;
@@ -132,6 +145,8 @@ architecture sim of bfm_axis_sub is
   signal int_axis_tdata : std_ulogic_vector(DW - 1 downto 0);
   signal int_axis_tuser : std_ulogic_vector(UW - 1 downto 0);
 
+  signal num_packets_captured : natural := 0;
+
 begin
 
   assert DW mod KW = 0
@@ -157,6 +172,14 @@ begin
     variable num_bytes_in_this_beat   : integer         := 0;
   begin
 
+    if G_FILE_NAME /= "" then
+      checker_is_ready <= '1';
+      loop
+        wait on num_packets_captured;
+        num_packets_checked <= num_packets_captured;
+      end loop;
+    end if;
+
     while is_empty(G_REF_DATA_QUEUE) or enable /= '1' loop
       wait until rising_edge(clk);
     end loop;
@@ -281,6 +304,23 @@ begin
     mon_axis => mon_axis
   );
 
+  ------------------------------------------------------------------------------
+  gen_capture : if G_FILE_NAME /= "" generate
+
+    u_axis_dump : entity work.axis_dump
+    generic map (
+      G_FILE_NAME => G_FILE_NAME
+    )
+    port map (
+      clk => clk,
+      --
+      mon_axis => mon_axis,
+      --
+      num_packets => num_packets_captured
+    );
+
+  end generate;
+
   mon_axis.tready <= s_axis.tready;
   mon_axis.tvalid <= s_axis.tvalid;
   mon_axis.tlast  <= s_axis.tlast;
@@ -0,0 +1,60 @@
+--##############################################################################
+--# File : bfm_trace.vhd
+--# Auth : David Gussler
+--# ============================================================================
+--# Shrikebyte VHDL Library - https://github.com/shrikebyte/sblib
+--# Copyright (C) Shrikebyte, LLC
+--# Licensed under the Apache 2.0 license, see LICENSE for details.
+--# ============================================================================
+--# Passive cycle trace. Logs a vector of probes, such as the handshakes
+--# around a module, to a text file on every rising clock edge where one of
+--# them changed. The transaction-level models in tools/models replay the log
+--# to check themselves against the RTL, see tools/models/tlm.py.
+--#
+--# Log format, one line per change:
+--#   <cycle> <probes>
+--# Cycles count rising edges of clk from 1. The probes are written left to
+--# right, as with to_string, with the values that they had just before the
+--# edge, which are the values that the registers of the design see.
+--##############################################################################
+
+library ieee;
+use ieee.std_logic_1164.all;
+use std.textio.all;
+
+entity bfm_trace is
+  generic (
+    G_FILE_NAME : string
+  );
+  port (
+    clk    : in    std_ulogic;
+    probes : in    std_ulogic_vector
+  );
+end entity;
+
+architecture sim of bfm_trace is
+
+  file f : text open write_mode is G_FILE_NAME;
+
+begin
+
+  -- ---------------------------------------------------------------------------
+  prc_trace : process is
+    variable cycle : natural := 0;
+    variable prev  : std_ulogic_vector(probes'range);
+    variable l     : line;
+  begin
+    wait until rising_edge(clk);
+    cycle := cycle + 1;
+
+    if cycle = 1 or probes /= prev then
+      prev := probes;
+      write(l, cycle);
+      write(l, ' ');
+      write(l, to_string(probes));
+      writeline(f, l);
+      flush(f);
+    end if;
+  end process;
+
+end architecture;
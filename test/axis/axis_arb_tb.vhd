@@ -27,7 +27,10 @@ use work.bfm_pkg.all;
 entity axis_arb_tb is
   generic (
     RUNNER_CFG      : string;
-    G_ENABLE_JITTER : boolean := true
+    G_ENABLE_JITTER : boolean := true;
+    -- Trace the handshakes to trace.txt in the test output path, for the
+    -- axis_arb model in tools/models to replay
+    G_TRACE : boolean := false
   );
 end entity;
 
@@ -215,6 +218,33 @@ begin
 
   end generate;
 
+  -- ---------------------------------------------------------------------------
+  -- Handshake trace: srst, m_axis tvalid, tready and tlast, then s_axis tvalid,
+  -- tready and tlast of every input
+  gen_trace : if G_TRACE generate
+
+    signal probes : std_ulogic_vector(0 to 3 + 3 * NUM_INPUTS);
+
+  begin
+
+    prc_probes : process (all) is begin
+      probes(0 to 3) <= srst & m_axis.tvalid & m_axis.tready & m_axis.tlast;
+      for i in s_axis'range loop
+        probes(4 + 3 * i to 6 + 3 * i) <= s_axis(i).tvalid & s_axis(i).tready & s_axis(i).tlast;
+      end loop;
+    end process;
+
+    u_bfm_trace : entity work.bfm_trace
+    generic map (
+      G_FILE_NAME => output_path(RUNNER_CFG) & "trace.txt"
+    )
+    port map (
+      clk    => clk,
+      probes => probes
+    );
+
+  end generate;
+
   ------------------------------------------------------------------------------
   prc_assign_handshake : process (all) is
 
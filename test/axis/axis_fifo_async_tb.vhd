@@ -33,7 +33,17 @@ entity axis_fifo_async_tb is
     G_CLK_RATIO     : integer  := 35;
     G_DEPTH         : positive := 64;
     G_PACKET_MODE   : boolean  := false;
-    G_DROP_OVERSIZE : boolean  := false
+    G_DROP_OVERSIZE : boolean  := false;
+    -- Probability in percent that the input and the output stall on any
+    -- cycle, when jitter is enabled
+    G_S_STALL_PROB : natural := 20;
+    G_M_STALL_PROB : natural := 20;
+    -- Log the throughput, latency and fill level to perf.txt in the test
+    -- output path, for tools/sim_perf.py. test_characterize sends
+    -- G_PERF_PACKETS packets of G_PERF_PACKET_BEATS beats.
+    G_PERF              : boolean  := false;
+    G_PERF_PACKETS      : positive := 128;
+    G_PERF_PACKET_BEATS : positive := 8
   );
 end entity;
 
@@ -81,8 +91,14 @@ architecture tb of axis_fifo_async_tb is
   signal m_sts_depth_comm : u_unsigned(clog2(G_DEPTH) downto 0);
 
   -- Testbench BFMs
-  constant STALL_CFG : stall_configuration_t := (
-    stall_probability => 0.2 * to_real(G_ENABLE_JITTER),
+  constant S_STALL_CFG : stall_configuration_t := (
+    stall_probability => real(G_S_STALL_PROB) / 100.0 * to_real(G_ENABLE_JITTER),
+    min_stall_cycles  => 1,
+    max_stall_cycles  => 3
+  );
+
+  constant M_STALL_CFG : stall_configuration_t := (
+    stall_probability => real(G_M_STALL_PROB) / 100.0 * to_real(G_ENABLE_JITTER),
     min_stall_cycles  => 1,
     max_stall_cycles  => 3
   );
@@ -99,7 +115,7 @@ architecture tb of axis_fifo_async_tb is
 begin
 
   -- ---------------------------------------------------------------------------
-  test_runner_watchdog(runner, 100 us);
+  test_runner_watchdog(runner, 100 us + to_int(G_PERF) * G_PERF_PACKETS * G_PERF_PACKET_BEATS * 1 us);
 
   prc_main : process is
 
@@ -303,6 +319,14 @@ begin
       m_bfm_sub_enable <= '0';
       wait_m_clks(10);
       m_bfm_sub_enable <= '1';
+    elsif run("test_characterize") then
+      -- vunit: .perf
+      -- A steady stream of equal packets, for tools/sim_perf.py to measure
+      m_bfm_sub_enable <= '1';
+
+      for test_idx in 0 to G_PERF_PACKETS - 1 loop
+        send_packet(G_PERF_PACKET_BEATS);
+      end loop;
 
     end if;
 
@@ -367,7 +391,7 @@ begin
   generic map (
     G_DATA_QUEUE   => DATA_QUEUE,
     G_USER_QUEUE   => USER_QUEUE,
-    G_STALL_CONFIG => STALL_CFG
+    G_STALL_CONFIG => S_STALL_CFG
   )
   port map (
     clk              => s_clk,
@@ -379,7 +403,7 @@ begin
   generic map (
     G_REF_DATA_QUEUE => REF_DATA_QUEUE,
     G_REF_USER_QUEUE => REF_USER_QUEUE,
-    G_STALL_CONFIG   => STALL_CFG
+    G_STALL_CONFIG   => M_STALL_CFG
   )
   port map (
     clk                 => m_clk,
@@ -388,6 +412,30 @@ begin
     num_packets_checked => num_packets_checked
   );
 
+  -- ---------------------------------------------------------------------------
+  gen_perf : if G_PERF generate
+
+    u_axis_perf_mon : entity work.axis_perf_mon
+    generic map (
+      G_FILE_NAME => output_path(RUNNER_CFG) & "perf.txt"
+    )
+    port map (
+      s_clk   => s_clk,
+      s_valid => s_axis.tvalid,
+      s_ready => s_axis.tready,
+      s_last  => s_axis.tlast,
+      --
+      m_clk   => m_clk,
+      m_valid => m_axis.tvalid,
+      m_ready => m_axis.tready,
+      m_last  => m_axis.tlast,
+      --
+      depth_spec => to_integer(s_sts_depth_spec),
+      depth_comm => to_integer(s_sts_depth_comm)
+    );
+
+  end generate;
+
   -- ---------------------------------------------------------------------------
   gen_check_no_bubbles : if G_PACKET_MODE and G_DROP_OVERSIZE generate
     signal end_event, en : std_ulogic := '0';
@@ -34,7 +34,15 @@ entity axis_resize_tb is
     G_S_UW          : positive := 32;
     G_M_KW          : positive := 8;
     G_M_DW          : positive := 8;
-    G_M_UW          : positive := 32
+    G_M_UW          : positive := 32;
+    -- Dump the input and output streams to files in the test output path,
+    -- to be checked after the run by the Python models in tools/models,
+    -- instead of checking the output in the simulator.
+    G_CHECK_OFFLINE : boolean  := false;
+    G_NUM_PACKETS   : positive := 51;
+    -- Send the packets of this file instead of random packets. The file
+    -- must hold G_NUM_PACKETS packets. Requires G_CHECK_OFFLINE.
+    G_STIM_FILE : string := ""
   );
 end entity;
 
@@ -89,7 +97,11 @@ architecture tb of axis_resize_tb is
 begin
 
   -- ---------------------------------------------------------------------------
-  test_runner_watchdog(runner, 100 us);
+  test_runner_watchdog(runner, G_NUM_PACKETS * 2 us);
+
+  assert G_STIM_FILE = "" or G_CHECK_OFFLINE
+    report "G_STIM_FILE requires G_CHECK_OFFLINE"
+    severity failure;
 
   prc_main : process is
 
@@ -115,9 +127,11 @@ begin
         bits_per_word => S_DBW,
         is_signed     => false
       );
-      data_copy := copy(data);
       push_ref(DATA_QUEUE, data);
-      push_ref(REF_DATA_QUEUE, data_copy);
+      if not G_CHECK_OFFLINE then
+        data_copy := copy(data);
+        push_ref(REF_DATA_QUEUE, data_copy);
+      end if;
 
       -- Random user packet
       random_integer_array (
@@ -127,9 +141,11 @@ begin
         bits_per_word => S_UBW,
         is_signed     => false
       );
-      user_copy := copy(user);
       push_ref(USER_QUEUE, user);
-      push_ref(REF_USER_QUEUE, user_copy);
+      if not G_CHECK_OFFLINE then
+        user_copy := copy(user);
+        push_ref(REF_USER_QUEUE, user_copy);
+      end if;
 
       num_tests := num_tests + 1;
 
@@ -146,9 +162,13 @@ begin
     wait until rising_edge(clk);
 
     if run("test_random_data") then
-      for test_idx in 0 to 50 loop
-        send_random;
-      end loop;
+      if G_STIM_FILE /= "" then
+        num_tests := G_NUM_PACKETS;
+      else
+        for test_idx in 0 to G_NUM_PACKETS - 1 loop
+          send_random;
+        end loop;
+      end if;
     end if;
 
     wait until num_packets_checked = num_tests and rising_edge(clk);
@@ -180,24 +200,52 @@ begin
     G_DATA_QUEUE    => DATA_QUEUE,
     G_USER_QUEUE    => USER_QUEUE,
     G_PACKED_STREAM => G_PACKED_STREAM,
-    G_STALL_CONFIG  => STALL_CFG
+    G_STALL_CONFIG  => STALL_CFG,
+    G_FILE_NAME     => G_STIM_FILE
   )
   port map (
     clk    => clk,
     m_axis => s_axis
   );
 
-  u_bfm_axis_sub : entity work.bfm_axis_sub
-  generic map (
-    G_REF_DATA_QUEUE => REF_DATA_QUEUE,
-    G_REF_USER_QUEUE => REF_USER_QUEUE,
-    G_PACKED_STREAM  => G_PACKED_STREAM,
-    G_STALL_CONFIG   => STALL_CFG
-  )
-  port map (
-    clk                 => clk,
-    s_axis              => m_axis,
-    num_packets_checked => num_packets_checked
-  );
+  -- ---------------------------------------------------------------------------
+  gen_check : if not G_CHECK_OFFLINE generate
+
+    u_bfm_axis_sub : entity work.bfm_axis_sub
+    generic map (
+      G_REF_DATA_QUEUE => REF_DATA_QUEUE,
+      G_REF_USER_QUEUE => REF_USER_QUEUE,
+      G_PACKED_STREAM  => G_PACKED_STREAM,
+      G_STALL_CONFIG   => STALL_CFG
+    )
+    port map (
+      clk                 => clk,
+      s_axis              => m_axis,
+      num_packets_checked => num_packets_checked
+    );
+
+  else generate
+
+    u_axis_dump_s : entity work.axis_dump
+    generic map (
+      G_FILE_NAME => output_path(RUNNER_CFG) & "s_axis.bin"
+    )
+    port map (
+      clk      => clk,
+      mon_axis => s_axis
+    );
+
+    u_bfm_axis_sub : entity work.bfm_axis_sub
+    generic map (
+      G_STALL_CONFIG => STALL_CFG,
+      G_FILE_NAME    => output_path(RUNNER_CFG) & "m_axis.bin"
+    )
+    port map (
+      clk                 => clk,
+      s_axis              => m_axis,
+      num_packets_checked => num_packets_checked
+    );
+
+  end generate;
 
 end architecture;
@@ -21,7 +21,10 @@ use vunit_lib.axi_lite_master_pkg.all;
 
 entity axil_xbar_tb is
   generic (
-    RUNNER_CFG : string
+    RUNNER_CFG : string;
+    -- Trace the handshakes to trace.txt in the test output path, for the
+    -- axil_xbar model in tools/models to replay
+    G_TRACE : boolean := false
   );
 end entity;
 
@@ -168,6 +171,36 @@ begin
     m_axil_rsp => axil_rsp_ram
   );
 
+  -- ---------------------------------------------------------------------------
+  -- Handshake trace: srst, then awvalid, awready, bvalid, bready, arvalid,
+  -- arready, rvalid and rready of every master
+  gen_trace : if G_TRACE generate
+
+    signal probes : std_ulogic_vector(0 to 8 * NUM_MASTERS);
+
+  begin
+
+    prc_probes : process (all) is begin
+      probes(0) <= srst;
+      for i in 0 to NUM_MASTERS - 1 loop
+        probes(1 + 8 * i to 8 + 8 * i) <= axil_req_cpu(i).awvalid & axil_rsp_cpu(i).awready &
+          axil_rsp_cpu(i).bvalid & axil_req_cpu(i).bready &
+          axil_req_cpu(i).arvalid & axil_rsp_cpu(i).arready &
+          axil_rsp_cpu(i).rvalid & axil_req_cpu(i).rready;
+      end loop;
+    end process;
+
+    u_bfm_trace : entity work.bfm_trace
+    generic map (
+      G_FILE_NAME => output_path(RUNNER_CFG) & "trace.txt"
+    )
+    port map (
+      clk    => clk,
+      probes => probes
+    );
+
+  end generate;
+
   -- ---------------------------------------------------------------------------
   gen_masters : for i in 0 to NUM_MASTERS - 1 generate
 
@@ -19,12 +19,17 @@ library vunit_lib;
 
 library osvvm;
 use osvvm.randompkg.all;
+use work.util_pkg.all;
 
 entity cdc_vector_tb is
   generic (
     RUNNER_CFG        : string;
     G_CLK_RATIO       : integer := 35;
-    G_AXIS_STALL_PROB : integer := 10
+    G_AXIS_STALL_PROB : integer := 10;
+    -- Log the throughput and latency to perf.txt in the test output path,
+    -- for tools/sim_perf.py. test_characterize sends G_PERF_BEATS beats.
+    G_PERF       : boolean  := false;
+    G_PERF_BEATS : positive := 256
   );
 end entity;
 
@@ -120,6 +125,21 @@ begin
           check_axi_stream(net, RX_AXIS_BFM, xfers(i).tdata, xfers(i).tlast);
         end loop;
 
+      -- -----------------------------------------------------------------------
+      elsif run("test_characterize") then
+        -- vunit: .perf
+        info("Stream a steady counting pattern for tools/sim_perf.py to measure");
+
+        wait until rising_edge(s_clk);
+        for i in 0 to G_PERF_BEATS - 1 loop
+          push_axi_stream(net, TX_AXIS_BFM, std_logic_vector(to_unsigned(i mod 256, AXIS_DATA_WIDTH)), '0');
+        end loop;
+
+        wait until rising_edge(m_clk);
+        for i in 0 to G_PERF_BEATS - 1 loop
+          check_axi_stream(net, RX_AXIS_BFM, std_logic_vector(to_unsigned(i mod 256, AXIS_DATA_WIDTH)), '0');
+        end loop;
+
       -- -- -----------------------------------------------------------------------
       -- elsif run("test_1") then
 
@@ -136,7 +156,7 @@ begin
   end process;
 
   -- -- Watchdog
-  test_runner_watchdog(runner, 100 us);
+  test_runner_watchdog(runner, 100 us + to_int(G_PERF) * G_PERF_BEATS * 1 us);
 
   -- ---------------------------------------------------------------------------
   -- Clocks & Resets
@@ -174,6 +194,26 @@ begin
     dst_data  => m_data
   );
 
+  -- ---------------------------------------------------------------------------
+  -- Performance monitor
+  gen_perf : if G_PERF generate
+
+    u_axis_perf_mon : entity work.axis_perf_mon
+    generic map (
+      G_FILE_NAME => output_path(RUNNER_CFG) & "perf.txt"
+    )
+    port map (
+      s_clk   => s_clk,
+      s_valid => s_valid,
+      s_ready => s_ready,
+      --
+      m_clk   => m_clk,
+      m_valid => m_valid,
+      m_ready => m_ready
+    );
+
+  end generate;
+
   -- ---------------------------------------------------------------------------
   -- Tx BFM
   u_tx_axis_bfm : entity vunit_lib.axi_stream_master
@@ -37,6 +37,10 @@
 --# 1  April 2025: David Gussler
 --#   - Updated TB to use VUnit to match the rest of the library
 --#
+--# October 2026: David Gussler
+--#   - The lookup package is generated by tools/models/ebtb.py
+--#   - Added test_vectors, which streams vectors from the same model
+--#
 --# per Widmer and Franaszek
 --##############################################################################
 
@@ -50,11 +54,15 @@ library vunit_lib;
 
 library osvvm;
 use osvvm.randompkg.all;
+use work.util_pkg.all;
 use work.ebtb_lookup_pkg.all;
 
 entity ebtb_tb is
   generic (
-    RUNNER_CFG : string
+    RUNNER_CFG : string;
+    -- Directory with the encode and decode vector files written by
+    -- tools/models/ebtb.py
+    G_VECTOR_PATH : string := ""
   );
 end entity;
 
@@ -102,10 +110,44 @@ architecture tb of ebtb_tb is
   signal mapcode  : slv9_array_t(1023 downto 0);
   signal decodein : std_logic_vector(9 downto 0) := (others => '0');
 
+  -- Vector test
+  type byte_file_t is file of character;
+
+  signal vec_enc_ena  : std_logic                    := '0';
+  signal vec_enc_ki   : std_logic                    := '0';
+  signal vec_enc_din  : std_logic_vector(7 downto 0) := (others => '0');
+  signal vec_enc_dout : std_logic_vector(9 downto 0);
+  signal vec_dec_ena  : std_logic                    := '0';
+  signal vec_dec_din  : std_logic_vector(9 downto 0) := (others => '0');
+  signal vec_dec_ko   : std_logic;
+  signal vec_dec_dout : std_logic_vector(7 downto 0);
+  signal vec_dec_cerr : std_logic;
+  signal vec_dec_derr : std_logic;
+
 begin
 
   -- ---------------------------------------------------------------------------
   prc_main : process is
+
+    file     f        : byte_file_t;
+    variable b        : integer_vector(0 to 3);
+    variable n        : natural;
+    variable exp_10b  : std_logic_vector(9 downto 0);
+    variable exp_8b   : std_logic_vector(7 downto 0);
+    variable exp_k    : std_logic;
+    variable exp_cerr : std_logic;
+    variable exp_derr : std_logic;
+
+    -- Read one 4 byte vector record
+    procedure read_record is
+      variable c : character;
+    begin
+      for idx in b'range loop
+        read(f, c);
+        b(idx) := character'pos(c);
+      end loop;
+    end procedure;
+
   begin
 
     test_runner_setup(runner, RUNNER_CFG);
@@ -195,10 +237,59 @@ begin
         end loop;
         info("SIMULATION COMPLETE");
 
-      -- -- -----------------------------------------------------------------------
-      -- elsif run("test_1") then
-
-      --   info("Not implemented.");
+      -- -----------------------------------------------------------------------
+      elsif run("test_vectors") then
+        wait until srst = '0';
+        wait until rising_edge(clk);
+        info("Streaming encoder vectors from " & G_VECTOR_PATH);
+
+        -- Each vector holds an input and the output that the encoder
+        -- registers for it, along with its disparity out.
+        n := 0;
+        file_open(f, G_VECTOR_PATH & "/ebtb_encode.bin", read_mode);
+        while not endfile(f) loop
+          read_record;
+          vec_enc_ena <= '1';
+          vec_enc_ki  <= to_sl(b(0) mod 2);
+          vec_enc_din <= std_logic_vector(to_unsigned(b(1), 8));
+          exp_10b     := std_logic_vector(to_unsigned(b(2) + 256 * b(3), 10));
+          wait until rising_edge(clk);
+          wait for CLK_TO_Q;
+          if vec_enc_dout /= exp_10b then
+            check_equal(vec_enc_dout, exp_10b, "Encode vector " & to_string(n), error);
+          end if;
+          n := n + 1;
+        end loop;
+        file_close(f);
+        vec_enc_ena <= '0';
+        info("Checked " & to_string(n) & " encoder vectors.");
+
+        -- Each vector holds a 10b input, which may have an error injected,
+        -- and the decoder output and error flags that are expected for it.
+        n := 0;
+        file_open(f, G_VECTOR_PATH & "/ebtb_decode.bin", read_mode);
+        while not endfile(f) loop
+          read_record;
+          vec_dec_ena <= '1';
+          vec_dec_din <= std_logic_vector(to_unsigned(b(0) + 256 * b(1), 10));
+          wait until rising_edge(clk);
+          wait for CLK_TO_Q;
+          exp_8b      := std_logic_vector(to_unsigned(b(2), 8));
+          exp_k       := to_sl(b(3) mod 2);
+          exp_cerr    := to_sl((b(3) / 2) mod 2);
+          exp_derr    := to_sl((b(3) / 4) mod 2);
+          if vec_dec_dout /= exp_8b or vec_dec_ko /= exp_k or
+             vec_dec_cerr /= exp_cerr or vec_dec_derr /= exp_derr then
+            check_equal(vec_dec_dout, exp_8b, "Decode vector " & to_string(n) & " data", error);
+            check_equal(vec_dec_ko, exp_k, "Decode vector " & to_string(n) & " k", error);
+            check_equal(vec_dec_cerr, exp_cerr, "Decode vector " & to_string(n) & " code error", error);
+            check_equal(vec_dec_derr, exp_derr, "Decode vector " & to_string(n) & " disparity error", error);
+          end if;
+          n := n + 1;
+        end loop;
+        file_close(f);
+        vec_dec_ena <= '0';
+        info("Checked " & to_string(n) & " decoder vectors.");
 
       end if;
 
@@ -271,4 +362,30 @@ begin
     disp_err => disperr
   );
 
+  -- ---------------------------------------------------------------------------
+  -- Vector test encoder and decoder
+  -- ..These are only enabled while vectors are streamed, so that they start
+  -- from reset with the same running disparity as the model.
+  u_ebtb_encode_vec : entity work.ebtb_encode
+  port map (
+    clk  => clk,
+    srst => srst,
+    ena  => vec_enc_ena,
+    ki   => vec_enc_ki,
+    din  => vec_enc_din,
+    dout => vec_enc_dout
+  );
+
+  u_ebtb_decode_vec : entity work.ebtb_decode
+  port map (
+    clk      => clk,
+    srst     => srst,
+    din      => vec_dec_din,
+    ena      => vec_dec_ena,
+    ko       => vec_dec_ko,
+    dout     => vec_dec_dout,
+    code_err => vec_dec_cerr,
+    disp_err => vec_dec_derr
+  );
+
 end architecture;
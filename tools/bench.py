@@ -0,0 +1,288 @@
+################################################################################
+# File : bench.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Simulation throughput benchmarks
+# ..Runs a fixed set of test configs with a fixed seed on each simulator, and
+# records the compile, elaboration and run times, and the number of simulated
+# clock cycles per wall second of each benchmark. The results can be compared
+# against a stored baseline to catch slowdowns caused by library changes or
+# simulator upgrades.
+#
+# Usage:
+#   python bench.py [--simulators nvc,ghdl] [--output <results.json>]
+#                   [--baseline <baseline.json>] [--repeat <n>]
+#   python bench.py --results <results.json> --baseline <baseline.json>
+################################################################################
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+BENCH_DIR = SCRIPT_DIR.parent / "build" / "bench"
+RESULTS_FILE = SCRIPT_DIR.parent / "build" / "bench.json"
+FORMAT_VERSION = 1
+
+# Seed passed to VUnit, so that every run simulates the same traffic
+SEED = "5eed5eed5eed5eed"
+
+# Benchmark name: (VUnit test name, period of the clock that is counted in ns)
+BENCHMARKS = {
+    "axis_fifo": (
+        "lib.axis_fifo_tb.G_ENABLE_JITTER=True-G_DEPTH=64-G_PACKET_MODE=True-G_DROP_OVERSIZE=False.test_random_data",
+        5.0,
+    ),
+    "axis_fifo_async": (
+        "lib.axis_fifo_async_tb.G_ENABLE_JITTER=True-G_CLK_RATIO=95-G_DEPTH=64-G_PACKET_MODE=True-G_DROP_OVERSIZE=False.test_random_data",
+        5.0,
+    ),
+    "axis_resize": (
+        "lib.axis_resize_tb.G_ENABLE_JITTER=True-G_PACKED_STREAM=True-G_S_KW=4-G_S_DW=32-G_S_UW=8-G_M_KW=8-G_M_DW=64-G_M_UW=16.test_random_data",
+        5.0,
+    ),
+    "axil_xbar": ("lib.axil_xbar_tb.test_0", 10.0),
+    "cdc_vector": ("lib.cdc_vector_tb.G_CLK_RATIO=100-G_AXIS_STALL_PROB=50.test_0", 5.0),
+}
+
+# A benchmark is reported as slower than the baseline when a time grows by
+# more than the tolerance, and by more than the noise floor in seconds
+DEFAULT_TOLERANCE = 0.10
+NOISE_FLOOR = 0.5
+
+TIME_UNITS = {"fs": 1e-6, "ps": 1e-3, "ns": 1.0, "us": 1e3, "ms": 1e6, "sec": 1e9}
+
+# Simulation time stamps printed by GHDL ("@12345ns"), NVC ("12345ns+1:")
+# and the VUnit logger ("12345000 fs - ")
+SIM_TIME_PATTERNS = [
+    re.compile(r"@(\d+(?:\.\d+)?)(fs|ps|ns|us|ms|sec)\b"),
+    re.compile(r"\b(\d+(?:\.\d+)?)(fs|ps|ns|us|ms)\+\d+:"),
+    re.compile(r"\b(\d+(?:\.\d+)?) (fs|ps|ns|us|ms|sec) - "),
+]
+
+
+def sim_time_ns(output: str) -> float | None:
+    """
+    Return the last simulation time printed in a test's output in ns, or None
+    if there is none
+    """
+    times = [
+        float(value) * TIME_UNITS[unit]
+        for pattern in SIM_TIME_PATTERNS
+        for value, unit in pattern.findall(output)
+    ]
+    return max(times) if times else None
+
+
+def available_simulators(names: list[str]) -> dict[str, str]:
+    """
+    Return the version string of each of the named simulators that is
+    installed
+    """
+    from vunit.sim_if.factory import SIMULATOR_FACTORY
+
+    import sim_libs
+
+    result = {}
+    for cls in SIMULATOR_FACTORY.supported_simulators():
+        if cls.name in names:
+            version = sim_libs.simulator_version(cls)
+            if version is not None:
+                result[cls.name] = version
+    return result
+
+
+def run_sim(simulator: str, args: list[str]) -> float:
+    """
+    Run sim.py on one simulator and return its wall time
+    """
+    env = dict(os.environ, VUNIT_SIMULATOR=simulator)
+    cmd = [sys.executable, str(SCRIPT_DIR / "sim.py"), *args]
+    start = time.perf_counter()
+    result = subprocess.run(cmd, cwd=SCRIPT_DIR, env=env, stdout=subprocess.DEVNULL)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        sys.exit(f"ERROR: Benchmark run failed on {simulator}: {' '.join(cmd)}")
+    return elapsed
+
+
+def read_xunit(xunit_file: Path) -> dict[str, tuple[float, str]]:
+    """
+    Return the time and output of every test in a VUnit xunit report
+    """
+    result = {}
+    for tc in ET.parse(xunit_file).getroot().iter("testcase"):
+        name = f"{tc.get('classname')}.{tc.get('name')}"
+        out = tc.find("system-out")
+        result[name] = (float(tc.get("time", 0)), "" if out is None else out.text or "")
+    return result
+
+
+def bench_simulator(simulator: str, version: str, repeat: int) -> dict:
+    """
+    Run the benchmarks on one simulator. Every measurement is repeated and
+    the fastest run is kept.
+    """
+    out = BENCH_DIR / simulator
+    vunit_out = out / "vunit_out"
+    tests = [test for test, _ in BENCHMARKS.values()]
+    common = ["-o", str(vunit_out), "--seed", SEED, "-p", "1", "--test-prio", "ordered"]
+
+    compile_times, elab, run = [], {}, {}
+    for _ in range(repeat):
+        shutil.rmtree(vunit_out, ignore_errors=True)
+        print(f"INFO: Compiling on {simulator}")
+        compile_times.append(run_sim(simulator, ["-o", str(vunit_out), "--compile"]))
+
+        print(f"INFO: Elaborating the benchmarks on {simulator}")
+        run_sim(simulator, [*common, "--elaborate", "--xunit-xml", str(out / "elaborate.xml"), *tests])
+        for name, (t, _) in read_xunit(out / "elaborate.xml").items():
+            elab[name] = min(elab.get(name, t), t)
+
+        print(f"INFO: Running the benchmarks on {simulator}")
+        run_sim(simulator, [*common, "--xunit-xml", str(out / "run.xml"), *tests])
+        for name, (t, output) in read_xunit(out / "run.xml").items():
+            if name not in run or t < run[name][0]:
+                run[name] = (t, output)
+
+    benchmarks = {}
+    for bench, (test, period_ns) in BENCHMARKS.items():
+        elaborate_s = elab.get(test)
+        total_s, output = run.get(test, (None, ""))
+        if elaborate_s is None or total_s is None:
+            print(f"WARNING: No result for benchmark {bench} on {simulator}")
+            continue
+        # The simulation step of a test elaborates it again, so that time is
+        # left out of the run time
+        run_s = max(total_s - elaborate_s, 0.0)
+        end_ns = sim_time_ns(output)
+        cycles = None if end_ns is None else round(end_ns / period_ns)
+        benchmarks[bench] = {
+            "test": test,
+            "elaborate_s": elaborate_s,
+            "run_s": run_s,
+            "sim_time_ns": end_ns,
+            "cycles": cycles,
+            "cycles_per_s": None if cycles is None or run_s == 0 else cycles / run_s,
+        }
+    return {"version": version, "compile_s": min(compile_times), "benchmarks": benchmarks}
+
+
+def compare(baseline: dict, results: dict, tolerance: float) -> list[str]:
+    """
+    Compare results against a baseline and return a description of every
+    measurement that got slower
+    """
+    slower = []
+
+    def check(label: str, old: float | None, new: float | None):
+        if old is None or new is None:
+            return
+        if new > old * (1 + tolerance) and new - old > NOISE_FLOOR:
+            slower.append(f"{label}: {old:.2f} s -> {new:.2f} s (+{100 * (new / old - 1):.0f}%)")
+
+    for sim, res in results["simulators"].items():
+        base = baseline["simulators"].get(sim)
+        if base is None:
+            print(f"INFO: No baseline for {sim}")
+            continue
+        if base["version"] != res["version"]:
+            print(f"INFO: {sim} version changed from '{base['version']}' to '{res['version']}'")
+        check(f"{sim} compile", base["compile_s"], res["compile_s"])
+        for bench, r in res["benchmarks"].items():
+            b = base["benchmarks"].get(bench)
+            if b is None:
+                continue
+            if b["cycles"] != r["cycles"]:
+                print(f"WARNING: {sim} {bench} simulated {r['cycles']} cycles, baseline {b['cycles']}")
+            check(f"{sim} {bench} elaborate", b["elaborate_s"], r["elaborate_s"])
+            check(f"{sim} {bench} run", b["run_s"], r["run_s"])
+    return slower
+
+
+def print_results(results: dict):
+    for sim, res in results["simulators"].items():
+        print(f"\n{sim} ({res['version']}), compile {res['compile_s']:.2f} s")
+        print(f"  {'benchmark':<16} {'elaborate':>10} {'run':>10} {'cycles':>12} {'cycles/s':>12}")
+        for bench, r in res["benchmarks"].items():
+            cycles = "-" if r["cycles"] is None else str(r["cycles"])
+            rate = "-" if r["cycles_per_s"] is None else f"{r['cycles_per_s']:.0f}"
+            print(f"  {bench:<16} {r['elaborate_s']:>9.2f}s {r['run_s']:>9.2f}s {cycles:>12} {rate:>12}")
+
+
+def main(simulators: list[str], output: Path, repeat: int):
+    found = available_simulators(simulators)
+    for sim in simulators:
+        if sim not in found:
+            print(f"WARNING: Simulator {sim} was not found, skipping it")
+    if not found:
+        sys.exit("ERROR: None of the requested simulators were found")
+
+    from vunit import __version__ as vunit_version
+
+    results = {
+        "format_version": FORMAT_VERSION,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "vunit": vunit_version,
+        "seed": SEED,
+        "simulators": {sim: bench_simulator(sim, version, repeat) for sim, version in found.items()},
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"INFO: Wrote benchmark results to {output}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the simulation throughput benchmarks")
+    parser.add_argument(
+        "--simulators", default="nvc,ghdl",
+        help="Comma separated list of simulators to benchmark",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, default=RESULTS_FILE,
+        help="Results file to write",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=1,
+        help="Number of times to repeat every measurement, keeping the fastest",
+    )
+    parser.add_argument(
+        "--baseline", type=Path,
+        help="Baseline results file to compare against",
+    )
+    parser.add_argument(
+        "--results", type=Path,
+        help="Compare an existing results file against the baseline instead of running the benchmarks",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+        help="Relative slowdown that is reported as a regression",
+    )
+    args = parser.parse_args()
+
+    if args.results is not None:
+        if args.baseline is None:
+            sys.exit("ERROR: --results requires --baseline")
+        results = json.loads(args.results.read_text())
+    else:
+        if args.repeat < 1:
+            sys.exit("ERROR: --repeat must be at least 1")
+        results = main(args.simulators.split(","), args.output, args.repeat)
+
+    print_results(results)
+    if args.baseline is not None:
+        slower = compare(json.loads(args.baseline.read_text()), results, args.tolerance)
+        for s in slower:
+            print(f"ERROR: Slower than the baseline: {s}")
+        if slower:
+            sys.exit(1)
+        print("INFO: No slowdowns against the baseline.")
@@ -4,20 +4,37 @@
 
 from __future__ import annotations
 
+import json
+import sys
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import rtoml
 
+import sim_index
+import sim_utils
+from models import ebtb
+
 if TYPE_CHECKING:
     from vunit.ui import VUnit
 
+# Index of the library sources, kept apart from the sim index since it also
+# covers the platform sources
+INDEX_FILE = sim_utils.ROOT_DIR / "build" / "vhdl_ls_index.json"
+
+# Source files of the VUnit builtins and OSVVM, per VUnit version
+THIRD_PARTY_FILE = sim_utils.ROOT_DIR / "build" / "vhdl_ls_third_party.json"
+
+VHDL_STANDARD = "2019"
+
 
 def create_configuration(  # noqa: C901
     output_path: Path,
     vunit_proj: VUnit | None = None,
     files: list[tuple[Path, str]] | None = None,
-) -> None:
+) -> bool:
     """
     Create a configuration file (``vhdl_ls.toml``) for the rust_hdl VHDL Language Server
     (https://github.com/VHDL-LS/rust_hdl).
@@ -40,8 +57,11 @@ def create_configuration(  # noqa: C901
         files: All files listed here will be added.
             Can be used to add additional files outside of the modules or the VUnit project.
             The list shall contain tuples: ``(Path, "library name")``.
+
+    Returns:
+        True if the file was written, False if it was already up to date.
     """
-    toml_data: dict[str, Any] = {"standard": "2019", "libraries": {}}
+    toml_data: dict[str, Any] = {"standard": VHDL_STANDARD, "libraries": {}}
 
     def add_file(file_path: Path, library_name: str) -> None:
         """
@@ -70,4 +90,73 @@ def create_configuration(  # noqa: C901
         toml_data["lint"] = {}
     toml_data["lint"]["unnecessary_work_library"] = False
 
-    rtoml.dump(obj=toml_data, file=output_path / "vhdl_ls.toml", pretty=True)
+    # Leave the file alone when nothing changed, so that the language server
+    # does not reload the project
+    toml_file = output_path / "vhdl_ls.toml"
+    text = rtoml.dumps(toml_data, pretty=True)
+    if toml_file.exists() and toml_file.read_text() == text:
+        return False
+    toml_file.write_text(text)
+    return True
+
+
+def third_party_files() -> list[tuple[Path, str]]:
+    """
+    Return the source files of the VUnit builtins and OSVVM, in the same set
+    that sim.py adds. VUnit is only imported to list them when the installed
+    VUnit version has not been seen before.
+    """
+    try:
+        vunit_version = version("vunit_hdl")
+    except PackageNotFoundError:
+        print("WARNING: VUnit is not installed, leaving out the third-party libraries")
+        return []
+    key = [vunit_version, VHDL_STANDARD]
+    try:
+        cache = json.loads(THIRD_PARTY_FILE.read_text())
+    except (OSError, ValueError):
+        cache = {}
+
+    if cache.get("key") != key:
+        from vunit import VUnit
+
+        with tempfile.TemporaryDirectory() as output_path:
+            vu = VUnit.from_argv(argv=["--output-path", output_path], vhdl_standard=VHDL_STANDARD)
+            vu.add_vhdl_builtins()
+            vu.add_com()
+            vu.add_osvvm()
+            vu.add_random()
+            vu.add_verification_components()
+            files = [
+                [str(Path(source_file.name).resolve()), source_file.library.name]
+                for source_file in vu.get_compile_order()
+            ]
+        cache = {"key": key, "files": files}
+        THIRD_PARTY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        THIRD_PARTY_FILE.write_text(json.dumps(cache))
+
+    return [(Path(f), library_name) for f, library_name in cache["files"]]
+
+
+def main() -> None:
+    """
+    Write vhdl_ls.toml to the repository root, from a cached index of the
+    library and platform sources and the third-party library sources. The
+    sources that the Python models generate are written first, so that the
+    index includes them.
+    """
+    ebtb.generate(sim_utils.GEN_DIR / "ebtb")
+    index = sim_index.Index(sim_utils.SOURCES + sim_utils.PLATFORM_SOURCES, INDEX_FILE)
+    index.save()
+    files = [(Path(f), "lib") for f in index.files] + third_party_files()
+    if create_configuration(output_path=sim_utils.ROOT_DIR, files=files):
+        print(f"INFO: Wrote {sim_utils.ROOT_DIR / 'vhdl_ls.toml'} with {len(files)} file(s)")
+    else:
+        print("INFO: vhdl_ls.toml is up to date")
+
+
+if __name__ == "__main__":
+    # Usage: python create_vhdl_ls_config.py
+    if len(sys.argv) > 1:
+        sys.exit("ERROR: create_vhdl_ls_config.py does not take any arguments")
+    main()
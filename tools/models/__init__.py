@@ -0,0 +1,9 @@
+################################################################################
+# File : __init__.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Python reference models of sblib modules
+# ..The models work on whole streams at once with NumPy, so that large amounts
+# of traffic dumped by a test bench can be checked after the simulation.
+################################################################################
@@ -0,0 +1,217 @@
+################################################################################
+# File : axil_xbar.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Transaction-level model of axil_xbar
+# ..axil_xbar handles one write and one read at a time. When its write or read
+# side is idle, axil_arbiter grants the highest numbered master that requests
+# it, and the side is then busy for a fixed number of cycles per transaction.
+# replay() checks the grants and the busy cycles against a trace of
+# axil_xbar_tb, and sweep() runs random traffic through a batch of scenarios
+# to find the transaction rate and latency of every master. Decode errors are
+# not modeled.
+#
+# Run as a script to sweep random traffic mixes:
+#   python -m models.axil_xbar --masters 4 --scenarios 4096 --csv xbar.csv
+################################################################################
+
+import argparse
+import csv
+from pathlib import Path
+
+import numpy as np
+
+from models import tlm
+
+# Cycles from the grant of a write to its response handshake, when the slave
+# is an axil_to_reg bridge and the master takes the response at once. A read
+# takes RD_CYCLES plus the read latency of the slave.
+WR_CYCLES = 4
+RD_CYCLES = 3
+
+# Cycles between a response and the next request of the same master, for the
+# VUnit AXI lite master behind bfm_axil_man. It sends one transaction at a
+# time, reads and writes alike.
+REISSUE_CYCLES = 1
+
+# Probes of the axil_xbar_tb trace, followed by these for every master
+PROBE_SRST = 0
+PROBES_PER_MASTER = 8
+AWVALID, AWREADY, BVALID, BREADY, ARVALID, ARREADY, RVALID, RREADY = range(PROBES_PER_MASTER)
+
+WRITE, READ = 1, 2
+
+
+def _replay_side(probes: np.ndarray, name: str, valid: int, ready: int, rsp_valid: int, rsp_ready: int,
+                 cycles: int) -> list[str]:
+    """
+    Replay one side of the arbiter. Only the granted master may see a ready or
+    a response, and each grant must last the given number of cycles.
+    """
+    m = probes[:, 1:].reshape(len(probes), -1, PROBES_PER_MASTER)
+    errors = []
+    busy = None
+    for cycle, row in enumerate(m, start=1):
+        if probes[cycle - 1, PROBE_SRST]:
+            busy, sel = False, 0
+            continue
+        if busy is None:
+            continue
+        for i in np.flatnonzero(row[:, ready] | row[:, rsp_valid]):
+            if not busy or i != sel:
+                errors.append(f"Cycle {cycle}: master {i} got a {name} handshake, but the model grants "
+                              + (f"master {sel}" if busy else "no master"))
+        if not busy:
+            any_req, grant = tlm.highest(row[:, valid])
+            if any_req:
+                busy, sel, start = True, int(grant), cycle
+        elif row[sel, rsp_valid] and row[sel, rsp_ready]:
+            busy = False
+            if cycle - start + 1 != cycles:
+                errors.append(f"Cycle {cycle}: the {name} of master {sel} took {cycle - start + 1} cycles "
+                              f"from its grant, the model takes {cycles}")
+        if len(errors) > tlm.MAX_ERRORS:
+            break
+    if busy is None:
+        errors.append("Reset was never traced")
+    return errors
+
+
+def replay(probes: np.ndarray, rd_latency: int = 2) -> list[str]:
+    """
+    Check the write and read grants and their length against the handshakes
+    that axil_xbar_tb traced, with slaves of the given read latency
+    """
+    return (
+        _replay_side(probes, "write", AWVALID, AWREADY, BVALID, BREADY, WR_CYCLES)
+        + _replay_side(probes, "read", ARVALID, ARREADY, RVALID, RREADY, RD_CYCLES + rd_latency)
+    )
+
+
+def sweep(
+    rate: np.ndarray,
+    write_fraction: float = 0.5,
+    rd_latency: int = 2,
+    cycles: int = 10000,
+    warmup: int = 1000,
+    seed: int = tlm.SEED,
+) -> dict[str, np.ndarray]:
+    """
+    Run random traffic through a batch of scenarios. Transactions arrive at
+    each master with the (scenarios, masters) probability rate on every cycle,
+    and are writes with probability write_fraction. Each master queues them
+    and sends one at a time. Return the transactions per cycle and the mean
+    latency in cycles, from arrival to response, of each master, and the
+    fraction of cycles that the write and read sides were busy, measured over
+    the cycles after warmup.
+    """
+    rng = np.random.default_rng(seed)
+    rate = np.asarray(rate, dtype=float)
+    scenarios, num_masters = rate.shape
+    rows = np.arange(scenarios)
+    side_cycles = {WRITE: WR_CYCLES, READ: RD_CYCLES + rd_latency}
+
+    backlog = np.zeros((scenarios, num_masters), dtype=np.int64)
+    kind = np.zeros((scenarios, num_masters), dtype=np.int64)
+    granted = np.zeros((scenarios, num_masters), dtype=bool)
+    ready_at = np.zeros((scenarios, num_masters), dtype=np.int64)
+    busy_left = {side: np.zeros(scenarios, dtype=np.int64) for side in side_cycles}
+    sel = {side: np.zeros(scenarios, dtype=np.int64) for side in side_cycles}
+
+    completed = np.zeros((scenarios, num_masters), dtype=np.int64)
+    backlog_sum = np.zeros((scenarios, num_masters), dtype=np.int64)
+    busy_cycles = {side: np.zeros(scenarios, dtype=np.int64) for side in side_cycles}
+
+    for cycle in range(warmup + cycles):
+        measure = cycle >= warmup
+        backlog += rng.random((scenarios, num_masters)) < rate
+
+        # Pick the kind of the next queued transaction
+        start = (kind == 0) & (backlog > 0)
+        kind[start] = np.where(rng.random(int(start.sum())) < write_fraction, WRITE, READ)
+
+        for side, side_len in side_cycles.items():
+            idle = busy_left[side] == 0
+            req = (kind == side) & ~granted & (ready_at <= cycle)
+            any_req, grant = tlm.highest(req)
+            new = idle & any_req
+            sel[side] = np.where(new, grant, sel[side])
+            granted[rows[new], grant[new]] = True
+            busy_left[side] = np.where(new, side_len, busy_left[side])
+
+            busy = busy_left[side] > 0
+            busy_left[side] -= busy
+            done = busy & (busy_left[side] == 0)
+            m = sel[side][done]
+            granted[rows[done], m] = False
+            kind[rows[done], m] = 0
+            backlog[rows[done], m] -= 1
+            ready_at[rows[done], m] = cycle + 1 + REISSUE_CYCLES
+            if measure:
+                completed[rows[done], m] += 1
+                busy_cycles[side] += busy
+
+        if measure:
+            backlog_sum += backlog
+
+    stats = tlm.backlog_stats(backlog_sum, completed, cycles)
+    return {
+        "transactions_per_cycle": stats["per_cycle"],
+        "latency_cycles": stats["latency_cycles"],
+        "backlog_mean": backlog_sum / cycles,
+        "write_busy": busy_cycles[WRITE] / cycles,
+        "read_busy": busy_cycles[READ] / cycles,
+    }
+
+
+def post_check(output_path, rd_latency: int = 2) -> bool:
+    return tlm.post_check(output_path, replay, rd_latency=rd_latency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep random traffic mixes through the axil_xbar model")
+    parser.add_argument("--masters", type=int, default=4, help="Number of masters")
+    parser.add_argument("--scenarios", type=int, default=1024, help="Number of traffic mixes")
+    parser.add_argument("--cycles", type=int, default=10000, help="Measured cycles per scenario")
+    parser.add_argument("--load", type=float, nargs=2, default=[0.02, 0.3], metavar=("MIN", "MAX"),
+                        help="Range of the total offered load, in transactions per cycle")
+    parser.add_argument("--write-fraction", type=float, default=0.5, help="Fraction of writes")
+    parser.add_argument("--rd-latency", type=int, default=2, help="Read latency of the slaves")
+    parser.add_argument("--seed", type=int, default=tlm.SEED, help="Random seed")
+    parser.add_argument("--csv", type=Path, help="Write one row per scenario to this file")
+    parser.add_argument("--replay", type=Path, help="Replay an axil_xbar_tb trace instead of sweeping")
+    args = parser.parse_args()
+
+    if args.replay:
+        errors = replay(tlm.read_trace(args.replay), args.rd_latency)
+        for e in errors:
+            print(f"ERROR: {e}")
+        raise SystemExit(1 if errors else 0)
+
+    # Split a random total load over the masters in random shares
+    rng = np.random.default_rng(args.seed)
+    load = rng.uniform(*args.load, size=(args.scenarios, 1))
+    rate = np.minimum(load * rng.dirichlet(np.ones(args.masters), size=args.scenarios), 1.0)
+    result = sweep(rate, args.write_fraction, args.rd_latency, args.cycles, seed=args.seed)
+
+    print(f"{'master':>6} {'offered':>9} {'carried':>9} {'latency':>9}   (median over {args.scenarios} scenarios)")
+    for i in range(args.masters):
+        print(f"{i:>6} {np.median(rate[:, i]):>9.3f} {np.median(result['transactions_per_cycle'][:, i]):>9.3f} "
+              f"{np.nanmedian(result['latency_cycles'][:, i]):>9.1f}")
+    print(f"Write side busy: mean {result['write_busy'].mean():.3f}, "
+          f"read side busy: mean {result['read_busy'].mean():.3f}")
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ["scenario"] + [f"offered_{i}" for i in range(args.masters)]
+                + [f"transactions_per_cycle_{i}" for i in range(args.masters)]
+                + [f"latency_cycles_{i}" for i in range(args.masters)] + ["write_busy", "read_busy"]
+            )
+            for s in range(args.scenarios):
+                writer.writerow(
+                    [s] + list(rate[s]) + list(result["transactions_per_cycle"][s])
+                    + list(result["latency_cycles"][s]) + [result["write_busy"][s], result["read_busy"][s]]
+                )
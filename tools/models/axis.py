@@ -0,0 +1,144 @@
+################################################################################
+# File : axis.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Common AXIS stream models
+# ..A stream is handled either as beats (see axis_dump.Beats), or as packets,
+# which are the flat arrays of the kept data and user lanes of every packet
+# back to back, plus the length of each packet in lanes.
+################################################################################
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from models import axis_dump
+from models.axis_dump import Beats
+
+# Number of mismatches listed before a check gives up
+MAX_ERRORS = 10
+
+
+@dataclass
+class Packets:
+    data: np.ndarray
+    user: np.ndarray
+    lengths: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+
+def packets(beats: Beats) -> Packets:
+    """
+    Return the packets carried by a stream. Lanes without tkeep are removed
+    and a trailing packet without tlast is dropped.
+    """
+    lanes_per_beat = beats.keep.sum(axis=1)
+    ends = np.cumsum(lanes_per_beat)[beats.last]
+    lengths = np.diff(ends, prepend=0)
+    total = ends[-1] if len(ends) else 0
+    return Packets(beats.data[beats.keep][:total], beats.user[beats.keep][:total], lengths)
+
+
+def packed_beats(pkts: Packets, kw: int, dbw: int, ubw: int) -> Beats:
+    """
+    Return the packed stream of beats that carries a set of packets on a bus
+    with kw lanes. Every beat is full except for the last beat of a packet,
+    whose lanes are filled from low to high.
+    """
+    beats_per_packet = (pkts.lengths + kw - 1) // kw
+    first_beat = np.cumsum(beats_per_packet) - beats_per_packet
+    first_lane = np.cumsum(pkts.lengths) - pkts.lengths
+    num_beats = int(beats_per_packet.sum())
+
+    # Position of every lane in the flat packet arrays on the bus
+    packet = np.repeat(np.arange(len(pkts)), pkts.lengths)
+    pos = np.arange(len(pkts.data)) - first_lane[packet]
+    beat = first_beat[packet] + pos // kw
+    lane = pos % kw
+
+    last = np.zeros(num_beats, dtype=bool)
+    last[first_beat + beats_per_packet - 1] = True
+    keep = np.zeros((num_beats, kw), dtype=bool)
+    data = np.zeros((num_beats, kw), dtype=np.uint64)
+    user = np.zeros((num_beats, kw), dtype=np.uint64)
+    keep[beat, lane] = True
+    data[beat, lane] = pkts.data
+    user[beat, lane] = pkts.user
+    return Beats(last, keep, data, user, dbw, ubw)
+
+
+def check_packets(expected: Packets, actual: Packets) -> list[str]:
+    """
+    Compare two sets of packets and return a list of mismatch descriptions
+    """
+    errors = []
+    if len(expected) != len(actual):
+        errors.append(f"Expected {len(expected)} packets, got {len(actual)}")
+    n = min(len(expected), len(actual))
+    bad = np.flatnonzero(expected.lengths[:n] != actual.lengths[:n])
+    for i in bad[:MAX_ERRORS]:
+        errors.append(f"Packet {i}: expected length {expected.lengths[i]}, got {actual.lengths[i]}")
+    if errors:
+        return errors
+
+    for name in ["data", "user"]:
+        exp, act = getattr(expected, name), getattr(actual, name)
+        bad = np.flatnonzero(exp != act)
+        packet = np.searchsorted(np.cumsum(expected.lengths), bad, side="right")
+        for i, p in zip(bad[:MAX_ERRORS], packet):
+            errors.append(f"Packet {p}: {name} lane {i} expected 0x{int(exp[i]):x}, got 0x{int(act[i]):x}")
+    return errors
+
+
+def check_beats(expected: Beats, actual: Beats) -> list[str]:
+    """
+    Compare two streams beat by beat and return a list of mismatch
+    descriptions. Data and user lanes without tkeep are not compared.
+    """
+    if len(expected) != len(actual):
+        return [f"Expected {len(expected)} beats, got {len(actual)}"]
+    mask = expected.keep
+    bad = (
+        (expected.last != actual.last)
+        | (expected.keep != actual.keep).any(axis=1)
+        | ((expected.data != actual.data) & mask).any(axis=1)
+        | ((expected.user != actual.user) & mask).any(axis=1)
+    )
+    return [f"Beat {i} does not match the expected beat" for i in np.flatnonzero(bad)[:MAX_ERRORS]]
+
+
+def check_protocol(beats: Beats, packed: bool) -> list[str]:
+    """
+    Check the sblib tkeep rules: tkeep is contiguous from low to high, a tlast
+    beat has at least one tkeep bit set, and in a packed stream every beat
+    but tlast is full.
+    """
+    errors = []
+    lanes = beats.keep.sum(axis=1)
+    contiguous = (beats.keep == (np.arange(beats.kw) < lanes[:, None])).all(axis=1)
+    for i in np.flatnonzero(~contiguous)[:MAX_ERRORS]:
+        errors.append(f"Beat {i}: tkeep is not contiguous from low to high")
+    for i in np.flatnonzero(beats.last & (lanes == 0))[:MAX_ERRORS]:
+        errors.append(f"Beat {i}: tlast beat without any tkeep bits set")
+    if packed:
+        for i in np.flatnonzero(~beats.last & (lanes != beats.kw))[:MAX_ERRORS]:
+            errors.append(f"Beat {i}: partial beat in a packed stream")
+    return errors
+
+
+def post_check(output_path, check, **kwargs) -> bool:
+    """
+    Check the streams that a test bench dumped to s_axis.bin and m_axis.bin in
+    its output path, and print any mismatches
+    """
+    s_beats = axis_dump.read(Path(output_path) / "s_axis.bin")
+    m_beats = axis_dump.read(Path(output_path) / "m_axis.bin")
+    errors = check(s_beats, m_beats, **kwargs)
+    for e in errors:
+        print(f"ERROR: {e}")
+    print(f"INFO: Checked {len(s_beats)} input and {len(m_beats)} output beats offline.")
+    return not errors
@@ -0,0 +1,228 @@
+################################################################################
+# File : axis_arb.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Transaction-level model of axis_arb
+# ..axis_arb grants the highest numbered input with tvalid, and its axis_mux
+# takes one cycle to lock on to that input before the packet passes, so every
+# packet costs one bubble cycle. step() is this cycle for cycle, for a batch
+# of scenarios at once. replay() checks it against a trace of axis_arb_tb, and
+# sweep() runs random traffic through it to find the throughput and latency
+# of every input.
+#
+# Run as a script to sweep random traffic mixes:
+#   python -m models.axis_arb --inputs 4 --scenarios 4096 --csv arb.csv
+################################################################################
+
+import argparse
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from models import tlm
+
+# Probes of the axis_arb_tb trace, followed by s_valid, s_ready and s_last of
+# every input
+PROBE_SRST, PROBE_M_VALID, PROBE_M_READY, PROBE_M_LAST = range(4)
+PROBES_PER_INPUT = 3
+
+
+@dataclass
+class State:
+    locked: np.ndarray
+    sel: np.ndarray
+    m_valid: np.ndarray
+    m_last: np.ndarray
+    m_src: np.ndarray
+
+    @classmethod
+    def reset(cls, scenarios: int) -> "State":
+        zeros = np.zeros(scenarios, dtype=bool)
+        return cls(zeros.copy(), np.zeros(scenarios, dtype=int), zeros.copy(), zeros.copy(),
+                   np.zeros(scenarios, dtype=int))
+
+
+def step(state: State, s_valid: np.ndarray, s_last: np.ndarray, m_ready: np.ndarray) -> np.ndarray:
+    """
+    Advance every scenario by one clock edge, given the (scenarios, inputs)
+    tvalid and tlast of the inputs and the tready of the output during the
+    cycle before it. Return the tready of the inputs during that cycle.
+    """
+    rows = np.arange(len(state.sel))
+    oe = m_ready | ~state.m_valid
+    s_ready = np.zeros_like(s_valid)
+    s_ready[rows, state.sel] = oe & state.locked
+
+    fire = (s_valid & s_ready).any(axis=1)
+    last = s_last[rows, state.sel]
+    state.m_valid = (state.m_valid & ~m_ready) | fire
+    state.m_last = np.where(fire, last, state.m_last)
+    state.m_src = np.where(fire, state.sel, state.m_src)
+
+    any_valid, grant = tlm.highest(s_valid)
+    lock = ~state.locked & any_valid & oe
+    state.sel = np.where(lock, grant, state.sel)
+    state.locked = (state.locked | lock) & ~(fire & last)
+    return s_ready
+
+
+def replay(probes: np.ndarray) -> list[str]:
+    """
+    Drive the model with the input tvalid and tlast and the output tready
+    that axis_arb_tb traced, and check its tready and output tvalid against
+    the traced ones on every cycle after reset
+    """
+    num_inputs = (probes.shape[1] - 4) // PROBES_PER_INPUT
+    s_valid = probes[:, 4::PROBES_PER_INPUT]
+    s_ready = probes[:, 5::PROBES_PER_INPUT]
+    s_last = probes[:, 6::PROBES_PER_INPUT]
+    errors = []
+    state = None
+    for cycle, row in enumerate(probes, start=1):
+        if row[PROBE_SRST]:
+            state = State.reset(1)
+            continue
+        if state is None:
+            continue
+        if state.m_valid[0] != row[PROBE_M_VALID]:
+            errors.append(f"Cycle {cycle}: model m_valid={int(state.m_valid[0])}, trace m_valid={int(row[PROBE_M_VALID])}")
+        ready = step(state, s_valid[cycle - 1][None], s_last[cycle - 1][None], row[None, PROBE_M_READY])[0]
+        for i in np.flatnonzero(ready != s_ready[cycle - 1]):
+            errors.append(f"Cycle {cycle}: model s_ready({i})={int(ready[i])}, trace s_ready({i})={int(s_ready[cycle - 1][i])}")
+        if len(errors) > tlm.MAX_ERRORS:
+            break
+    if state is None:
+        errors.append(f"Reset was never traced for the {num_inputs} inputs")
+    return errors
+
+
+def sweep(
+    rate: np.ndarray,
+    min_beats: int,
+    max_beats: int,
+    s_stall: float = 0.0,
+    m_stall: float = 0.0,
+    cycles: int = 10000,
+    warmup: int = 1000,
+    seed: int = tlm.SEED,
+) -> dict[str, np.ndarray]:
+    """
+    Run random traffic through a batch of scenarios. Packets of min_beats to
+    max_beats beats arrive at each input with the (scenarios, inputs)
+    probability rate on every cycle, and queue until the arbiter takes them.
+    The inputs drop tvalid and the output drops tready with probability
+    s_stall and m_stall. Return the beats per cycle that each input and the
+    output passed, and the mean and peak number of packets queued and mean
+    latency in cycles of each input, from the arrival of a packet to its last
+    beat, measured over the cycles after warmup.
+    """
+    rng = np.random.default_rng(seed)
+    rate = np.asarray(rate, dtype=float)
+    scenarios, num_inputs = rate.shape
+    state = State.reset(scenarios)
+
+    backlog = np.zeros((scenarios, num_inputs), dtype=np.int64)
+    beats_left = np.zeros((scenarios, num_inputs), dtype=np.int64)
+    valid = np.zeros((scenarios, num_inputs), dtype=bool)
+    beats = np.zeros((scenarios, num_inputs), dtype=np.int64)
+    m_beats = np.zeros(scenarios, dtype=np.int64)
+    packets = np.zeros((scenarios, num_inputs), dtype=np.int64)
+    backlog_sum = np.zeros((scenarios, num_inputs), dtype=np.int64)
+    backlog_max = np.zeros((scenarios, num_inputs), dtype=np.int64)
+
+    for cycle in range(warmup + cycles):
+        measure = cycle >= warmup
+        backlog += rng.random((scenarios, num_inputs)) < rate
+
+        # Start the next queued packet
+        start = (beats_left == 0) & (backlog > 0)
+        beats_left[start] = rng.integers(min_beats, max_beats, size=int(start.sum()), endpoint=True)
+        valid |= start & (rng.random((scenarios, num_inputs)) >= s_stall)
+
+        m_ready = rng.random(scenarios) >= m_stall
+        m_fire = state.m_valid & m_ready
+        s_ready = step(state, valid, valid & (beats_left == 1), m_ready)
+        fire = valid & s_ready
+        done = fire & (beats_left == 1)
+        beats_left -= fire
+        backlog -= done
+
+        # tvalid stays high until its beat is taken, like in any AXIS source
+        held = valid & ~fire
+        valid = held | (~held & (beats_left > 0) & (rng.random((scenarios, num_inputs)) >= s_stall))
+
+        if measure:
+            beats += fire
+            m_beats += m_fire
+            packets += done
+            backlog_sum += backlog
+            np.maximum(backlog_max, backlog, out=backlog_max)
+
+    stats = tlm.backlog_stats(backlog_sum, packets, cycles)
+    return {
+        "beats_per_cycle": beats / cycles,
+        "m_beats_per_cycle": m_beats / cycles,
+        "packets_per_cycle": stats["per_cycle"],
+        "latency_cycles": stats["latency_cycles"],
+        "backlog_mean": backlog_sum / cycles,
+        "backlog_max": backlog_max,
+    }
+
+
+def post_check(output_path) -> bool:
+    return tlm.post_check(output_path, replay)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep random traffic mixes through the axis_arb model")
+    parser.add_argument("--inputs", type=int, default=4, help="Number of inputs")
+    parser.add_argument("--scenarios", type=int, default=1024, help="Number of traffic mixes")
+    parser.add_argument("--cycles", type=int, default=10000, help="Measured cycles per scenario")
+    parser.add_argument("--load", type=float, nargs=2, default=[0.1, 1.2], metavar=("MIN", "MAX"),
+                        help="Range of the total offered load, in beats per cycle")
+    parser.add_argument("--beats", type=int, nargs=2, default=[1, 5], metavar=("MIN", "MAX"),
+                        help="Range of the packet length, in beats")
+    parser.add_argument("--s-stall", type=float, default=0.0, help="Input tvalid stall probability")
+    parser.add_argument("--m-stall", type=float, default=0.0, help="Output tready stall probability")
+    parser.add_argument("--seed", type=int, default=tlm.SEED, help="Random seed")
+    parser.add_argument("--csv", type=Path, help="Write one row per scenario to this file")
+    parser.add_argument("--replay", type=Path, help="Replay an axis_arb_tb trace instead of sweeping")
+    args = parser.parse_args()
+
+    if args.replay:
+        errors = replay(tlm.read_trace(args.replay))
+        for e in errors:
+            print(f"ERROR: {e}")
+        raise SystemExit(1 if errors else 0)
+
+    # Split a random total load over the inputs in random shares
+    rng = np.random.default_rng(args.seed)
+    load = rng.uniform(*args.load, size=(args.scenarios, 1))
+    share = rng.dirichlet(np.ones(args.inputs), size=args.scenarios)
+    rate = np.minimum(load * share / np.mean(args.beats), 1.0)
+    result = sweep(rate, *args.beats, args.s_stall, args.m_stall, args.cycles, seed=args.seed)
+
+    offered = rate * np.mean(args.beats)
+    print(f"{'input':>5} {'offered':>9} {'carried':>9} {'latency':>9}   (median over {args.scenarios} scenarios)")
+    for i in range(args.inputs):
+        print(f"{i:>5} {np.median(offered[:, i]):>9.3f} {np.median(result['beats_per_cycle'][:, i]):>9.3f} "
+              f"{np.nanmedian(result['latency_cycles'][:, i]):>9.1f}")
+    print(f"Output beats per cycle: mean {result['m_beats_per_cycle'].mean():.3f}, "
+          f"max {result['m_beats_per_cycle'].max():.3f}")
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ["scenario"] + [f"offered_{i}" for i in range(args.inputs)]
+                + [f"beats_per_cycle_{i}" for i in range(args.inputs)]
+                + [f"latency_cycles_{i}" for i in range(args.inputs)] + ["m_beats_per_cycle"]
+            )
+            for s in range(args.scenarios):
+                writer.writerow(
+                    [s] + list(offered[s]) + list(result["beats_per_cycle"][s])
+                    + list(result["latency_cycles"][s]) + [result["m_beats_per_cycle"][s]]
+                )
@@ -0,0 +1,178 @@
+################################################################################
+# File : axis_dump.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Reader and writer for the AXIS beat files written by axis_dump.vhd and
+# bfm_axis_sub, and streamed by bfm_axis_man (see axis_file_pkg.vhd)
+#
+# File format, all values little endian:
+#   Header (16 bytes)
+#     0  "SBAX"
+#     4  u8   format version
+#     5  u8x3 reserved
+#     8  u16  KW, number of byte lanes
+#     10 u16  DBW, data bits per lane
+#     12 u16  UBW, user bits per lane
+#     14 u16  reserved
+#   Beats, one record per accepted beat
+#     u8 flags, bit 0 is tlast
+#     ceil(KW/8) bytes of tkeep, lane 0 in bit 0
+#     KW lanes of tdata, ceil(DBW/8) bytes each
+#     KW lanes of tuser, ceil(UBW/8) bytes each
+################################################################################
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"SBAX"
+FORMAT_VERSION = 1
+HEADER_SIZE = 16
+
+
+@dataclass
+class Beats:
+    """
+    A stream of AXIS beats. keep, data and user have one row per beat and
+    one column per byte lane.
+    """
+
+    last: np.ndarray
+    keep: np.ndarray
+    data: np.ndarray
+    user: np.ndarray
+    dbw: int
+    ubw: int
+
+    @property
+    def kw(self) -> int:
+        return self.keep.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.last)
+
+
+def _nbytes(bits: int) -> int:
+    return (bits + 7) // 8
+
+
+def _record_size(kw: int, dbw: int, ubw: int) -> int:
+    return 1 + _nbytes(kw) + kw * _nbytes(dbw) + kw * _nbytes(ubw)
+
+
+def _lanes_to_int(raw: np.ndarray, kw: int, nbytes: int) -> np.ndarray:
+    raw = raw.reshape(len(raw), kw, nbytes).astype(np.uint64)
+    shifts = (8 * np.arange(nbytes)).astype(np.uint64)
+    return np.bitwise_or.reduce(raw << shifts, axis=2) if nbytes else np.zeros(raw.shape[:2], np.uint64)
+
+
+def _int_to_lanes(values: np.ndarray, nbytes: int) -> np.ndarray:
+    shifts = (8 * np.arange(nbytes)).astype(np.uint64)
+    raw = (values.astype(np.uint64)[..., None] >> shifts) & np.uint64(0xFF)
+    return raw.astype(np.uint8).reshape(len(values), -1)
+
+
+def _header(kw: int, dbw: int, ubw: int) -> bytes:
+    return MAGIC + bytes([FORMAT_VERSION, 0, 0, 0]) + np.array([kw, dbw, ubw, 0], dtype="<u2").tobytes()
+
+
+def _parse_header(buf: bytes, path: Path) -> tuple[int, int, int]:
+    """
+    Check a file header and return its KW, DBW and UBW
+    """
+    if len(buf) < HEADER_SIZE or buf[:4] != MAGIC:
+        raise ValueError(f"{path}: not an AXIS dump file")
+    version = buf[4]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported AXIS dump version {version}")
+    kw, dbw, ubw = np.frombuffer(buf, dtype="<u2", count=3, offset=8)
+    return int(kw), int(dbw), int(ubw)
+
+
+def _decode(body: np.ndarray, kw: int, dbw: int, ubw: int) -> Beats:
+    body = body.reshape(-1, _record_size(kw, dbw, ubw))
+    kb, db = _nbytes(kw), _nbytes(dbw)
+    last = (body[:, 0] & 1).astype(bool)
+    keep = np.unpackbits(body[:, 1 : 1 + kb], axis=1, bitorder="little")[:, :kw].astype(bool)
+    data = _lanes_to_int(body[:, 1 + kb : 1 + kb + kw * db], kw, db)
+    user = _lanes_to_int(body[:, 1 + kb + kw * db :], kw, _nbytes(ubw))
+    return Beats(last, keep, data, user, dbw, ubw)
+
+
+def _encode(beats: Beats) -> bytes:
+    body = np.hstack([
+        beats.last.astype(np.uint8)[:, None],
+        np.packbits(beats.keep, axis=1, bitorder="little"),
+        _int_to_lanes(beats.data, _nbytes(beats.dbw)),
+        _int_to_lanes(beats.user, _nbytes(beats.ubw)),
+    ])
+    return body.tobytes()
+
+
+def read(path: Path) -> Beats:
+    buf = Path(path).read_bytes()
+    kw, dbw, ubw = _parse_header(buf, path)
+    size = _record_size(kw, dbw, ubw)
+    body = np.frombuffer(buf, dtype=np.uint8, offset=HEADER_SIZE)
+    # A partial record at the end means the simulation stopped mid-write
+    return _decode(body[: len(body) // size * size], kw, dbw, ubw)
+
+
+def chunks(path: Path, beats_per_chunk: int = 1 << 16):
+    """
+    Iterate over the beats of a file in chunks of up to beats_per_chunk
+    beats, so that files larger than memory can be processed
+    """
+    with open(path, "rb") as f:
+        kw, dbw, ubw = _parse_header(f.read(HEADER_SIZE), path)
+        size = _record_size(kw, dbw, ubw)
+        while True:
+            buf = f.read(size * beats_per_chunk)
+            # A partial record at the end means the simulation stopped
+            # mid-write
+            buf = buf[: len(buf) // size * size]
+            if not buf:
+                return
+            yield _decode(np.frombuffer(buf, dtype=np.uint8), kw, dbw, ubw)
+
+
+class Writer:
+    """
+    Writes a file chunk by chunk, for streams that are too large to build in
+    memory at once:
+
+        with Writer(path, kw, dbw, ubw) as w:
+            for beats in ...:
+                w.write(beats)
+    """
+
+    def __init__(self, path: Path, kw: int, dbw: int, ubw: int):
+        self.kw, self.dbw, self.ubw = kw, dbw, ubw
+        self.num_beats = 0
+        self._f = open(path, "wb")
+        self._f.write(_header(kw, dbw, ubw))
+
+    def write(self, beats: Beats):
+        if (beats.kw, beats.dbw, beats.ubw) != (self.kw, self.dbw, self.ubw):
+            raise ValueError(
+                f"Beats for KW={beats.kw}, DBW={beats.dbw}, UBW={beats.ubw} written to a file "
+                f"for KW={self.kw}, DBW={self.dbw}, UBW={self.ubw}"
+            )
+        self._f.write(_encode(beats))
+        self.num_beats += len(beats)
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write(path: Path, beats: Beats):
+    with Writer(path, beats.kw, beats.dbw, beats.ubw) as w:
+        w.write(beats)
@@ -0,0 +1,28 @@
+################################################################################
+# File : axis_pack.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Reference model of axis_pack
+################################################################################
+
+from models import axis
+from models.axis_dump import Beats
+
+
+def model(s_beats: Beats) -> Beats:
+    """
+    Return the output of axis_pack, which is always a packed stream
+    """
+    return axis.packed_beats(axis.packets(s_beats), s_beats.kw, s_beats.dbw, s_beats.ubw)
+
+
+def check(s_beats: Beats, m_beats: Beats) -> list[str]:
+    errors = axis.check_protocol(m_beats, packed=True)
+    if not errors:
+        errors += axis.check_beats(model(s_beats), m_beats)
+    return errors
+
+
+def post_check(output_path) -> bool:
+    return axis.post_check(output_path, check)
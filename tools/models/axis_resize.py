@@ -0,0 +1,30 @@
+################################################################################
+# File : axis_resize.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Reference model of axis_resize
+################################################################################
+
+from models import axis
+from models.axis_dump import Beats
+
+
+def model(s_beats: Beats, m_kw: int) -> Beats:
+    """
+    Return the output of axis_resize for a packed input stream. The beats
+    of an unpacked input are not fully defined, only the packets they carry.
+    """
+    return axis.packed_beats(axis.packets(s_beats), m_kw, s_beats.dbw, s_beats.ubw)
+
+
+def check(s_beats: Beats, m_beats: Beats, packed: bool) -> list[str]:
+    errors = axis.check_protocol(m_beats, packed)
+    errors += axis.check_packets(axis.packets(s_beats), axis.packets(m_beats))
+    if packed and not errors:
+        errors += axis.check_beats(model(s_beats, m_beats.kw), m_beats)
+    return errors
+
+
+def post_check(output_path, packed: bool) -> bool:
+    return axis.post_check(output_path, check, packed=packed)
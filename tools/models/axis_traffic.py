@@ -0,0 +1,138 @@
+################################################################################
+# File : axis_traffic.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Random AXIS packet files
+# ..Writes random packets as a stream of beats to a file in the axis_dump
+# format, for bfm_axis_man to send with G_FILE_NAME set. The traffic is
+# generated and written in chunks, so a file can be much larger than memory.
+# A file is only regenerated when its parameters or this generator change, so
+# one file is shared by every config and every run that uses the same bus.
+#
+# Run as a script to write a file by hand:
+#   python -m models.axis_traffic <file> --kw 4 --dbw 8 --ubw 1 --packets 100000
+################################################################################
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from models import axis, axis_dump
+from models.axis_dump import Beats
+
+# Bump when the generated files change, so that old ones are regenerated
+GENERATOR_VERSION = 1
+
+SEED = 20
+PACKETS_PER_CHUNK = 1 << 12
+
+
+def file_name(kw: int, dbw: int, ubw: int, packed: bool, num_packets: int, max_lanes: int) -> str:
+    mode = "packed" if packed else "sparse"
+    return f"kw{kw}_dbw{dbw}_ubw{ubw}_{mode}_max{max_lanes}_n{num_packets}.bin"
+
+
+def random_packets(rng: np.random.Generator, num_packets: int, max_lanes: int, dbw: int, ubw: int) -> axis.Packets:
+    """
+    Return packets of 1 to max_lanes lanes of random data and user
+    """
+    lengths = rng.integers(1, max_lanes, size=num_packets, endpoint=True)
+    total = int(lengths.sum())
+    data = rng.integers(0, 1 << dbw, size=total, dtype=np.uint64, endpoint=False)
+    user = rng.integers(0, 1 << ubw, size=total, dtype=np.uint64, endpoint=False)
+    return axis.Packets(data, user, lengths)
+
+
+def sparse_beats(rng: np.random.Generator, pkts: axis.Packets, kw: int, dbw: int, ubw: int) -> Beats:
+    """
+    Return a stream of beats that carries a set of packets with a random
+    number of lanes, 0 to kw, in every beat, filled from low to high. The last
+    beat of a packet always has at least one lane.
+    """
+    total = len(pkts.data)
+    ends = np.cumsum(pkts.lengths)
+
+    # Cut the lanes of all packets at random beat sizes, then also at the end
+    # of every packet
+    sizes = rng.integers(0, kw, size=2 * total // max(kw, 1) + 16, endpoint=True)
+    while sizes.sum() < total:
+        sizes = np.concatenate([sizes, rng.integers(0, kw, size=len(sizes), endpoint=True)])
+    cuts = np.cumsum(sizes)
+    cuts = cuts[(cuts < total) & ~np.isin(cuts, ends)]
+    cuts = np.concatenate([cuts, ends])
+    order = np.argsort(cuts, kind="stable")
+    cuts = cuts[order]
+    last = (order >= len(cuts) - len(ends))
+
+    num_beats = len(cuts)
+    lanes = np.arange(total)
+    beat = np.searchsorted(cuts, lanes, side="right")
+    start = np.concatenate([[0], cuts[:-1]])
+    lane = lanes - start[beat]
+
+    keep = np.zeros((num_beats, kw), dtype=bool)
+    data = np.zeros((num_beats, kw), dtype=np.uint64)
+    user = np.zeros((num_beats, kw), dtype=np.uint64)
+    keep[beat, lane] = True
+    data[beat, lane] = pkts.data
+    user[beat, lane] = pkts.user
+    return Beats(last, keep, data, user, dbw, ubw)
+
+
+def generate(
+    path: Path, kw: int, dbw: int, ubw: int, packed: bool, num_packets: int, max_lanes: int,
+    seed: int = SEED,
+) -> Path:
+    """
+    Write num_packets random packets to a file, unless it is already up to
+    date. In a packed stream every beat but the last of a packet is full.
+    """
+    path = Path(path)
+    manifest = path.with_suffix(".json")
+    key = {
+        "version": GENERATOR_VERSION, "kw": kw, "dbw": dbw, "ubw": ubw, "packed": packed,
+        "num_packets": num_packets, "max_lanes": max_lanes, "seed": seed,
+    }
+    try:
+        if json.loads(manifest.read_text()) == key and path.exists():
+            return path
+    except (OSError, ValueError):
+        pass
+
+    print(f"INFO: Generating {num_packets} AXIS packets in {path}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    # Write to a temporary file first, so that an interrupted run never leaves
+    # a partial file behind
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with axis_dump.Writer(tmp, kw, dbw, ubw) as w:
+        for first in range(0, num_packets, PACKETS_PER_CHUNK):
+            pkts = random_packets(rng, min(PACKETS_PER_CHUNK, num_packets - first), max_lanes, dbw, ubw)
+            if packed:
+                w.write(axis.packed_beats(pkts, kw, dbw, ubw))
+            else:
+                w.write(sparse_beats(rng, pkts, kw, dbw, ubw))
+    tmp.replace(path)
+    manifest.write_text(json.dumps(key))
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a file of random AXIS packets")
+    parser.add_argument("file", type=Path, help="File to write")
+    parser.add_argument("--kw", type=int, required=True, help="Number of byte lanes")
+    parser.add_argument("--dbw", type=int, required=True, help="Data bits per lane")
+    parser.add_argument("--ubw", type=int, required=True, help="User bits per lane")
+    parser.add_argument("--packets", type=int, required=True, help="Number of packets")
+    parser.add_argument("--max-lanes", type=int, help="Maximum packet length in lanes, 3 * KW by default")
+    parser.add_argument("--sparse", action="store_true", help="Send a random number of lanes in every beat")
+    parser.add_argument("--seed", type=int, default=SEED, help="Random seed")
+    args = parser.parse_args()
+    generate(
+        args.file, args.kw, args.dbw, args.ubw, not args.sparse, args.packets,
+        args.max_lanes or 3 * args.kw, args.seed,
+    )
@@ -0,0 +1,415 @@
+################################################################################
+# File : ebtb.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Reference model of ebtb_encode and ebtb_decode (8b/10b)
+# ..The logic equations are ported one for one from the RTL, so the model also
+# matches the decoder's error flags on illegal input, not just the standard
+# code tables. A 10b symbol is written as an integer with bit 9 = a, down to
+# bit 0 = j, the same as the dout and din ports.
+#
+# Run as a script to regenerate the ebtb_tb lookup package and vectors:
+#   python -m models.ebtb <output_dir>
+################################################################################
+
+import hashlib
+import json
+import random
+import sys
+from functools import cache
+from pathlib import Path
+
+# Files written by generate
+OUTPUTS = ["ebtb_lookup_pkg.vhd", "ebtb_encode.bin", "ebtb_decode.bin"]
+
+# The 12 valid control codes: K28.0 to K28.7, K23.7, K27.7, K29.7 and K30.7
+K_CODES = [0x1C, 0x3C, 0x5C, 0x7C, 0x9C, 0xBC, 0xDC, 0xFC, 0xF7, 0xFB, 0xFD, 0xFE]
+
+# Number of symbols in each of the encode and decode vector files
+NUM_SYMBOLS = 1 << 20
+SEED = 8
+
+
+def _bits(value: int, n: int) -> list[bool]:
+    return [bool((value >> i) & 1) for i in range(n)]
+
+
+def encode_symbol(k: bool, byte: int, dispin: bool) -> tuple[int, bool]:
+    """
+    Encode one byte, returning the 10b symbol and the running disparity out
+    (True is positive)
+    """
+    ai, bi, ci, di, ei, fi, gi, hi = _bits(byte, 8)
+    ki = k
+
+    aeqb = ai == bi
+    ceqd = ci == di
+    l22 = (ai and bi and not ci and not di) or (ci and di and not ai and not bi) or (not aeqb and not ceqd)
+    l40 = ai and bi and ci and di
+    l04 = not ai and not bi and not ci and not di
+    l13 = (not aeqb and not ci and not di) or (not ceqd and not ai and not bi)
+    l31 = (not aeqb and ci and di) or (not ceqd and ai and bi)
+
+    ao = ai
+    bo = (bi and not l40) or l04
+    co = l04 or ci or (ei and di and not ci and not bi and not ai)
+    do = di and not (ai and bi and ci)
+    eo = (ei or l13) and not (ei and di and not ci and not bi and not ai)
+    io = (
+        (l22 and not ei)
+        or (ei and not di and not ci and not (ai and bi))
+        or (ei and l40)
+        or (ki and ei and di and ci and not bi and not ai)
+        or (ei and not di and ci and not bi and not ai)
+    )
+
+    pd1s6 = (ei and di and not ci and not bi and not ai) or (not ei and not l22 and not l31)
+    nd1s6 = ki or (ei and not l22 and not l13) or (not ei and not di and ci and bi and ai)
+    ndos6 = pd1s6
+    pdos6 = ki or (ei and not l22 and not l13)
+
+    if dispin:
+        dispval = not ei and di and l31
+    else:
+        dispval = ei and not di and l13
+    alt7 = fi and gi and hi and (ki or dispval)
+
+    fo = fi and not alt7
+    go = gi or (not fi and not gi and not hi)
+    ho = hi
+    jo = (not hi and (gi != fi)) or alt7
+
+    nd1s4 = fi and gi
+    pd1s4 = (not fi and not gi) or (ki and ((fi and not gi) or (not fi and gi)))
+    ndos4 = not fi and not gi
+    pdos4 = fi and gi and hi
+
+    compls6 = (pd1s6 and not dispin) or (nd1s6 and dispin)
+    disp6 = dispin != bool(ndos6 or pdos6)
+    compls4 = (pd1s4 and not disp6) or (nd1s4 and disp6)
+    dispout = disp6 != bool(ndos4 or pdos4)
+
+    out = [
+        ao != compls6, bo != compls6, co != compls6, do != compls6, eo != compls6, io != compls6,
+        fo != compls4, go != compls4, ho != compls4, jo != compls4,
+    ]
+    symbol = sum(int(bool(b)) << (9 - i) for i, b in enumerate(out))
+    return symbol, bool(dispout)
+
+
+def decode_symbol(symbol: int, dispin: bool) -> tuple[bool, int, bool, bool, bool]:
+    """
+    Decode one 10b symbol, returning (k, byte, code_err, disp_err, dispout)
+    """
+    ji, hi, gi, fi, ii, ei, di, ci, bi, ai = _bits(symbol, 10)
+
+    aeqb = ai == bi
+    ceqd = ci == di
+    p22 = (ai and bi and not ci and not di) or (ci and di and not ai and not bi) or (not aeqb and not ceqd)
+    p13 = (not aeqb and not ci and not di) or (not ceqd and not ai and not bi)
+    p31 = (not aeqb and ci and di) or (not ceqd and ai and bi)
+
+    disp6a = p31 or (p22 and dispin)
+    disp6a2 = p31 and dispin
+    disp6a0 = p13 and not dispin
+    disp6b = (
+        (ei and ii and not disp6a0) or (disp6a and (ei or ii)) or disp6a2 or (ei and ii and di)
+    ) and (ei or ii or di)
+
+    p22bceeqi = p22 and bi and ci and ei == ii
+    p22bncneeqi = p22 and not bi and not ci and ei == ii
+    p13in = p13 and not ii
+    p31i = p31 and ii
+    p13dei = p13 and di and ei and ii
+    p22aceeqi = p22 and ai and ci and ei == ii
+    p22ancneeqi = p22 and not ai and not ci and ei == ii
+    p13en = p13 and not ei
+    anbnenin = not ai and not bi and not ei and not ii
+    abei = ai and bi and ei and ii
+    cndnenin = not ci and not di and not ei and not ii
+
+    compa = p22bncneeqi or p31i or p13dei or p22ancneeqi or p13en or abei or cndnenin
+    compb = p22bceeqi or p31i or p13dei or p22aceeqi or p13en or abei or cndnenin
+    compc = p22bceeqi or p31i or p13dei or p22ancneeqi or p13en or anbnenin or cndnenin
+    compd = p22bncneeqi or p31i or p13dei or p22aceeqi or p13en or abei or cndnenin
+    compe = p22bncneeqi or p13in or p13dei or p22ancneeqi or p13en or anbnenin or cndnenin
+
+    ao = ai != bool(compa)
+    bo = bi != bool(compb)
+    co = ci != bool(compc)
+    do = di != bool(compd)
+    eo = ei != bool(compe)
+
+    feqg = fi == gi
+    heqj = hi == ji
+    fghj22 = (fi and gi and not hi and not ji) or (not fi and not gi and hi and ji) or (not feqg and not heqj)
+    fghjp13 = (not feqg and not hi and not ji) or (not heqj and not fi and not gi)
+    fghjp31 = (not feqg and hi and ji) or (not heqj and fi and gi)
+
+    dispout = (fghjp31 or (disp6b and fghj22) or (hi and ji)) and (hi or ji)
+
+    ko = (
+        (ci and di and ei and ii)
+        or (not ci and not di and not ei and not ii)
+        or (p13 and not ei and ii and gi and hi and ji)
+        or (p31 and ei and not ii and not gi and not hi and not ji)
+    )
+
+    k28p = not (ci or di or ei or ii)
+    fo = (
+        (ji and not fi and (hi or not gi or k28p))
+        or (fi and not ji and (not hi or gi or not k28p))
+        or (k28p and gi and hi)
+        or (not k28p and not gi and not hi)
+    )
+    go = (
+        (ji and not fi and (hi or not gi or not k28p))
+        or (fi and not ji and (not hi or gi or k28p))
+        or (not k28p and gi and hi)
+        or (k28p and not gi and not hi)
+    )
+    ho = (
+        (
+            (ji != hi)
+            and not (
+                (not fi and gi and not hi and ji and not k28p)
+                or (not fi and gi and hi and not ji and k28p)
+                or (fi and not gi and not hi and ji and not k28p)
+                or (fi and not gi and hi and not ji and k28p)
+            )
+        )
+        or (not fi and gi and hi and ji)
+        or (fi and not gi and not hi and not ji)
+    )
+
+    disp6p = (p31 and (ei or ii)) or (p22 and ei and ii)
+    disp6n = (p13 and not (ei and ii)) or (p22 and not ei and not ii)
+    disp4p = fghjp31
+    disp4n = fghjp13
+
+    code_err = (
+        ((ai and bi and ci and di) or not (ai or bi or ci or di))
+        or (p13 and not ei and not ii)
+        or (p31 and ei and ii)
+        or ((fi and gi and hi and ji) or not (fi or gi or hi or ji))
+        or ((ei and ii and fi and gi and hi) or not (ei or ii or fi or gi or hi))
+        or ((not ii and ei and gi and hi and ji) or not (not ii or ei or gi or hi or ji))
+        or (
+            ((not ei and not ii and gi and hi and ji) or not (not ei or not ii or gi or hi or ji))
+            and not ((ci and di and ei) or not (ci or di or ei))
+        )
+        or (not p31 and ei and not ii and not gi and not hi and not ji)
+        or (not p13 and not ei and ii and gi and hi and ji)
+    )
+
+    disp_err = (
+        (dispin and disp6p)
+        or (disp6n and not dispin)
+        or (dispin and not disp6n and fi and gi)
+        or (dispin and ai and bi and ci)
+        or (dispin and not disp6n and disp4p)
+        or (not dispin and not disp6p and not fi and not gi)
+        or (not dispin and not ai and not bi and not ci)
+        or (not dispin and not disp6p and disp4n)
+        or (disp6p and disp4p)
+        or (disp6n and disp4n)
+    )
+
+    byte = sum(int(bool(b)) << i for i, b in enumerate([ao, bo, co, do, eo, fo, go, ho]))
+    return bool(ko), byte, bool(code_err), bool(disp_err), bool(dispout)
+
+
+# Every input of both blocks for both running disparities, so that long
+# streams only need a table lookup per symbol
+@cache
+def encode_table() -> dict:
+    return {(k, b, d): encode_symbol(k, b, d) for k in (False, True) for b in range(256) for d in (False, True)}
+
+
+@cache
+def decode_table() -> dict:
+    return {(s, d): decode_symbol(s, d) for s in range(1024) for d in (False, True)}
+
+
+def codes() -> list[tuple[bool, int]]:
+    """
+    Return every valid (k, byte) input, in the order of the lookup package
+    """
+    return [(False, b) for b in range(256)] + [(True, b) for b in K_CODES]
+
+
+def encode(symbols, dispin: bool = False) -> list[tuple[int, bool]]:
+    """
+    Encode a stream of (k, byte), returning (symbol, dispout) for each
+    """
+    table = encode_table()
+    out = []
+    for k, b in symbols:
+        symbol, dispin = table[(k, b, dispin)]
+        out.append((symbol, dispin))
+    return out
+
+
+def decode(symbols, dispin: bool = False) -> list[tuple[bool, int, bool, bool]]:
+    """
+    Decode a stream of 10b symbols, returning (k, byte, code_err, disp_err)
+    for each
+    """
+    table = decode_table()
+    out = []
+    for s in symbols:
+        k, b, code_err, disp_err, dispin = table[(s, dispin)]
+        out.append((k, b, code_err, disp_err))
+    return out
+
+
+################################################################################
+# Generated test bench files
+################################################################################
+
+LOOKUP_HEADER = """\
+--##############################################################################
+--# File : ebtb_lookup_pkg.vhd
+--# Auth : Chuck Benz, Frans Schreuder, with modifications by David Gussler
+--# ============================================================================
+--# Copyright 2002    Chuck Benz, Hollis, NH
+--# Copyright 2020    Frans Schreuder
+--#
+--# Licensed under the Apache License, Version 2.0 (the "License");
+--# you may not use this file except in compliance with the License.
+--# You may obtain a copy of the License at
+--#
+--#     http://www.apache.org/licenses/LICENSE-2.0
+--#
+--# Unless required by applicable law or agreed to in writing, software
+--# distributed under the License is distributed on an "AS IS" BASIS,
+--# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+--# See the License for the specific language governing permissions and
+--# limitations under the License.
+--#
+--# The information and description contained herein is the
+--# property of Chuck Benz.
+--#
+--# Permission is granted for any reuse of this information
+--# and description as long as this copyright notice is
+--# preserved.  Modifications may be made as long as this
+--# notice is preserved.
+--# ============================================================================
+--# GENERATED FILE, DO NOT EDIT. Generated by tools/models/ebtb.py.
+--#
+--# per Widmer and Franaszek
+--##############################################################################
+
+library ieee;
+use ieee.std_logic_1164.all;
+
+package ebtb_lookup_pkg is
+
+  type slv9_array_t is array(natural range <>) of std_logic_vector(8 downto 0);
+
+  type code_type_t is record
+    k           : std_logic;
+    val_8b      : std_logic_vector(7 downto 0);
+    val_10b_neg : std_logic_vector(9 downto 0);
+    val_10b_pos : std_logic_vector(9 downto 0);
+    disp_flip   : std_logic;
+  end record;
+
+  type code_type_array_t is array(natural range <>) of code_type_t;
+
+"""
+
+
+def lookup_pkg() -> str:
+    """
+    Return the VHDL lookup package of every valid code, encoded with negative
+    and positive starting disparity
+    """
+    rows = []
+    for k, b in codes():
+        neg, flip = encode_table()[(k, b, False)]
+        pos, _ = encode_table()[(k, b, True)]
+        rows.append(f"    ('{int(k)}', \"{b:08b}\", \"{neg:010b}\", \"{pos:010b}\", '{int(flip)}')")
+    return (
+        LOOKUP_HEADER
+        + f"  constant CODE8B10B : code_type_array_t(0 to {len(rows) - 1}) := (\n"
+        + ",\n".join(rows)
+        + "\n  );\n\nend package;\n"
+    )
+
+
+def random_symbols(rnd: random.Random, n: int) -> list[tuple[bool, int]]:
+    """
+    Return n random inputs, mostly data with some control codes mixed in
+    """
+    return [
+        (True, rnd.choice(K_CODES)) if rnd.random() < 0.05 else (False, rnd.randrange(256))
+        for _ in range(n)
+    ]
+
+
+def encode_vectors(rnd: random.Random, n: int) -> bytes:
+    """
+    Encode vectors, 4 bytes each: flags (bit 0 = k, bit 1 = expected
+    disparity out), data byte, expected 10b symbol as u16 little endian
+    """
+    symbols = random_symbols(rnd, n)
+    out = bytearray()
+    for (k, b), (symbol, disp) in zip(symbols, encode(symbols)):
+        out += bytes([int(k) | int(disp) << 1, b, symbol & 0xFF, symbol >> 8])
+    return bytes(out)
+
+
+def decode_vectors(rnd: random.Random, n: int) -> bytes:
+    """
+    Decode vectors, 4 bytes each: 10b symbol as u16 little endian, expected
+    data byte, expected flags (bit 0 = k, bit 1 = code_err, bit 2 =
+    disp_err). The symbols are a valid encoded stream with errors injected:
+    single bit flips, valid symbols with a random starting disparity, and
+    random 10b words.
+    """
+    valid = codes()
+    stream = [s for s, _ in encode(random_symbols(rnd, n))]
+    for i in range(n):
+        r = rnd.random()
+        if r < 0.01:
+            stream[i] ^= 1 << rnd.randrange(10)
+        elif r < 0.015:
+            k, b = rnd.choice(valid)
+            stream[i] = encode_table()[(k, b, rnd.random() < 0.5)][0]
+        elif r < 0.02:
+            stream[i] = rnd.randrange(1024)
+    out = bytearray()
+    for s, (k, b, code_err, disp_err) in zip(stream, decode(stream)):
+        out += bytes([s & 0xFF, s >> 8, b, int(k) | int(code_err) << 1 | int(disp_err) << 2])
+    return bytes(out)
+
+
+def generate(output_dir: Path, num_symbols: int = NUM_SYMBOLS):
+    """
+    Write the lookup package and vector files to output_dir, unless they are
+    already up to date. They are regenerated when this model changes, or when
+    any of them is missing.
+    """
+    output_dir = Path(output_dir)
+    manifest = output_dir / "manifest.json"
+    source = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+    key = {"source": source, "num_symbols": num_symbols, "seed": SEED}
+    try:
+        if json.loads(manifest.read_text()) == key and all((output_dir / f).exists() for f in OUTPUTS):
+            return
+    except (OSError, ValueError):
+        pass
+
+    print(f"INFO: Generating 8b10b lookup package and vectors in {output_dir}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    rnd = random.Random(SEED)
+    (output_dir / "ebtb_lookup_pkg.vhd").write_text(lookup_pkg())
+    (output_dir / "ebtb_encode.bin").write_bytes(encode_vectors(rnd, num_symbols))
+    (output_dir / "ebtb_decode.bin").write_bytes(decode_vectors(rnd, num_symbols))
+    manifest.write_text(json.dumps(key))
+
+
+if __name__ == "__main__":
+    generate(Path(sys.argv[1]))
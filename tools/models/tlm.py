@@ -0,0 +1,84 @@
+################################################################################
+# File : tlm.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Common transaction-level model helpers
+# ..The arbiter models step a batch of independent scenarios together, one
+# clock cycle at a time, with the state of every scenario in the rows of NumPy
+# arrays. They are checked against the RTL by replaying the handshakes that a
+# test bench traced with bfm_trace.
+################################################################################
+
+from pathlib import Path
+
+import numpy as np
+
+# Name of the trace that bfm_trace writes to the test output path
+TRACE_FILE = "trace.txt"
+
+# Number of mismatches listed before a replay gives up
+MAX_ERRORS = 10
+
+SEED = 22
+
+
+def read_trace(path: Path) -> np.ndarray:
+    """
+    Return the probes of a bfm_trace file as a (cycles, probes) bool array,
+    with a row for every cycle from cycle 1. The trace only has the cycles
+    where a probe changed, so every row is held until the next one. '1' and
+    'H' are high, and anything else is low.
+    """
+    cycles, rows = [], []
+    for line in Path(path).read_text().splitlines():
+        fields = line.split()
+        if len(fields) == 2:
+            cycles.append(int(fields[0]))
+            rows.append(fields[1])
+    if not rows:
+        return np.zeros((0, 0), dtype=bool)
+
+    chars = np.array([list(r) for r in rows])
+    high = (chars == "1") | (chars == "H")
+    index = np.searchsorted(cycles, np.arange(1, cycles[-1] + 1), side="right") - 1
+    return high[index]
+
+
+def highest(req: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return whether any requester of each row of req is requesting, and the
+    highest numbered one that is, or 0 if none is
+    """
+    n = req.shape[-1]
+    return req.any(axis=-1), n - 1 - np.argmax(req[..., ::-1], axis=-1)
+
+
+def backlog_stats(backlog_sum: np.ndarray, completed: np.ndarray, cycles: int) -> dict[str, np.ndarray]:
+    """
+    Return the throughput and mean latency in cycles per requester, from the
+    sum over all measured cycles of its queued requests and its number of
+    completed requests. The latency follows from Little's law.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        latency = np.where(completed > 0, backlog_sum / completed, np.nan)
+    return {"per_cycle": completed / cycles, "latency_cycles": latency}
+
+
+def post_check(output_path, replay, **kwargs) -> bool:
+    """
+    Replay the trace that a test bench wrote to its output path through a
+    model, and print any mismatches
+    """
+    path = Path(output_path) / TRACE_FILE
+    if not path.exists():
+        print(f"ERROR: {path} was not written, is G_TRACE set?")
+        return False
+    probes = read_trace(path)
+    errors = replay(probes, **kwargs)
+    for e in errors[:MAX_ERRORS]:
+        print(f"ERROR: {e}")
+    if len(errors) > MAX_ERRORS:
+        print(f"ERROR: ... and {len(errors) - MAX_ERRORS} more")
+    print(f"INFO: Replayed {len(probes)} traced cycles through the model.")
+    return not errors
@@ -8,8 +8,14 @@
 
 import sys
 import os
+import json
+import time
+import hashlib
+import argparse
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
+from hdl_registers import __version__ as hdl_registers_version
 from hdl_registers.parser.toml import from_toml
 from hdl_registers.generator.vhdl.axi_lite.wrapper import VhdlAxiLiteWrapperGenerator
 from hdl_registers.generator.vhdl.record_package import VhdlRecordPackageGenerator
@@ -28,24 +34,46 @@ from hdl_registers.generator.python.accessor import PythonAccessorGenerator
 from hdl_registers.generator.python.pickle import PythonPickleGenerator
 
 THIS_DIR = Path(__file__).parent
+REGS_OUT_DIR = THIS_DIR.parent / "build" / "regs_out"
+MANIFEST_FILE = REGS_OUT_DIR / "regs_manifest.json"
 
 ################################################################################
 # Register generator text replacement
 # ..Modify the generated VHDL to better fit this library.
 ################################################################################
-def replace_first_occurrence(file_path, old_text, new_text):
+class PatchError(Exception):
+    pass
+
+
+def patch_file(file_path, patches: list[tuple[str, str]]):
+    """
+    Apply a list of (old_text, new_text) replacements to a file in a single
+    in-memory pass. Only the first occurrence of each old_text is replaced.
+
+    The result is written once, atomically, so a file is never left half
+    patched. A patch whose old_text is missing is only allowed if its new_text
+    is already present, which is the case when hdl_registers decided that the
+    file did not need to be regenerated. Any other missing anchor text means
+    that the generator output has changed underneath us, so it is an error.
+    """
     path = Path(file_path)
     text = path.read_text()
+    new_content = text
 
-    # Replace only the first occurrence
-    new_content = text.replace(old_text, new_text, 1)
+    for old_text, new_text in patches:
+        if old_text in new_content:
+            new_content = new_content.replace(old_text, new_text, 1)
+        elif new_text not in new_content:
+            raise PatchError(
+                f"Anchor text not found in {path}:\n{old_text}"
+            )
 
     if new_content == text:
-        #print("No match found.")
         return
 
-    path.write_text(new_content)
-    #print(f"Replaced first occurrence of:\n{old_text}\nwith:\n{new_text} in file:\n{path}")
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(new_content)
+    tmp.replace(path)
 
 
 
@@ -123,50 +151,271 @@ use register_file.register_file_pkg.all;"""
 NEW_TEXT_REGS_PKG = "use work.register_file_pkg.all;"
 
 
+
+
+# Patches to apply to each generated VHDL file, keyed on the file name
+# template. Patches are applied in order.
+VHDL_PATCHES = {
+    "{name}_register_file_axi_lite.vhd": [
+        (OLD_TEXT_AXI_LITE_1, NEW_TEXT_AXI_LITE_1),
+        (OLD_TEXT_AXI_LITE_2, NEW_TEXT_AXI_LITE_2),
+        (OLD_TEXT_AXI_LITE_3, NEW_TEXT_AXI_LITE_3),
+    ],
+    "{name}_register_record_pkg.vhd": [
+        (OLD_TEXT_RECORD_PKG, NEW_TEXT_RECORD_PKG),
+    ],
+    "{name}_regs_pkg.vhd": [
+        (OLD_TEXT_REGS_PKG, NEW_TEXT_REGS_PKG),
+    ],
+}
+
+
 ################################################################################
-# Main
+# Incremental build manifest
+# ..Each toml file is keyed on its own content, the hdl_registers version, and
+# the text replacement tables above. If none of those have changed since the
+# last run, and all of the previous outputs still exist, then the toml file is
+# skipped entirely so that the generated files keep their old mtimes and VUnit
+# does not recompile them.
 ################################################################################
-def main(toml_files: list[Path]):
+def patch_tables() -> dict[str, str]:
     """
-    Create register artifacts from a toml file
+    Return all of the generated VHDL text replacement tables, by name
     """
+    return {
+        k: v
+        for k, v in sorted(globals().items())
+        if k.startswith(("OLD_TEXT_", "NEW_TEXT_"))
+    }
 
-    for toml_file in toml_files:
+
+def cache_key(toml_file: Path) -> str:
+    """
+    Return the hash that determines whether a toml file must be regenerated
+    """
+    h = hashlib.sha256()
+    h.update(toml_file.read_bytes())
+    h.update(hdl_registers_version.encode())
+    h.update(",".join(GENERATORS).encode())
+    h.update(json.dumps(patch_tables(), sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def load_manifest() -> dict:
+    try:
+        return json.loads(MANIFEST_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: dict):
+    MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    tmp.replace(MANIFEST_FILE)
+
+
+def is_up_to_date(entry: dict | None, key: str) -> bool:
+    """
+    Check a toml file's manifest entry against its current cache key
+    """
+    if entry is None or entry.get("key") != key:
+        return False
+    return all((REGS_OUT_DIR / f).is_file() for f in entry.get("outputs", []))
+
+
+def list_outputs(output_dir: Path) -> list[str]:
+    return sorted(
+        f.relative_to(REGS_OUT_DIR).as_posix()
+        for f in output_dir.rglob("*")
+        if f.is_file()
+    )
+
+
+################################################################################
+# Generators
+# ..Each group of generators only depends on the parsed register list, so the
+# groups can run in parallel with each other.
+################################################################################
+def generate_vhdl(register_list, output_dir: Path):
+    name = register_list.name
+    hdl_output_dir = Path(output_dir / "hdl")
+
+    VhdlRegisterPackageGenerator(register_list=register_list, output_folder=hdl_output_dir).create_if_needed()
+    VhdlRecordPackageGenerator(register_list=register_list, output_folder=hdl_output_dir).create_if_needed()
+    VhdlAxiLiteWrapperGenerator(register_list=register_list, output_folder=hdl_output_dir).create_if_needed()
+    # We make some small edits to the generated VHDL so that it does not
+    # depend on pre-defined VHDL namespaces
+    for file_name, patches in VHDL_PATCHES.items():
+        patch_file(Path(hdl_output_dir / file_name.replace("{name}", name)), patches)
+
+
+def generate_c(register_list, output_dir: Path):
+    # C Header
+    CHeaderGenerator(register_list=register_list, output_folder=output_dir).create_if_needed()
+
+    # C++
+    # CppInterfaceGenerator(register_list=register_list, output_folder=output_dir / "include").create_if_needed()
+    # CppHeaderGenerator( register_list=register_list, output_folder=output_dir / "include").create_if_needed()
+    # CppImplementationGenerator(register_list=register_list, output_folder=output_dir).create_if_needed()
+
+
+def generate_html(register_list, output_dir: Path):
+    # HTML
+    HtmlPageGenerator(register_list=register_list, output_folder=output_dir).create_if_needed()
+    # HtmlRegisterTableGenerator(register_list=register_list, output_folder=output_dir).create_if_needed()
+    # HtmlConstantTableGenerator(register_list=register_list, output_folder=output_dir).create_if_needed()
+
+
+def generate_python(register_list, output_dir: Path):
+    # Python, the accessor loads the register list from the pickle. See
+    # regs_access.py for a register bus to use it with.
+    PythonPickleGenerator(register_list=register_list, output_folder=output_dir).create_if_needed()
+    PythonAccessorGenerator(register_list=register_list, output_folder=output_dir).create_if_needed()
+
+
+GENERATORS = {
+    "vhdl": generate_vhdl,
+    "c": generate_c,
+    "html": generate_html,
+    "python": generate_python,
+}
+
+
+################################################################################
+# Work units
+# ..These are module-level functions so that they can be sent to a process
+# pool. Each one returns its own runtime for the timing report.
+################################################################################
+def parse_task(name: str, toml_file: Path):
+    t0 = time.perf_counter()
+    register_list = from_toml(name=name, toml_file=toml_file)
+    return register_list, time.perf_counter() - t0
+
+
+def generate_task(group: str, register_list, output_dir: Path) -> float:
+    t0 = time.perf_counter()
+    GENERATORS[group](register_list=register_list, output_dir=output_dir)
+    return time.perf_counter() - t0
+
+
+def print_timing(toml_file: Path, times: dict[str, float]):
+    steps = ", ".join(f"{k} {v:.2f} s" for k, v in times.items())
+    print(f"INFO: {toml_file}: {steps}")
+
+
+def run_serial(stale: list[tuple[Path, str]]) -> dict[str, dict]:
+    """
+    Generate each toml file one after another, in the calling process. Errors
+    are collected in the same way as in run_parallel.
+    """
+    results = {t.stem: {"times": {}, "error": None} for t, _ in stale}
+    for toml_file, key in stale:
         name = toml_file.stem
-        output_dir = Path(THIS_DIR.parent / "build" / "regs_out" / name)
-        hdl_output_dir = Path(output_dir / "hdl")
+        output_dir = Path(REGS_OUT_DIR / name)
+        try:
+            register_list, t = parse_task(name, toml_file)
+        except Exception as e:
+            results[name]["error"] = f"parse: {e!r}"
+            continue
+        results[name]["times"]["parse"] = t
+        for group in GENERATORS:
+            try:
+                results[name]["times"][group] = generate_task(group, register_list, output_dir)
+            except Exception as e:
+                if results[name]["error"] is None:
+                    results[name]["error"] = f"{group}: {e!r}"
+    return results
+
+
+def run_parallel(stale: list[tuple[Path, str]], jobs: int) -> dict[str, dict]:
+    """
+    Fan the toml files, and then each of their generator groups, out over a
+    process pool. Errors are collected rather than raised so that every toml
+    file gets a result and the failure report does not depend on which worker
+    happened to finish first.
+    """
+    results = {t.stem: {"times": {}, "error": None} for t, _ in stale}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        parse_futures = {
+            pool.submit(parse_task, t.stem, t): t for t, _ in stale
+        }
+        gen_futures = {}
+        for future in as_completed(parse_futures):
+            name = parse_futures[future].stem
+            try:
+                register_list, t = future.result()
+            except Exception as e:
+                results[name]["error"] = f"parse: {e!r}"
+                continue
+            results[name]["times"]["parse"] = t
+            for group in GENERATORS:
+                f = pool.submit(generate_task, group, register_list, REGS_OUT_DIR / name)
+                gen_futures[f] = (name, group)
+
+        for future in as_completed(gen_futures):
+            name, group = gen_futures[future]
+            try:
+                results[name]["times"][group] = future.result()
+            except Exception as e:
+                if results[name]["error"] is None:
+                    results[name]["error"] = f"{group}: {e!r}"
+
+    # Report generator times in a fixed order
+    for r in results.values():
+        r["times"] = {k: r["times"][k] for k in ["parse", *GENERATORS] if k in r["times"]}
+    return results
 
-        register_list = from_toml(name=name, toml_file=toml_file)
 
-        # VHDL
-        VhdlRegisterPackageGenerator(register_list=register_list, output_folder=hdl_output_dir).create_if_needed()
-        VhdlRecordPackageGenerator(register_list=register_list, output_folder=hdl_output_dir).create_if_needed()
-        VhdlAxiLiteWrapperGenerator(register_list=register_list, output_folder=hdl_output_dir).create_if_needed()
-        # We make some small edits to the generated VHDL so that it does not
-        # depend on pre-defined VHDL namespaces
-        replace_first_occurrence(Path(hdl_output_dir / f"{name}_register_file_axi_lite.vhd"), OLD_TEXT_AXI_LITE_1, NEW_TEXT_AXI_LITE_1)
-        replace_first_occurrence(Path(hdl_output_dir / f"{name}_register_file_axi_lite.vhd"), OLD_TEXT_AXI_LITE_2, NEW_TEXT_AXI_LITE_2)
-        replace_first_occurrence(Path(hdl_output_dir / f"{name}_register_file_axi_lite.vhd"), OLD_TEXT_AXI_LITE_3, NEW_TEXT_AXI_LITE_3)
-        replace_first_occurrence(Path(hdl_output_dir / f"{name}_register_record_pkg.vhd"), OLD_TEXT_RECORD_PKG, NEW_TEXT_RECORD_PKG)
-        replace_first_occurrence(Path(hdl_output_dir / f"{name}_regs_pkg.vhd"), OLD_TEXT_REGS_PKG, NEW_TEXT_REGS_PKG)
+################################################################################
+# Main
+################################################################################
+def main(toml_files: list[Path], jobs: int = 1):
+    """
+    Create register artifacts from a toml file
+    """
+    manifest = load_manifest()
 
-        # C Header
-        CHeaderGenerator(register_list=register_list, output_folder=output_dir).create_if_needed()
+    stale = []
+    for toml_file in toml_files:
+        key = cache_key(toml_file)
+        if not is_up_to_date(manifest.get(toml_file.stem), key):
+            stale.append((toml_file, key))
+
+    if jobs > 1 and len(stale) > 0:
+        results = run_parallel(stale, jobs)
+    else:
+        results = run_serial(stale)
 
-        # C++
-        # CppInterfaceGenerator(register_list=register_list, output_folder=output_dir / "include").create_if_needed()
-        # CppHeaderGenerator( register_list=register_list, output_folder=output_dir / "include").create_if_needed()
-        # CppImplementationGenerator(register_list=register_list, output_folder=output_dir).create_if_needed()
+    failed = []
+    for toml_file, key in stale:
+        name = toml_file.stem
+        if results[name]["times"]:
+            print_timing(toml_file, results[name]["times"])
+        if results[name]["error"] is not None:
+            failed.append((toml_file, results[name]["error"]))
+            continue
+        # Only record the toml file once all of its outputs have been created,
+        # so that a failed run is retried next time
+        manifest[name] = {"key": key, "toml": str(toml_file), "outputs": list_outputs(REGS_OUT_DIR / name)}
 
-        # HTML
-        HtmlPageGenerator(register_list=register_list, output_folder=output_dir).create_if_needed()
-        # HtmlRegisterTableGenerator(register_list=register_list, output_folder=output_dir).create_if_needed()
-        # HtmlConstantTableGenerator(register_list=register_list, output_folder=output_dir).create_if_needed()
+    save_manifest(manifest)
 
-        # Python
-        # PythonPickleGenerator(register_list=register_list, output_folder=output_dir).create_if_needed()
-        # PythonAccessorGenerator(register_list=register_list, output_folder=output_dir).create_if_needed()
+    for toml_file, error in failed:
+        print(f"ERROR: {toml_file}: {error}")
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
-    main(toml_files=[Path(s) for s in sys.argv[1:] if os.path.exists(s)])
+    parser = argparse.ArgumentParser(description="Generate HDL registers")
+    parser.add_argument("toml_files", nargs="*", help="Register toml files")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="Number of worker processes for parallel generation",
+    )
+    args = parser.parse_args()
+    main(
+        toml_files=[Path(s) for s in args.toml_files if os.path.exists(s)],
+        jobs=args.jobs,
+    )
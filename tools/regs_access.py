@@ -0,0 +1,418 @@
+################################################################################
+# File : regs_access.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Register access for the Python accessors generated by regs.py
+# ..A RegisterBus implements the read_register / write_register interface that
+# the generated <name>_accessor.py classes call, on top of a transport that
+# moves bursts of 32-bit words. Outside of a batch every call is one bus
+# transaction. Inside a batch, the readable registers of the prefetched
+# register lists are read in one burst up front, repeated writes to the same
+# read-write register are coalesced into one, and the queued writes are sent
+# at the end of the batch in bursts of consecutive addresses.
+#
+# Usage:
+#   bus = RegisterBus(MmapTransport("/dev/uio0"))
+#   bus.add_register_list(gpio.get_register_list(), base_address=0x0)
+#   regs = gpio_accessor.get_accessor(bus)
+#   with bus.batch(prefetch=["gpio"]):
+#       for i in range(3):
+#           regs.write_chan_ier_ier(regs.read_chan_ier(i).ier | 1, i)
+#
+#   python regs_access.py <host:port | socket path> [--device /dev/uio0]
+################################################################################
+
+import argparse
+import mmap
+import os
+import socket
+import socketserver
+import struct
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from hdl_registers.generator.python.register_accessor_interface import PythonRegisterAccessorInterface
+from hdl_registers.register_array import RegisterArray
+
+WORD_MASK = 0xFFFFFFFF
+
+# Socket protocol. A request is an opcode, a byte address and a word count,
+# followed by the words of a write. The response is a status byte, followed by
+# the words of a read or by an error message.
+REQUEST = struct.Struct("<cII")
+OP_READ = b"R"
+OP_WRITE = b"W"
+STATUS_OK = b"\x00"
+STATUS_ERROR = b"\x01"
+
+
+class BusError(Exception):
+    pass
+
+
+################################################################################
+# Transports
+# ..Each transport moves bursts of 32-bit words to and from byte addresses on
+# the register bus. The addresses of a burst are consecutive.
+################################################################################
+class Transport:
+    """
+    Base class of the register bus transports
+    """
+
+    def read(self, address: int, count: int) -> list[int]:
+        raise NotImplementedError
+
+    def write(self, address: int, values: list[int]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MemoryTransport(Transport):
+    """
+    In-process stand-in for a register bus, for running register code without
+    any hardware. Words that were never written read as zero. on_write, if
+    given, is called with every written address and value, so that a test can
+    model the side effects of a register.
+    """
+
+    def __init__(self, on_write=None):
+        self.words = {}
+        self.on_write = on_write
+        self.transactions = 0
+
+    def read(self, address: int, count: int) -> list[int]:
+        self.transactions += 1
+        return [self.words.get(address + 4 * i, 0) for i in range(count)]
+
+    def write(self, address: int, values: list[int]):
+        self.transactions += 1
+        for i, value in enumerate(values):
+            self.words[address + 4 * i] = value
+            if self.on_write is not None:
+                self.on_write(address + 4 * i, value)
+
+
+class MmapTransport(Transport):
+    """
+    Memory mapped register bus, through /dev/mem or a UIO device. For
+    /dev/mem, offset is the physical base address of the bus. For a UIO
+    device, map N is selected with an offset of N pages, and the size is
+    read from sysfs when it is not given.
+    """
+
+    def __init__(self, device: str = "/dev/mem", offset: int = 0, size: int | None = None):
+        if size is None:
+            size = uio_map_size(device, offset // mmap.PAGESIZE)
+        # The mapping must start on a page boundary
+        page = offset - offset % mmap.PAGESIZE
+        fd = os.open(device, os.O_RDWR | os.O_SYNC)
+        try:
+            self._mmap = mmap.mmap(fd, size + offset - page, offset=page)
+        finally:
+            os.close(fd)
+        self._words = memoryview(self._mmap).cast("I")
+        self._start = (offset - page) // 4
+
+    def read(self, address: int, count: int) -> list[int]:
+        # Word by word, so that every access is a single 32-bit load
+        start = self._start + address // 4
+        return [self._words[i] for i in range(start, start + count)]
+
+    def write(self, address: int, values: list[int]):
+        start = self._start + address // 4
+        for i, value in enumerate(values):
+            self._words[start + i] = value
+
+    def close(self):
+        self._words.release()
+        self._mmap.close()
+
+
+def uio_map_size(device: str, map_index: int) -> int:
+    """
+    Return the size of one of the memory maps of a UIO device
+    """
+    sysfs = Path("/sys/class/uio") / Path(device).name / "maps" / f"map{map_index}" / "size"
+    try:
+        return int(sysfs.read_text(), 0)
+    except OSError:
+        raise BusError(f"No map size for {device} in {sysfs}, give the size explicitly") from None
+
+
+class SocketTransport(Transport):
+    """
+    Register bus of a remote target that runs serve(), over TCP ("host:port")
+    or a Unix socket (a path). Every burst is one round trip.
+    """
+
+    def __init__(self, address: str):
+        self._sock = socket.socket(*socket_family(address))
+        self._sock.connect(socket_address(address))
+        self._file = self._sock.makefile("rwb")
+
+    def _request(self, op: bytes, address: int, count: int, payload: bytes = b"") -> bytes:
+        self._file.write(REQUEST.pack(op, address, count) + payload)
+        self._file.flush()
+        status = self._file.read(1)
+        if status == STATUS_OK:
+            return self._file.read(4 * count) if op == OP_READ else b""
+        if status == STATUS_ERROR:
+            (length,) = struct.unpack("<H", self._file.read(2))
+            raise BusError(self._file.read(length).decode())
+        raise BusError("Connection to the register server was closed")
+
+    def read(self, address: int, count: int) -> list[int]:
+        return list(struct.unpack(f"<{count}I", self._request(OP_READ, address, count)))
+
+    def write(self, address: int, values: list[int]):
+        self._request(OP_WRITE, address, len(values), struct.pack(f"<{len(values)}I", *values))
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+
+def socket_family(address: str) -> tuple:
+    if ":" in address:
+        return (socket.AF_INET, socket.SOCK_STREAM)
+    return (socket.AF_UNIX, socket.SOCK_STREAM)
+
+
+def socket_address(address: str):
+    if ":" in address:
+        host, port = address.rsplit(":", 1)
+        return (host, int(port))
+    return address
+
+
+def serve(transport: Transport, address: str):
+    """
+    Serve a transport to SocketTransport clients until interrupted. Clients
+    are handled one at a time, so that their bursts are never interleaved.
+    """
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            while header := self.rfile.read(REQUEST.size):
+                op, addr, count = REQUEST.unpack(header)
+                payload = self.rfile.read(4 * count) if op == OP_WRITE else b""
+                try:
+                    if op == OP_READ:
+                        response = STATUS_OK + struct.pack(f"<{count}I", *transport.read(addr, count))
+                    elif op == OP_WRITE:
+                        transport.write(addr, list(struct.unpack(f"<{count}I", payload)))
+                        response = STATUS_OK
+                    else:
+                        raise BusError(f"Unknown request {op!r}")
+                except Exception as e:
+                    message = f"{e}".encode()[:0xFFFF]
+                    response = STATUS_ERROR + struct.pack("<H", len(message)) + message
+                self.wfile.write(response)
+
+    if ":" in address:
+        server_cls = socketserver.TCPServer
+        server_cls.allow_reuse_address = True
+    else:
+        server_cls = socketserver.UnixStreamServer
+        if os.path.exists(address):
+            os.unlink(address)
+    with server_cls(socket_address(address), Handler) as server:
+        print(f"INFO: Serving register access on {address}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print()
+
+
+################################################################################
+# Register bus
+################################################################################
+@dataclass
+class RegisterListInfo:
+    base_address: int
+    # Access mode shorthand of every register, by byte address within the list
+    modes: dict[int, str]
+
+
+@dataclass
+class Batch:
+    # Register values read at the start of the batch, by absolute address
+    snapshot: dict[int, int] = field(default_factory=dict)
+    # Queued writes, in order, as (absolute address, value)
+    writes: list[tuple[int, int]] = field(default_factory=list)
+    # Values of the queued writes to read-write registers, by absolute address
+    pending: dict[int, int] = field(default_factory=dict)
+
+
+def register_modes(register_list) -> dict[int, str]:
+    """
+    Return the access mode of every register in a register list, by byte
+    address within the list
+    """
+    modes = {}
+    for obj in register_list.register_objects:
+        if isinstance(obj, RegisterArray):
+            for i in range(obj.length):
+                for register in obj.registers:
+                    modes[4 * (obj.base_index + i * len(obj.registers) + register.index)] = register.mode.shorthand
+        else:
+            modes[4 * obj.index] = obj.mode.shorthand
+    return modes
+
+
+def bursts(words: list[tuple[int, int]]) -> list[tuple[int, list[int]]]:
+    """
+    Group (address, value) pairs into runs of consecutive addresses, keeping
+    their order
+    """
+    result = []
+    for address, value in words:
+        if result and address == result[-1][0] + 4 * len(result[-1][1]):
+            result[-1][1].append(value)
+        else:
+            result.append((address, [value]))
+    return result
+
+
+def is_readable(mode: str) -> bool:
+    return mode.startswith("r")
+
+
+def holds_value(mode: str) -> bool:
+    """
+    Writes to a register with this mode only matter through the value that
+    the register holds afterwards, so repeated writes can be coalesced
+    """
+    return mode in ("w", "r_w")
+
+
+class RegisterBus(PythonRegisterAccessorInterface):
+    """
+    Register accessor for the generated Python accessors, with batched
+    access. Every register list that is accessed must be added with its base
+    address first.
+    """
+
+    def __init__(self, transport: Transport):
+        self.transport = transport
+        self.register_lists: dict[str, RegisterListInfo] = {}
+        self._batch: Batch | None = None
+        self._depth = 0
+
+    def add_register_list(self, register_list, base_address: int):
+        self.register_lists[register_list.name] = RegisterListInfo(base_address, register_modes(register_list))
+
+    def _lookup(self, register_list_name: str, register_address: int) -> tuple[int, str | None]:
+        try:
+            info = self.register_lists[register_list_name]
+        except KeyError:
+            raise BusError(f"Register list {register_list_name} was not added to the bus") from None
+        return info.base_address + register_address, info.modes.get(register_address)
+
+    def read_register(self, register_list_name: str, register_address: int) -> int:
+        address, _ = self._lookup(register_list_name, register_address)
+        batch = self._batch
+        if batch is not None:
+            if address in batch.pending:
+                return batch.pending[address]
+            if address in batch.snapshot:
+                return batch.snapshot[address]
+        return self.transport.read(address, 1)[0]
+
+    def write_register(self, register_list_name: str, register_address: int, register_value: int):
+        address, mode = self._lookup(register_list_name, register_address)
+        batch = self._batch
+        if batch is None:
+            self.transport.write(address, [register_value & WORD_MASK])
+            return
+        if mode is not None and holds_value(mode):
+            # Only the last write to the register is sent, in the position of
+            # the last write
+            if address in batch.pending:
+                batch.writes.remove((address, batch.pending[address]))
+            batch.pending[address] = register_value & WORD_MASK
+        batch.writes.append((address, register_value & WORD_MASK))
+
+    def prefetch(self, register_list_name: str):
+        """
+        Read all readable registers of a register list into the current batch,
+        in as few bursts as possible
+        """
+        info = self.register_lists[register_list_name]
+        readable = sorted(info.base_address + a for a, mode in info.modes.items() if is_readable(mode))
+        for address, words in bursts([(a, 0) for a in readable]):
+            values = self.transport.read(address, len(words))
+            self._batch.snapshot.update((address + 4 * i, v) for i, v in enumerate(values))
+
+    def flush(self):
+        """
+        Send the queued writes of the current batch
+        """
+        batch = self._batch
+        if batch is None:
+            return
+        writes, batch.writes, batch.pending = batch.writes, [], {}
+        for address, values in bursts(writes):
+            self.transport.write(address, values)
+
+    @contextmanager
+    def batch(self, prefetch: list[str] = ()):
+        """
+        Batch the register accesses made within the context. The prefetched
+        register lists are read once on entry, and reads within the batch see
+        that state plus the queued writes to read-write registers. Reads of
+        registers that were not prefetched go to the bus immediately, ahead of
+        any queued writes. The writes are sent when the outermost batch exits,
+        and dropped if it exits with an exception.
+        """
+        outermost = self._batch is None
+        if outermost:
+            self._batch = Batch()
+        self._depth += 1
+        try:
+            for name in prefetch:
+                self.prefetch(name)
+            yield self
+            if self._depth == 1:
+                self.flush()
+        finally:
+            self._depth -= 1
+            if outermost:
+                self._batch = None
+
+
+################################################################################
+# Main
+################################################################################
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve register access to SocketTransport clients")
+    parser.add_argument("address", help="host:port to listen on, or a Unix socket path")
+    parser.add_argument(
+        "--device",
+        help="Memory mapped register bus device, such as /dev/mem or /dev/uio0. "
+        "Without a device, an in-memory register bus is served.",
+    )
+    parser.add_argument(
+        "--offset", type=lambda s: int(s, 0), default=0,
+        help="Offset of the register bus within the device",
+    )
+    parser.add_argument(
+        "--size", type=lambda s: int(s, 0),
+        help="Size of the register bus in bytes, read from sysfs for UIO devices",
+    )
+    args = parser.parse_args()
+
+    transport = MemoryTransport() if args.device is None else MmapTransport(args.device, args.offset, args.size)
+    with transport:
+        serve(transport, args.address)
@@ -6,7 +6,7 @@
 # Common VUnit sim script
 ################################################################################
 
-from vunit import VUnit
+from vunit import VUnit, VUnitCLI
 from pathlib import Path
 import os
 import sys
@@ -15,7 +15,24 @@ from enum import Enum
 # Import test configurations
 # ..they are in a separate file so that this common sim script can be
 # maintained separately from repo-specific test configurations.
+import sim_args
+import sim_changes
 import sim_configs
+import sim_coverage
+import sim_elab
+import sim_utils
+from sim_history import History
+import sim_sched
+import sim_shard
+import sim_index
+import sim_libs
+import sim_matrix
+import sim_perf
+import sim_profile
+import sim_seeds
+import sim_waves
+import sim_watch
+from models import ebtb
 
 ################################################################################
 # Setup
@@ -24,6 +41,14 @@ import sim_configs
 SCRIPT_DIR = Path(__file__).parent
 ROOT_DIR = SCRIPT_DIR.parent
 
+VHDL_STANDARD = "2019"
+
+# Analysis flags for the sblib sources, per simulator
+A_FLAGS = {
+    "ghdl": ['-frelaxed-rules', '-Wno-hide', '-Wno-shared'],
+    "nvc": ['--relaxed'],
+}
+
 class Simulator(Enum):
     GHDL = 1
     NVC = 2
@@ -35,6 +60,33 @@ os.chdir(SCRIPT_DIR)
 argv = sys.argv[1:]
 SIMULATOR = Simulator.NVC
 GENERATE_VHDL_LS_TOML = False
+LAZY = False
+WAVES_ON_FAILURE = False
+WATCH = False
+STIM_FILES = False
+CHARACTERIZE = False
+PROFILE = False
+CHANGED_SINCE = sim_args.pop_option(argv, "--changed-since")
+SHARD = sim_args.pop_option(argv, "--shard")
+COVERAGE = sim_args.pop_option(argv, "--coverage", "full")
+OFFLINE_PACKETS = sim_args.pop_option(argv, "--offline-packets")
+WAVE_FILE = sim_args.pop_option(argv, "--wave-file")
+MEM_BUDGET = sim_args.pop_option(argv, "--mem-budget")
+SEEDS = sim_args.pop_option(argv, "--seeds")
+SIMULATORS = sim_args.pop_option(argv, "--simulators")
+WORKER_POOL = sim_args.pop_option(argv, "--worker-pool")
+
+if SHARD is not None and CHANGED_SINCE is not None:
+    sys.exit("ERROR: --shard and --changed-since cannot be used together")
+
+# Seed sweep
+# ..--seed is the base seed of the sweep, rather than a seed for VUnit, which
+# would override the seed of every seeded config.
+if SEEDS is not None:
+    try:
+        sim_seeds.setup(SEEDS, sim_args.pop_option(argv, "--seed"))
+    except ValueError as e:
+        sys.exit(f"ERROR: {e}")
 
 # Simulator Selection
 # ..The environment variable VUNIT_SIMULATOR has precedence over the commandline
@@ -48,6 +100,44 @@ if "--nvc" in sys.argv:
 if "--vhdl_ls" in sys.argv:
     GENERATE_VHDL_LS_TOML = True
     argv.remove("--vhdl_ls")
+if "--lazy" in sys.argv:
+    LAZY = True
+    argv.remove("--lazy")
+if "--waves-on-failure" in sys.argv:
+    WAVES_ON_FAILURE = True
+    argv.remove("--waves-on-failure")
+if "--watch" in sys.argv:
+    WATCH = True
+    argv.remove("--watch")
+if "--stim-files" in sys.argv:
+    STIM_FILES = True
+    argv.remove("--stim-files")
+if "--characterize" in sys.argv:
+    CHARACTERIZE = True
+    argv.remove("--characterize")
+if "--profile" in sys.argv:
+    PROFILE = True
+    argv.remove("--profile")
+
+# Characterization tests are tagged with the .perf attribute. They only run in
+# characterization mode, where nothing else runs.
+if CHARACTERIZE:
+    argv += ["--with-attributes", ".perf"]
+elif "--with-attributes" not in argv:
+    argv += ["--without-attributes", ".perf"]
+sim_utils.CHARACTERIZE = CHARACTERIZE
+
+# Simulator matrix
+# ..Hand over to the matrix runner, which runs this script once per simulator,
+# all at the same time, on a shared pool of workers.
+if SIMULATORS is not None:
+    if "--ghdl" in sys.argv or "--nvc" in sys.argv:
+        sys.exit("ERROR: --simulators cannot be used with --ghdl or --nvc")
+    if WATCH or GENERATE_VHDL_LS_TOML or WAVE_FILE is not None or "--gui" in argv or "-g" in argv:
+        sys.exit("ERROR: --simulators cannot be used with --watch, --vhdl_ls, --wave-file or --gui")
+    sim_argv = sys.argv[1:]
+    sim_args.pop_option(sim_argv, "--simulators")
+    sys.exit(sim_matrix.main(SIMULATORS, sim_argv))
 
 # The simulator must be chosen before sources are added
 if 'VUNIT_SIMULATOR' not in os.environ:    
@@ -57,53 +147,244 @@ if 'VUNIT_SIMULATOR' not in os.environ:
         os.environ['VUNIT_SIMULATOR'] = 'nvc'
 
 # Parse VUnit Arguments
-vu = VUnit.from_argv(argv=argv, vhdl_standard="2019")
-vu.add_vhdl_builtins()
-vu.add_com()
-vu.add_osvvm()
-vu.add_random()
-vu.add_verification_components()
+args = VUnitCLI().parse_args(argv=argv)
+if SHARD is not None:
+    sim_shard.prepare_args(args)
 
-# Add source files
-lib = vu.add_library("lib")
-lib.add_source_files(ROOT_DIR / "src" / "**" / "hdl" / "*.vhd", allow_empty=True)
-lib.add_source_files(ROOT_DIR / "src" / "**" / "sim" / "*.vhd", allow_empty=True)
-lib.add_source_files(ROOT_DIR / "lib" / "**" / "src" / "**" / "hdl" / "*.vhd", allow_empty=True)
-lib.add_source_files(ROOT_DIR / "lib" / "**" / "src" / "**" / "sim" / "*.vhd", allow_empty=True)
-lib.add_source_files(ROOT_DIR / "test" / "**" / "*.vhd", allow_empty=True)
-lib.add_source_files(ROOT_DIR / "build" / "regs_out" / "**" / "hdl" / "*.vhd", allow_empty=True)
+vu = VUnit.from_args(args=args, vhdl_standard=VHDL_STANDARD)
+history = History(os.environ['VUNIT_SIMULATOR'])
+
+# Generated sources
+# ..The Python models write some packages and test vectors. They are only
+# rewritten when their generator changes.
+ebtb.generate(sim_utils.GEN_DIR / "ebtb")
 
+# Watch mode
+# ..Hand over to the watcher, which runs this script again for the test benches
+# that each change affects, with the same options.
+if WATCH:
+    if SHARD is not None or CHANGED_SINCE is not None:
+        sys.exit("ERROR: --watch cannot be used with --shard or --changed-since")
+    patterns = args.test_patterns if isinstance(args.test_patterns, list) else []
+    sim_argv = [a for a in sys.argv[1:] if a not in ["--watch", "--lazy"] and a not in patterns]
+    sim_watch.main(args.test_patterns, sim_argv)
+    sys.exit(0)
+
+# Generate VHDL LS Config if needed
+# ..This is the same as running create_vhdl_ls_config.py, after the generated
+# sources above are up to date.
 if GENERATE_VHDL_LS_TOML:
-    lib.add_source_files(ROOT_DIR / "platforms" / "**" / "hdl" / "*.vhd", allow_empty=True)
+    import create_vhdl_ls_config
+    create_vhdl_ls_config.main()
+    sys.exit(0)
+
+SOURCES = sim_utils.SOURCES
+
+# Lazy mode
+# ..Resolve the requested test patterns against a cached index of the source
+# tree first, and then only add the test benches they select, the files those
+# depend on, and the VUnit builtins that those files use. Running everything
+# gains nothing from this, so lazy mode is ignored in that case.
+lazy_test_benches = None
+if LAZY and isinstance(args.test_patterns, list):
+    index = sim_index.Index(SOURCES)
+    index.save()
+    test_benches = index.test_benches()
+    selected = sim_index.match_test_benches(test_benches, "lib", args.test_patterns)
+    if selected:
+        files = index.closure(test_benches[tb] for tb in selected)
+        print(f"INFO: Lazy mode loading {len(files)} of {len(index.files)} source file(s) for {len(selected)} test bench(es).")
+        lazy_test_benches = selected
+
+# Third-party libraries
+# ..Map precompiled VUnit and OSVVM libraries from build/sim_libs when they
+# match the simulator, its version, the VHDL standard and the analysis flags,
+# and only compile them on a miss. If the cache can not be used, they are
+# compiled in place.
+cached_libraries = sim_libs.cached_libraries(VHDL_STANDARD, A_FLAGS)
+
+if cached_libraries is None or not sim_libs.use_cached_libraries(vu, cached_libraries):
+    if lazy_test_benches is None:
+        vu.add_vhdl_builtins()
+        vu.add_com()
+        vu.add_osvvm()
+        vu.add_random()
+        vu.add_verification_components()
+    else:
+        vu.add_vhdl_builtins()
+        for builtin in index.builtins(files):
+            getattr(vu, f"add_{builtin}")()
+
+# Add source files
+lib = vu.add_library("lib")
+if lazy_test_benches is None:
+    for pattern in SOURCES:
+        lib.add_source_files(pattern, allow_empty=True)
+else:
+    lib.add_source_files(files)
 
 
 ################################################################################
 # Test bench configurations
 ################################################################################
 
-sim_configs.add_configs(lib)
+# Expand generic lists into either the full product or a covering array
+try:
+    sim_coverage.coverage_strength(COVERAGE)
+except ValueError as e:
+    sys.exit(f"ERROR: {e}")
+sim_coverage.COVERAGE = COVERAGE
+
+# Test benches that support it send this many packets, and dump their streams
+# to be checked by the Python models after the run
+if OFFLINE_PACKETS is not None:
+    if not OFFLINE_PACKETS.isdigit() or int(OFFLINE_PACKETS) < 1:
+        sys.exit(f"ERROR: --offline-packets expects a positive number of packets, got '{OFFLINE_PACKETS}'")
+    sim_utils.OFFLINE_PACKETS = int(OFFLINE_PACKETS)
+    sim_utils.STIM_FILES = STIM_FILES
+elif STIM_FILES:
+    sys.exit("ERROR: --stim-files requires --offline-packets")
+
+if lazy_test_benches is None:
+    sim_configs.add_configs(lib)
+else:
+    sim_configs.add_configs(sim_utils.LazyLibrary(lib, lazy_test_benches))
+if SEEDS is not None:
+    sim_utils.seeded_default_configs(lib)
+
+
+################################################################################
+# Test selection
+################################################################################
+
+# Only run the test benches whose dependency closure includes a file that has
+# changed since the given git ref. Changes to any other file, such as the sim
+# scripts, the Makefile or a submodule, can affect any test, so everything is
+# run in that case. Documentation and CI files are ignored.
+if CHANGED_SINCE is not None:
+    changed = sim_changes.changed_files(ROOT_DIR, CHANGED_SINCE)
+    unclassified = sim_changes.unclassified_changes(changed)
+    if unclassified:
+        print(f"INFO: {len(unclassified)} file(s) other than HDL sources changed since {CHANGED_SINCE}, "
+              f"such as {unclassified[0]}, running all tests.")
+    else:
+        patterns = sim_changes.changed_hdl_patterns(changed)
+        # VUnit runs everything when the list of patterns is empty. The empty
+        # report keeps the shard reports complete for sim-merge.
+        if not patterns:
+            print(f"INFO: No HDL sources changed since {CHANGED_SINCE}, no tests are selected.")
+            if args.xunit_xml is not None:
+                sim_shard.merge_xunit(Path(args.xunit_xml), [])
+            sys.exit(0)
+        print(f"INFO: {len(patterns)} HDL source(s) changed since {CHANGED_SINCE}.")
+        vu.update_test_pattern(include_dependent_on=patterns)
+
+# Only run one of several balanced shards of the suite
+if SHARD is not None:
+    sim_shard.select(args, lib, SHARD, history)
 
 
 ################################################################################
 # Execution
 ################################################################################
 
-lib.add_compile_option('ghdl.a_flags', ['-frelaxed-rules', '-Wno-hide', '-Wno-shared'])
-lib.add_compile_option('nvc.a_flags', ['--relaxed'])
+lib.add_compile_option('ghdl.a_flags', A_FLAGS["ghdl"])
+lib.add_compile_option('nvc.a_flags', A_FLAGS["nvc"])
 lib.set_sim_option("disable_ieee_warnings", True)
 lib.set_sim_option('ghdl.elab_flags', ['-frelaxed'])
 lib.set_sim_option('ghdl.viewer.gui', 'surfer')
-lib.set_sim_option('nvc.heap_size', '4096m')
+lib.set_sim_option('nvc.heap_size', f'{sim_sched.HEAP_MAX}m')
 lib.set_sim_option('nvc.viewer.gui', 'surfer')
-lib.set_sim_option("nvc.sim_flags", ["--dump-arrays"])
 
+# Waves are only written in GUI mode, or by the re-run of a failed test with
+# --waves-on-failure
+if WAVE_FILE is not None:
+    simulator = os.environ['VUNIT_SIMULATOR']
+    lib.set_sim_option(f"{simulator}.sim_flags", sim_waves.sim_flags(simulator, Path(WAVE_FILE)))
+elif args.gui:
+    lib.set_sim_option("nvc.sim_flags", ["--dump-arrays"])
 
-# Generate VHDL LS Config if needed
-if GENERATE_VHDL_LS_TOML:
-    from create_vhdl_ls_config import create_configuration
-    from pathlib import Path
-    create_configuration(output_path=Path('..'), vunit_proj=vu)
-    exit(0)
+# Size the NVC heap of each test bench from the largest peak memory use
+# recorded for its configs. Test benches that have not been measured yet keep
+# the largest heap.
+for tb in lib.get_test_benches(allow_empty=True):
+    rss = history.test_bench_rss(lib.name, tb.name)
+    if rss is not None:
+        tb.set_sim_option('nvc.heap_size', sim_sched.heap_size(rss))
+
+
+# Schedule tests longest-first based on the runtimes recorded by previous runs,
+# unless VUnit has been asked to run them in the order they were added.
+# ..With a memory budget, a test is only started when its recorded peak memory
+# use fits in what the running tests leave of the budget.
+mem_budget = None
+if MEM_BUDGET is not None:
+    try:
+        mem_budget = sim_sched.parse_mem_size(MEM_BUDGET)
+    except ValueError as e:
+        sys.exit(f"ERROR: {e}")
+# ..A run of a simulator matrix shares its workers with the other simulators.
+worker_pool = None
+if WORKER_POOL is not None:
+    try:
+        worker_pool = sim_sched.WorkerPool(Path(WORKER_POOL))
+    except ValueError as e:
+        sys.exit(f"ERROR: {e}")
+if sim_args.pop_option(list(argv), "--test-prio") != "ordered":
+    sim_sched.install(sim_sched.LongestFirstScheduler, history, mem_budget, worker_pool)
+else:
+    if mem_budget is not None:
+        print("WARNING: --mem-budget is ignored with --test-prio ordered")
+    if worker_pool is not None:
+        print("WARNING: The worker pool of the simulator matrix is ignored with --test-prio ordered")
+    if SEEDS is not None:
+        print("WARNING: A seed sweep does not stop early on failures with --test-prio ordered")
+if not sim_sched.install_memory_measurement() and mem_budget is not None:
+    print("WARNING: Peak memory use can not be measured on this system, --mem-budget only uses the recorded history")
+
+# Share the elaborated test bench between the configs that only differ in
+# runtime generics
+if os.environ['VUNIT_SIMULATOR'] == 'ghdl' and not args.gui:
+    sim_elab.install(Path(args.output_path) / "elab")
+
+# Run every simulator process under perf
+if PROFILE:
+    if args.gui:
+        sys.exit("ERROR: --profile cannot be used with --gui")
+    if sim_profile.perf() is None:
+        sys.exit("ERROR: --profile needs Linux perf, which was not found on the PATH")
+    sim_profile.install(Path(args.output_path) / "profile")
+
+waves = {}
+
+def post_run(results):
+    # Elaboration only runs, profiled runs and the reruns that write waves are
+    # not representative of the test runtimes
+    if not args.elaborate and not PROFILE and WAVE_FILE is None:
+        history.record_results(results, sim_sched.MeasuredProcess.peak_rss)
+        history.save()
+    sim_sched.report_makespan(sim_sched.LongestFirstScheduler)
+    sim_elab.report()
+    if SEEDS is not None:
+        sim_seeds.report(results)
+    if CHARACTERIZE:
+        sim_perf.write_results()
+    if PROFILE:
+        sim_profile.write_report(os.environ['VUNIT_SIMULATOR'])
+
+    # Re-run failed tests with the same seed and the same generics, writing
+    # their waves
+    if WAVES_ON_FAILURE and not args.elaborate and not args.gui:
+        rerun_argv = ["-o", args.output_path, "--coverage", COVERAGE]
+        if OFFLINE_PACKETS is not None:
+            rerun_argv += ["--offline-packets", OFFLINE_PACKETS]
+        if STIM_FILES:
+            rerun_argv += ["--stim-files"]
+        waves.update(sim_waves.rerun_failures(results, os.environ['VUNIT_SIMULATOR'], rerun_argv))
 
 # Run
-vu.main()
+try:
+    vu.main(post_run=post_run)
+finally:
+    if waves and args.xunit_xml is not None:
+        sim_waves.attach(args.xunit_xml, waves)
@@ -0,0 +1,25 @@
+################################################################################
+# File : sim_args.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Command line helpers
+# ..sim.py takes its own options out of the argument list before passing the
+# rest on to VUnit.
+################################################################################
+
+
+def pop_option(argv: list, name: str, default=None):
+    """
+    Remove an option that takes a value, given either as `name value` or as
+    `name=value`, from an argument list and return its value.
+    """
+    for i, arg in enumerate(argv):
+        if arg == name and i + 1 < len(argv):
+            value = argv[i + 1]
+            del argv[i:i + 2]
+            return value
+        if arg.startswith(name + "="):
+            del argv[i]
+            return arg[len(name) + 1:]
+    return default
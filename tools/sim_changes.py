@@ -0,0 +1,59 @@
+################################################################################
+# File : sim_changes.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Changed file selection
+# ..Maps the files that differ from a git ref to the source file patterns of
+# the test benches they affect, for --changed-since.
+################################################################################
+
+import subprocess
+from fnmatch import fnmatch
+
+# Changed files that can not affect a simulation, as fnmatch patterns
+IGNORED_CHANGES = ["*.md", "LICENSE", ".gitignore", ".github/*", "tools/vsg_rules.yaml"]
+
+
+def changed_files(root, ref: str) -> list[str]:
+    """
+    Return the repo-relative paths of all files that differ from a git ref,
+    including uncommitted and untracked files. Generated files in build/ are
+    left out, since they are covered by the files they are generated from.
+    """
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], cwd=root, check=True, capture_output=True, text=True
+        ).stdout.splitlines()
+
+    files = git("diff", "--name-only", ref, "--")
+    files += git("ls-files", "--others", "--exclude-standard")
+    return sorted({f for f in files if not f.startswith("build/")})
+
+
+def unclassified_changes(files: list[str]) -> list[str]:
+    """
+    Return the changed files that are neither HDL sources, register toml
+    files nor in IGNORED_CHANGES. Their effect on the tests is not known.
+    """
+    return [
+        f for f in files
+        if not f.endswith(".vhd")
+        and not (f.endswith(".toml") and "/regs/" in f)
+        and not any(fnmatch(f, p) for p in IGNORED_CHANGES)
+    ]
+
+
+def changed_hdl_patterns(files: list[str]) -> list[str]:
+    """
+    Map changed files to the source file patterns they affect. Register toml
+    files map to the VHDL that regs.py generates from them.
+    """
+    patterns = []
+    for f in files:
+        if f.endswith(".vhd"):
+            patterns.append(f)
+        elif f.endswith(".toml") and "/regs/" in f:
+            name = f.rsplit("/", 1)[-1][:-len(".toml")]
+            patterns.append(f"build/regs_out/{name}/hdl/*.vhd")
+    return patterns
@@ -17,110 +17,102 @@ import sim_utils
 def add_configs(lib):
     ## Stream Pipes
     tb = lib.test_bench("strm_pipes_tb")
-
-    stagess = [1, 3]
-    ready_pipes = [True, False]
-    data_pipes = [True, False]
-    stall_probs = [50]
-
-    for stages, ready_pipe, data_pipe, stall_prob in product(
-        stagess, ready_pipes, data_pipes, stall_probs
-    ):
-        sim_utils.named_config(
-            tb,
-            {
-                "G_STAGES": stages,
-                "G_READY_PIPE": ready_pipe,
-                "G_DATA_PIPE": data_pipe,
-                "G_AXIS_STALL_PROB": stall_prob,
-            },
-        )
+    sim_utils.runtime_generics(tb, ["G_AXIS_STALL_PROB"])
+
+    sim_utils.named_configs(
+        tb,
+        {
+            "G_STAGES": [1, 3],
+            "G_READY_PIPE": [True, False],
+            "G_DATA_PIPE": [True, False],
+            "G_AXIS_STALL_PROB": [50],
+        },
+    )
 
     ## CDC Vector
     tb = lib.test_bench("cdc_vector_tb")
-
-    clk_ratios = [100, 50, 200, 150, 12, 432, 95]
-    stall_probs = [50]
-
-    for clk_ratio, stall_prob in product(clk_ratios, stall_probs):
-        sim_utils.named_config(
-            tb,
-            {
-                "G_CLK_RATIO": clk_ratio,
-                "G_AXIS_STALL_PROB": stall_prob,
-            },
-        )
+    sim_utils.runtime_generics(tb, ["G_CLK_RATIO", "G_AXIS_STALL_PROB"])
+
+    sim_utils.named_configs(
+        tb,
+        {
+            "G_CLK_RATIO": [100, 50, 200, 150, 12, 432, 95],
+            "G_AXIS_STALL_PROB": [50],
+        },
+    )
+
+    sim_utils.perf_configs(
+        tb,
+        {
+            "G_CLK_RATIO": [100, 50, 200, 150, 12, 432, 95],
+            "G_AXIS_STALL_PROB": [0, 50],
+        },
+    )
 
     # tb = lib.test_bench('axil_stdver_tb')
     # named_config(tb, {})
 
     ## AXIL RAM
     tb = lib.test_bench("axil_ram_tb")
+    sim_utils.runtime_generics(tb, ["G_AXIS_STALL_PROB"])
 
-    rd_latencys = [1, 2, 3, 4]
-    stall_probs = [0, 50]
+    sim_utils.named_configs(
+        tb,
+        {
+            "G_RD_LATENCY": [1, 2, 3, 4],
+            "G_AXIS_STALL_PROB": [0, 50],
+        },
+    )
 
-    for rd_latency, stall_prob in product(rd_latencys, stall_probs):
-        sim_utils.named_config(
-            tb,
-            {
-                "G_RD_LATENCY": rd_latency,
-                "G_AXIS_STALL_PROB": stall_prob,
-            },
-        )
+    ## AXIL Crossbar
+    # The slaves of the test bench have a read latency of 2
+    tb = lib.test_bench("axil_xbar_tb")
+    sim_utils.trace_replay(tb, "axil_xbar", rd_latency=2)
 
     ############################################################################
     tb = lib.test_bench("axis_arb_tb")
+    sim_utils.trace_replay(tb, "axis_arb")
 
-    enable_jitter = [True]
-    low_area = [False]
-
-    for enable_jitter, low_area in product(enable_jitter, low_area):
-        sim_utils.named_config(
-            tb,
-            {
-                "G_ENABLE_JITTER": enable_jitter,
-                "G_LOW_AREA": low_area,
-            },
-        )
+    sim_utils.named_configs(
+        tb,
+        {
+            "G_ENABLE_JITTER": [True],
+            "G_LOW_AREA": [False],
+        },
+    )
 
     ############################################################################
     tb = lib.test_bench("axis_pipe_tb")
 
-    enable_jitter = [True]
-    ready_pipe = [True, False]
-    data_pipe = [True, False]
-
-    for enable_jitter, ready_pipe, data_pipe in product(
-        enable_jitter, ready_pipe, data_pipe
-    ):
-        sim_utils.named_config(
-            tb,
-            {
-                "G_ENABLE_JITTER": enable_jitter,
-                "G_READY_PIPE": ready_pipe,
-                "G_DATA_PIPE": data_pipe,
-            },
-        )
+    sim_utils.named_configs(
+        tb,
+        {
+            "G_ENABLE_JITTER": [True],
+            "G_READY_PIPE": [True, False],
+            "G_DATA_PIPE": [True, False],
+        },
+    )
 
     ############################################################################
     tb = lib.test_bench("axis_slice_tb")
 
-    enable_jitter = [True]
-    packed_stream = [True, False]
-
-    for enable_jitter, packed_stream in product(enable_jitter, packed_stream):
-        sim_utils.named_config(
-            tb,
-            {
-                "G_ENABLE_JITTER": enable_jitter,
-                "G_PACKED_STREAM": packed_stream,
-            },
-        )
+    sim_utils.named_configs(
+        tb,
+        {
+            "G_ENABLE_JITTER": [True],
+            "G_PACKED_STREAM": [True, False],
+        },
+    )
 
     ############################################################################
     tb = lib.test_bench("axis_resize_tb")
 
+    def resize_stimulus(g):
+        return sim_utils.axis_stimulus(
+            g["G_S_KW"], g["G_S_DW"] // g["G_S_KW"], g["G_S_UW"] // g["G_S_KW"],
+            g["G_PACKED_STREAM"], 3 * max(g["G_S_KW"], g["G_M_KW"]),
+        )
+
     enable_jitter = [True]
     packed_stream = [True, False]
 
@@ -138,6 +130,8 @@ def add_configs(lib):
                 "G_M_DW": 64,
                 "G_M_UW": 16,
             },
+            model_check=sim_utils.offline_check("axis_resize", packed=packed_stream),
+            stimulus=resize_stimulus,
         )
 
         # Upsize 4->8
@@ -153,6 +147,8 @@ def add_configs(lib):
                 "G_M_DW": 64,
                 "G_M_UW": 16,
             },
+            model_check=sim_utils.offline_check("axis_resize", packed=packed_stream),
+            stimulus=resize_stimulus,
         )
 
         # Upsize 2->64
@@ -168,6 +164,8 @@ def add_configs(lib):
                 "G_M_DW": 512,
                 "G_M_UW": 64,
             },
+            model_check=sim_utils.offline_check("axis_resize", packed=packed_stream),
+            stimulus=resize_stimulus,
         )
 
         # Upsize 1->2
@@ -183,6 +181,8 @@ def add_configs(lib):
                 "G_M_DW": 16,
                 "G_M_UW": 2,
             },
+            model_check=sim_utils.offline_check("axis_resize", packed=packed_stream),
+            stimulus=resize_stimulus,
         )
 
         # Upsize 1->3
@@ -198,6 +198,8 @@ def add_configs(lib):
                 "G_M_DW": 24,
                 "G_M_UW": 3,
             },
+            model_check=sim_utils.offline_check("axis_resize", packed=packed_stream),
+            stimulus=resize_stimulus,
         )
 
         # Downsize 4->2
@@ -213,6 +215,8 @@ def add_configs(lib):
                 "G_M_DW": 16,
                 "G_M_UW": 2,
             },
+            model_check=sim_utils.offline_check("axis_resize", packed=packed_stream),
+            stimulus=resize_stimulus,
         )
 
         # Downsize 16->2
@@ -228,6 +232,8 @@ def add_configs(lib):
                 "G_M_DW": 16,
                 "G_M_UW": 4,
             },
+            model_check=sim_utils.offline_check("axis_resize", packed=packed_stream),
+            stimulus=resize_stimulus,
         )
 
         # Downsize 2->1
@@ -243,6 +249,8 @@ def add_configs(lib):
                 "G_M_DW": 8,
                 "G_M_UW": 16,
             },
+            model_check=sim_utils.offline_check("axis_resize", packed=packed_stream),
+            stimulus=resize_stimulus,
         )
 
         # Downsize 3->1
@@ -258,65 +266,81 @@ def add_configs(lib):
                 "G_M_DW": 8,
                 "G_M_UW": 1,
             },
+            model_check=sim_utils.offline_check("axis_resize", packed=packed_stream),
+            stimulus=resize_stimulus,
         )
 
     ############################################################################
     tb = lib.test_bench("axis_pack_tb")
-
-    enable_jitter = [True, False]
-    packed_stream = [True, False]
-
-    for enable_jitter, packed_stream in product(enable_jitter, packed_stream):
-        sim_utils.named_config(
-            tb,
-            {
-                "G_ENABLE_JITTER": enable_jitter,
-                "G_PACKED_STREAM": packed_stream,
-            },
-        )
+    sim_utils.runtime_generics(tb, ["G_ENABLE_JITTER"])
+
+    sim_utils.named_configs(
+        tb,
+        {
+            "G_ENABLE_JITTER": [True, False],
+            "G_PACKED_STREAM": [True, False],
+        },
+        model_check=sim_utils.offline_check("axis_pack"),
+        stimulus=lambda g: sim_utils.axis_stimulus(4, 4, 1, g["G_PACKED_STREAM"], 3 * 4),
+    )
 
     ############################################################################
     tb = lib.test_bench("axis_fifo_tb")
-
-    enable_jitter = [True]
-    depth = [64]
-    packet_mode = [True, False]
-    drop_oversize = [True, False]
-
-    for enable_jitter, depth, packet_mode, drop_oversize in product(
-        enable_jitter, depth, packet_mode, drop_oversize
-    ):
-        if not (not packet_mode and drop_oversize):
-            sim_utils.named_config(
-                tb,
-                {
-                    "G_ENABLE_JITTER": enable_jitter,
-                    "G_DEPTH": depth,
-                    "G_PACKET_MODE": packet_mode,
-                    "G_DROP_OVERSIZE": drop_oversize,
-                },
-            )
+    sim_utils.runtime_generics(tb, ["G_ENABLE_JITTER", "G_S_STALL_PROB", "G_M_STALL_PROB"])
+
+    sim_utils.named_configs(
+        tb,
+        {
+            "G_ENABLE_JITTER": [True],
+            "G_DEPTH": [64],
+            "G_PACKET_MODE": [True, False],
+            "G_DROP_OVERSIZE": [True, False],
+        },
+        # Dropping oversize packets is only supported in packet mode
+        constraint=lambda g: not (not g["G_PACKET_MODE"] and g["G_DROP_OVERSIZE"]),
+    )
+
+    sim_utils.perf_configs(
+        tb,
+        {
+            "G_DEPTH": [16, 64],
+            "G_PACKET_MODE": [False, True],
+            "G_PERF_PACKET_BEATS": [1, 8],
+            "G_S_STALL_PROB": [0, 50],
+            "G_M_STALL_PROB": [0, 50],
+        },
+    )
 
     ############################################################################
     tb = lib.test_bench("axis_fifo_async_tb")
+    sim_utils.runtime_generics(tb, ["G_ENABLE_JITTER", "G_CLK_RATIO", "G_S_STALL_PROB", "G_M_STALL_PROB"])
+
+    sim_utils.named_configs(
+        tb,
+        {
+            "G_ENABLE_JITTER": [True],
+            "G_CLK_RATIO": [12, 95, 106, 169, 800],
+            "G_DEPTH": [64],
+            "G_PACKET_MODE": [True, False],
+            "G_DROP_OVERSIZE": [True, False],
+        },
+        # Dropping oversize packets is only supported in packet mode
+        constraint=lambda g: not (not g["G_PACKET_MODE"] and g["G_DROP_OVERSIZE"]),
+    )
+
+    sim_utils.perf_configs(
+        tb,
+        {
+            "G_CLK_RATIO": [12, 95, 106, 169, 800],
+            "G_DEPTH": [16, 64],
+            "G_PACKET_MODE": [False, True],
+            "G_S_STALL_PROB": [0, 50],
+            "G_M_STALL_PROB": [0, 50],
+        },
+    )
 
-    enable_jitter = [True]
-    clk_ratio = [12, 95, 106, 169, 800]
-    depth = [64]
-    packet_mode = [True, False]
-    drop_oversize = [True, False]
-
-    for enable_jitter, clk_ratio, depth, packet_mode, drop_oversize in product(
-        enable_jitter, clk_ratio, depth, packet_mode, drop_oversize
-    ):
-        if not (not packet_mode and drop_oversize):
-            sim_utils.named_config(
-                tb,
-                {
-                    "G_ENABLE_JITTER": enable_jitter,
-                    "G_CLK_RATIO": clk_ratio,
-                    "G_DEPTH": depth,
-                    "G_PACKET_MODE": packet_mode,
-                    "G_DROP_OVERSIZE": drop_oversize,
-                },
-            )
+    ############################################################################
+    tb = lib.test_bench("ebtb_tb")
+
+    # Vector files written by tools/models/ebtb.py
+    tb.set_generic("G_VECTOR_PATH", str(sim_utils.GEN_DIR / "ebtb"))
@@ -0,0 +1,83 @@
+################################################################################
+# File : sim_coverage.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Generic expansion
+# ..A suite can either run the full Cartesian product of every generic list,
+# or a t-way covering array of it, where every combination of values of any t
+# generics still appears in at least one config. Config names do not depend on
+# the coverage mode, so a config in a pairwise run has the same name as in a
+# full run.
+################################################################################
+
+from itertools import combinations, product
+
+# Suite-level coverage mode: "full", "pairwise", or "<t>-way"
+COVERAGE = "full"
+
+
+def coverage_strength(coverage: str) -> int | None:
+    """
+    Return the covering array strength for a coverage mode, or None for the
+    full product.
+    """
+    if coverage == "full":
+        return None
+    if coverage == "pairwise":
+        return 2
+    if coverage.endswith("-way") and coverage[:-len("-way")].isdigit():
+        return int(coverage[:-len("-way")])
+    raise ValueError(f"Unknown coverage mode '{coverage}', expected full, pairwise or <t>-way")
+
+
+def covering_array(generics: dict, strength: int, constraint=None) -> list[dict]:
+    """
+    Return a t-way covering array of the generic lists as a list of generic
+    maps, in the same order as the full product.
+
+    Only combinations that satisfy the constraint are considered, so a t-tuple
+    of values is only required if at least one valid config contains it. Rows
+    are picked greedily from the full product, each time taking the row that
+    covers the most t-tuples that are not yet covered. This is not minimal,
+    but it is deterministic and fast for the size of the generic lists used
+    in test bench configs.
+    """
+    keys = list(generics.keys())
+    rows = [
+        dict(zip(keys, values)) for values in product(*generics.values())
+    ]
+    rows = [r for r in rows if constraint is None or constraint(r)]
+    if strength >= len(keys):
+        return rows
+
+    key_sets = list(combinations(keys, strength))
+
+    def tuples(row):
+        return {(ks, tuple(row[k] for k in ks)) for ks in key_sets}
+
+    row_tuples = [tuples(r) for r in rows]
+    uncovered = set().union(*row_tuples) if rows else set()
+    selected = set()
+    while uncovered:
+        best = max(
+            (i for i in range(len(rows)) if i not in selected),
+            key=lambda i: len(row_tuples[i] & uncovered),
+        )
+        selected.add(best)
+        uncovered -= row_tuples[best]
+
+    return [rows[i] for i in sorted(selected)]
+
+
+def expand(generics: dict, constraint=None, coverage: str | None = None) -> list[dict]:
+    """
+    Expand a map of generic name to list of values into a list of generic maps,
+    according to the coverage mode. The suite-level COVERAGE is used unless a
+    coverage mode is given. The optional constraint is a predicate that takes a
+    generic map and returns False for combinations that should not be run.
+    """
+    strength = coverage_strength(coverage or COVERAGE)
+    if strength is None:
+        strength = len(generics)
+    return covering_array(generics, strength, constraint)
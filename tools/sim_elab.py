@@ -0,0 +1,124 @@
+################################################################################
+# File : sim_elab.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Elaboration reuse
+# ..VUnit elaborates the test bench again for every test. Generics that are
+# marked as runtime generics with sim_utils.runtime_generics only set up the
+# test, such as stall probabilities, and do not change the design. With the
+# LLVM and GCC backends of GHDL, the test bench is elaborated into one
+# executable per set of its other (structural) generics, and every test with
+# the same structural generics runs that executable, with the runtime
+# generics and the runner config given on its command line.
+# ..The mcode backend of GHDL elaborates in memory, and NVC binds every
+# generic, including the runner config, when it elaborates, so neither of
+# them has an elaborated design that could be reused.
+# ..This depends on the GHDL interface of the VUnit version that is pinned in
+# the Makefile.
+################################################################################
+
+import hashlib
+import json
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+
+import vunit.sim_if.ghdl
+
+import sim_utils
+
+# Generics that VUnit sets for every test
+VUNIT_GENERICS = {"runner_cfg", "output_path"}
+
+# Directory of the executables of this run, see install
+ELAB_DIR = None
+
+# Whether the executable of each elaboration succeeded, by executable path
+BUILT: dict[Path, bool] = {}
+RUNS = 0
+_locks: dict[Path, threading.Lock] = {}
+_lock = threading.Lock()
+
+_ghdl_get_command = vunit.sim_if.ghdl.GHDLInterface._get_command
+
+
+def runtime_names(library_name: str, tb_name: str) -> set[str]:
+    """
+    Return the lower case names of the generics of a test bench that are set
+    at runtime
+    """
+    names = sim_utils.RUNTIME_GENERICS.get((library_name, tb_name), set())
+    return VUNIT_GENERICS | {name.lower() for name in names}
+
+
+def _get_command(self, config, output_path, elaborate_only, ghdl_e, test_suite_name, wave_file):
+    """
+    GHDL simulation command that runs the shared executable of the structural
+    generics of the config, elaborating it first if no test has yet
+    """
+    global RUNS
+    if elaborate_only or ghdl_e or not self._has_output_flag() or config.sim_options.get("enable_coverage", False):
+        return _ghdl_get_command(self, config, output_path, elaborate_only, ghdl_e, test_suite_name, wave_file)
+
+    # VUnit splits the --elab-run command into its elaboration and simulation
+    # arguments in args.json when it only elaborates with -e. It appends the
+    # generics to the ghdl.sim_flags list of the config in place, so it is
+    # given a copy of the config with its own lists.
+    probe = config.copy()
+    probe.sim_options = {k: list(v) if isinstance(v, list) else v for k, v in config.sim_options.items()}
+    _ghdl_get_command(self, probe, output_path, False, True, test_suite_name, wave_file)
+    args = json.loads((Path(output_path) / "args.json").read_text())
+
+    runtime = runtime_names(config.library_name, config.entity_name)
+    structural = [f"-g{k}={v}" for k, v in sorted(config.generics.items()) if k.lower() not in runtime]
+    build = [args["build"][0], *structural, *args["build"][1:]]
+    i = build.index("-o")
+    key = json.dumps(build[:i] + build[i + 2:])
+    binary = ELAB_DIR / f"{config.entity_name}-{hashlib.sha1(key.encode()).hexdigest()[:12]}"
+    build[i + 1] = str(binary)
+
+    with _lock:
+        lock = _locks.setdefault(binary, threading.Lock())
+    with lock:
+        if binary not in BUILT:
+            result = subprocess.run(
+                [str(Path(self._prefix) / self.executable), *build],
+                cwd=ELAB_DIR, capture_output=True, text=True,
+            )
+            BUILT[binary] = result.returncode == 0
+            if result.returncode != 0:
+                print(
+                    f"WARNING: Could not elaborate {binary.name} for reuse, its tests elaborate on their own:\n"
+                    f"{result.stdout}{result.stderr}"
+                )
+    if not BUILT[binary]:
+        return _ghdl_get_command(self, config, output_path, elaborate_only, ghdl_e, test_suite_name, wave_file)
+
+    with _lock:
+        RUNS += 1
+    sim = [a for a in args["sim"] if not any(a.startswith(g.split("=", 1)[0] + "=") for g in structural)]
+    return [str(binary), *sim]
+
+
+def install(output_path: Path):
+    """
+    Make the GHDL interface reuse elaborated test benches, writing the
+    executables to output_path. Executables of earlier runs may be out of
+    date, so they are removed.
+    """
+    global ELAB_DIR
+    ELAB_DIR = Path(output_path).resolve()
+    shutil.rmtree(ELAB_DIR, ignore_errors=True)
+    ELAB_DIR.mkdir(parents=True)
+    vunit.sim_if.ghdl.GHDLInterface._get_command = _get_command
+
+
+def report():
+    """
+    Print how many elaborations the tests shared
+    """
+    built = sum(BUILT.values())
+    if RUNS:
+        print(f"INFO: Ran {RUNS} test suite(s) on {built} elaborated test bench(es).")
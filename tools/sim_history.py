@@ -0,0 +1,145 @@
+################################################################################
+# File : sim_history.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Local store of per-test simulation runtimes and peak memory use
+################################################################################
+
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+HISTORY_FILE = SCRIPT_DIR.parent / "build" / "sim_history.json"
+
+# Weight given to the newest sample when it is averaged into the history
+NEW_SAMPLE_WEIGHT = 0.5
+
+
+class History:
+    """
+    Per-simulator runtime history, keyed on the full VUnit test name
+    (lib.tb.config.test). Runtimes are smoothed across runs so that a single
+    slow run on a busy machine does not dominate the estimate.
+    """
+
+    def __init__(self, simulator: str, path: Path = HISTORY_FILE):
+        self.simulator = simulator
+        self.path = Path(path)
+        try:
+            self._data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self._data = {}
+        self.tests = self._data.setdefault(simulator, {})
+
+    def time(self, test_name: str) -> float | None:
+        entry = self.tests.get(test_name)
+        return None if entry is None else entry["time"]
+
+    def estimate(self, test_names) -> float | None:
+        """
+        Return the expected runtime of a group of tests, or None if any of
+        them has never been run.
+        """
+        times = [self.time(t) for t in test_names]
+        if not times or None in times:
+            return None
+        return sum(times)
+
+    def mean(self) -> float:
+        times = [e["time"] for e in self.tests.values()]
+        return sum(times) / len(times) if times else 0.0
+
+    def rss(self, test_names) -> float | None:
+        """
+        Return the largest peak memory use in MiB of a group of tests, or
+        None if none of them has been measured.
+        """
+        values = [self.tests[t]["rss"] for t in test_names if "rss" in self.tests.get(t, {})]
+        return max(values) if values else None
+
+    def mean_rss(self) -> float | None:
+        values = [e["rss"] for e in self.tests.values() if "rss" in e]
+        return sum(values) / len(values) if values else None
+
+    def test_bench_rss(self, lib_name: str, tb_name: str) -> float | None:
+        """
+        Return the largest peak memory use in MiB of any config of a test bench
+        """
+        prefix = f"{lib_name}.{tb_name}."
+        return self.rss(t for t in self.tests if t.startswith(prefix))
+
+    def record(self, test_name: str, time: float, rss: float | None = None):
+        entry = self.tests.get(test_name)
+        if entry is None:
+            entry = self.tests[test_name] = {"time": time, "runs": 1}
+        else:
+            entry["time"] = (1 - NEW_SAMPLE_WEIGHT) * entry["time"] + NEW_SAMPLE_WEIGHT * time
+            entry["runs"] += 1
+        # Peak memory use barely changes between runs of the same config, so
+        # the latest measurement is kept as is
+        if rss is not None:
+            entry["rss"] = rss
+
+    def record_results(self, results, peak_rss: dict[str, float] | None = None):
+        """
+        Record the runtimes from a VUnit post_run results object, together with
+        the peak memory use in MiB of each test if it was measured. Failed and
+        skipped tests are left out since their runtimes are not representative.
+        """
+        peak_rss = peak_rss or {}
+        for name, test in results.get_report().tests.items():
+            if test.status == "passed":
+                self.record(name, test.time, peak_rss.get(name))
+
+    def record_xunit(self, xunit_file: Path):
+        """
+        Record the runtimes from a VUnit xunit xml report
+        """
+        for tc in ET.parse(xunit_file).getroot().iter("testcase"):
+            if tc.find("failure") is not None or tc.find("skipped") is not None:
+                continue
+            name = tc.get("name")
+            if tc.get("classname"):
+                name = f"{tc.get('classname')}.{name}"
+            self.record(name, float(tc.get("time", 0)))
+
+    def save(self):
+        """
+        Write the history of this simulator, keeping what another run has
+        saved for the other simulators in the meantime
+        """
+        try:
+            self._data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self._data = {}
+        self._data[self.simulator] = self.tests
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._data, indent=2, sort_keys=True))
+        tmp.replace(self.path)
+
+
+def makespan(times: list[float], num_threads: int) -> float:
+    """
+    Return the wall time needed to run a list of jobs, in the given order, on
+    num_threads workers that each take the next job as soon as they are free.
+    """
+    workers = [0.0] * max(1, num_threads)
+    for t in times:
+        i = workers.index(min(workers))
+        workers[i] += t
+    return max(workers)
+
+
+if __name__ == "__main__":
+    # Usage: python sim_history.py <simulator> <xunit.xml> [<xunit.xml> ...]
+    # ..Import runtimes from reports that were produced elsewhere, such as
+    # CI artifacts.
+    history = History(sys.argv[1])
+    for f in sys.argv[2:]:
+        history.record_xunit(Path(f))
+    history.save()
@@ -0,0 +1,173 @@
+################################################################################
+# File : sim_index.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Lightweight, cached index of the VHDL design units in the source tree
+# ..This is a quick regex scan rather than a real VHDL parser. It is only used
+# to find the set of files that a few test benches depend on before handing
+# them to VUnit, which then does the real dependency analysis.
+################################################################################
+
+import glob
+import json
+import os
+import re
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+INDEX_FILE = SCRIPT_DIR.parent / "build" / "sim_index.json"
+
+# Bump when the format of an index entry changes
+INDEX_VERSION = 1
+
+RE_COMMENT = re.compile(r"--.*$", re.MULTILINE)
+RE_PROVIDES = re.compile(
+    r"^\s*(?:entity|package|context|configuration)\s+(\w+)\s+is\b",
+    re.MULTILINE | re.IGNORECASE,
+)
+RE_ENTITY = re.compile(r"^\s*entity\s+(\w+)\s+is\b", re.MULTILINE | re.IGNORECASE)
+RE_COMPLETES = re.compile(
+    r"^\s*(?:architecture\s+\w+\s+of|package\s+body)\s+(\w+)\s+is\b",
+    re.MULTILINE | re.IGNORECASE,
+)
+RE_WORK_REF = re.compile(r"\bwork\.(\w+)", re.IGNORECASE)
+RE_COMPONENT = re.compile(r"^\s*component\s+(\w+)", re.MULTILINE | re.IGNORECASE)
+RE_LIBRARY = re.compile(r"^\s*library\s+([\w\s,]+);", re.MULTILINE | re.IGNORECASE)
+RE_VUNIT_REF = re.compile(r"\bvunit_lib\.(\w+)", re.IGNORECASE)
+RE_RUNNER_CFG = re.compile(r"\brunner_cfg\s*:", re.IGNORECASE)
+
+
+def scan(path: Path) -> dict:
+    """
+    Scan one VHDL file for the design units it declares and references
+    """
+    text = RE_COMMENT.sub("", path.read_text(errors="replace")).lower()
+    provides = RE_PROVIDES.findall(text)
+    libraries = set()
+    for clause in RE_LIBRARY.findall(text):
+        libraries.update(name.strip() for name in clause.split(","))
+    return {
+        "provides": sorted(set(provides)),
+        "completes": sorted(set(RE_COMPLETES.findall(text))),
+        "refs": sorted(set(RE_WORK_REF.findall(text)) | set(RE_COMPONENT.findall(text))),
+        "libraries": sorted(libraries - {"ieee", "std", "work"}),
+        "vunit_refs": sorted(set(RE_VUNIT_REF.findall(text))),
+        "test_benches": RE_ENTITY.findall(text) if RE_RUNNER_CFG.search(text) else [],
+    }
+
+
+class Index:
+    """
+    Design unit index of every file matched by a list of glob patterns.
+    Entries are cached on disk and only rescanned when a file's size or
+    modification time changes.
+    """
+
+    def __init__(self, patterns: list, cache_file: Path = INDEX_FILE):
+        self.cache_file = Path(cache_file)
+        try:
+            cache = json.loads(self.cache_file.read_text())
+            if cache.get("version") != INDEX_VERSION:
+                cache = {}
+        except (OSError, ValueError):
+            cache = {}
+        old = cache.get("files", {})
+
+        self.files = {}
+        self.changed = False
+        for pattern in patterns:
+            for f in sorted(glob.glob(str(pattern), recursive=True)):
+                f = str(Path(f).resolve())
+                st = Path(f).stat()
+                entry = old.get(f)
+                if entry is None or entry["mtime"] != st.st_mtime_ns or entry["size"] != st.st_size:
+                    entry = {"mtime": st.st_mtime_ns, "size": st.st_size, **scan(Path(f))}
+                    self.changed = True
+                self.files[f] = entry
+        if set(self.files) != set(old):
+            self.changed = True
+
+        # Every file that must be compiled when a design unit is needed
+        self.units = {}
+        for f, entry in self.files.items():
+            for name in entry["provides"] + entry["completes"]:
+                self.units.setdefault(name, set()).add(f)
+
+    def save(self):
+        if not self.changed:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": INDEX_VERSION, "files": self.files}))
+        tmp.replace(self.cache_file)
+
+    def test_benches(self) -> dict[str, str]:
+        """
+        Return a map of test bench name to the file that declares it
+        """
+        return {tb: f for f, e in self.files.items() for tb in e["test_benches"]}
+
+    def closure(self, files) -> list[str]:
+        """
+        Return the given files and every file they depend on, in index order
+        """
+        needed = set()
+        todo = list(files)
+        while todo:
+            f = todo.pop()
+            if f in needed:
+                continue
+            needed.add(f)
+            entry = self.files[f]
+            for name in entry["refs"] + entry["provides"]:
+                todo.extend(self.units.get(name, ()))
+        return [f for f in self.files if f in needed]
+
+    def builtins(self, files) -> list[str]:
+        """
+        Return the optional VUnit builtins that a set of files use, in the
+        order that sim.py adds them
+        """
+        needed = set()
+        for f in files:
+            entry = self.files[f]
+            if "osvvm" in entry["libraries"]:
+                needed.add("osvvm")
+            for ref in entry["vunit_refs"]:
+                if ref == "random_pkg":
+                    needed.add("random")
+                elif ref.startswith("com_"):
+                    needed.add("com")
+                elif ref not in VUNIT_CORE:
+                    needed.add("verification_components")
+        return [b for b in ["com", "osvvm", "random", "verification_components"] if b in needed]
+
+
+# vunit_lib packages that are always added by add_vhdl_builtins
+VUNIT_CORE = {
+    "vunit_context", "vunit_run_context", "run_pkg", "run_types_pkg",
+    "check_pkg", "log_levels_pkg", "logger_pkg", "log_handler_pkg",
+    "print_pkg", "queue_pkg", "integer_array_pkg", "string_ptr_pkg",
+    "integer_vector_ptr_pkg", "dict_pkg", "id_pkg", "event_pkg",
+    "event_common_pkg", "string_ops", "path", "dictionary", "data_types_context",
+}
+
+
+def match_test_benches(names, library: str, patterns: list[str]) -> list[str]:
+    """
+    Return the test benches that could be selected by a list of VUnit test
+    patterns. A test bench is selected when the literal start of a pattern,
+    up to its first wildcard, is consistent with the test bench's full name.
+    This can select more test benches than VUnit finally runs, but never
+    fewer.
+    """
+    selected = []
+    for name in names:
+        prefix = f"{library}.{name}."
+        for p in patterns:
+            literal = re.split(r"[*?\[]", p, maxsplit=1)[0]
+            if prefix.startswith(literal) or literal.startswith(prefix):
+                selected.append(name)
+                break
+    return selected
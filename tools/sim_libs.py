@@ -0,0 +1,205 @@
+################################################################################
+# File : sim_libs.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Cache of precompiled third-party simulation libraries
+# ..The VUnit builtins (vunit_lib, with com, random and the verification
+# components) and OSVVM are compiled once into build/sim_libs/<key>, where the
+# key covers everything that affects the compiled output. sim.py then maps
+# them as external libraries instead of compiling them into every fresh
+# vunit_out. VUnit always creates vunit_lib itself, so pointing it at the
+# cache depends on the internals of the VUnit version that is pinned in the
+# Makefile.
+# ..Every sim.py run holds a shared lock on build/sim_libs/<key>.lock for as
+# long as it uses the entry, and an exclusive one while it builds it. Entries
+# are only removed under an exclusive lock that is taken without waiting, so
+# that sim.py processes running at the same time, such as the simulators of a
+# matrix run, never build or remove an entry that another one is using.
+# ..If the installed VUnit is not the pinned version, or its internals are not
+# as expected, the libraries are compiled in place as usual.
+################################################################################
+
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+CACHE_DIR = SCRIPT_DIR.parent / "build" / "sim_libs"
+COMPLETE_FILE = "complete.json"
+LIBRARIES = ["vunit_lib", "osvvm"]
+
+# VUnit version whose internals use_cached_libraries depends on, the same as
+# REQUIRE_VUNIT_VER in the Makefile
+VUNIT_VERSION = "5.0.0.dev7"
+
+# Lock files of the entries that this process uses, which stay locked until it
+# exits
+_held = []
+
+
+def simulator_version(simulator_class) -> str | None:
+    """
+    Return the first line of the simulator's version string, or None if the
+    simulator can not be found
+    """
+    prefix = simulator_class.find_prefix()
+    if prefix is None:
+        return None
+    try:
+        output = subprocess.check_output(
+            [str(Path(prefix) / simulator_class.executable), "--version"]
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode(errors="replace").strip().splitlines()[0]
+
+
+def cache_key(simulator: str, version: str, vhdl_standard: str, a_flags: list[str]) -> str:
+    from vunit import __version__ as vunit_version
+
+    key = json.dumps([simulator, version, vhdl_standard, a_flags, vunit_version])
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def library_paths(path: Path, simulator: str) -> dict[str, Path]:
+    return {name: path / "vunit_out" / simulator / "libraries" / name for name in LIBRARIES}
+
+
+def lock(f, shared: bool = False, blocking: bool = True) -> bool:
+    """
+    Lock the open lock file of a cache entry, or change the kind of lock that
+    is held on it. Returns False if it is locked by another process and
+    blocking is False. Locking is only supported on POSIX systems, and is
+    skipped elsewhere.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return True
+    try:
+        fcntl.flock(f, (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | (0 if blocking else fcntl.LOCK_NB))
+    except BlockingIOError:
+        return False
+    return True
+
+
+def lock_file(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return open(path.with_name(path.name + ".lock"), "w")
+
+
+def evict(path: Path, simulator: str):
+    """
+    Remove the other cache entries of a simulator, which can no longer be
+    used, and entries that were left incomplete. Entries that are locked by
+    another process are left alone.
+    """
+    for old in CACHE_DIR.iterdir():
+        if old == path or not old.is_dir():
+            continue
+        try:
+            old_simulator = json.loads((old / COMPLETE_FILE).read_text())["simulator"]
+        except (OSError, ValueError, KeyError):
+            old_simulator = None
+        if old_simulator not in (None, simulator):
+            continue
+        with lock_file(old) as f:
+            if lock(f, blocking=False):
+                shutil.rmtree(old, ignore_errors=True)
+
+
+def build(path: Path, vhdl_standard: str, info: dict) -> bool:
+    """
+    Compile the libraries into path in a separate VUnit run. Older entries of
+    the same simulator are removed since they can no longer be used. Must be
+    called while holding the exclusive lock of path.
+    """
+    evict(path, info["simulator"])
+    shutil.rmtree(path, ignore_errors=True)
+    path.mkdir(parents=True)
+
+    print(f"INFO: Compiling third-party libraries into {path}")
+    cmd = [sys.executable, __file__, str(path / "vunit_out"), vhdl_standard]
+    if subprocess.run(cmd).returncode != 0:
+        return False
+    (path / COMPLETE_FILE).write_text(json.dumps(info, indent=2))
+    return True
+
+
+def cached_libraries(vhdl_standard: str, a_flags: dict[str, list[str]]) -> dict[str, Path] | None:
+    """
+    Return the compiled third-party libraries for the selected simulator,
+    building them first if they are not cached yet. Returns None if they
+    are not available, in which case they should be compiled as usual.
+    """
+    from vunit import __version__ as vunit_version
+    from vunit.sim_if.factory import SIMULATOR_FACTORY
+
+    if vunit_version != VUNIT_VERSION:
+        print(f"WARNING: The third-party library cache needs VUnit {VUNIT_VERSION}, not {vunit_version}, compiling them in place.")
+        return None
+
+    simulator_class = SIMULATOR_FACTORY.select_simulator()
+    if simulator_class is None:
+        return None
+    version = simulator_version(simulator_class)
+    if version is None:
+        return None
+
+    simulator = simulator_class.name
+    flags = a_flags.get(simulator, [])
+    key = cache_key(simulator, version, vhdl_standard, flags)
+    path = CACHE_DIR / key
+    # The shared lock is held for the rest of the run. Another process may be
+    # building the same entry, in which case this waits for it and then uses
+    # its result.
+    f = lock_file(path)
+    lock(f, shared=True)
+    if not (path / COMPLETE_FILE).exists():
+        lock(f)
+        if not (path / COMPLETE_FILE).exists():
+            info = {"simulator": simulator, "version": version, "vhdl_standard": vhdl_standard, "a_flags": flags}
+            if not build(path, vhdl_standard, info):
+                f.close()
+                print("WARNING: Failed to compile the third-party library cache, compiling them in place.")
+                return None
+        lock(f, shared=True)
+    _held.append(f)
+    return library_paths(path, simulator)
+
+
+def use_cached_libraries(vu, libraries: dict[str, Path]) -> bool:
+    """
+    Map the cached libraries into a VUnit project that does not have the
+    builtins added. Returns False, without changing the project, if VUnit
+    does not have the internals that this depends on.
+    """
+    try:
+        vunit_lib = vu._project._libraries["vunit_lib"]
+        if not hasattr(vunit_lib, "directory") or not hasattr(vunit_lib, "_is_external"):
+            raise AttributeError("vunit_lib has no directory or _is_external")
+    except (AttributeError, KeyError) as e:
+        print(f"WARNING: Can not map the third-party library cache into this VUnit ({e!r}), compiling them in place.")
+        return False
+    vunit_lib.directory = str(libraries["vunit_lib"])
+    vunit_lib._is_external = True
+    vu.add_external_library("osvvm", libraries["osvvm"])
+    return True
+
+
+if __name__ == "__main__":
+    # Usage: python sim_libs.py <output_path> <vhdl_standard>
+    # ..Only used by build() to compile the libraries on their own.
+    from vunit import VUnit
+
+    vu = VUnit.from_argv(argv=["--output-path", sys.argv[1], "--compile"], vhdl_standard=sys.argv[2])
+    vu.add_vhdl_builtins()
+    vu.add_com()
+    vu.add_osvvm()
+    vu.add_random()
+    vu.add_verification_components()
+    vu.main()
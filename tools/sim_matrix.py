@@ -0,0 +1,121 @@
+################################################################################
+# File : sim_matrix.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Simulator matrix for sim.py
+# ..VUnit can only use one simulator per process, so sim.py is run once per
+# simulator, all at the same time, each with its own output path. The runs
+# share one pool of worker slots (see sim_sched.WorkerPool), so together they
+# run no more tests at once than a single run would. Their outputs are
+# printed with the name of the simulator in front, and their xunit reports
+# are merged into one, with every test tagged by its simulator.
+################################################################################
+
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import sim_args
+import sim_sched
+import sim_shard
+import sim_utils
+from models import ebtb
+
+SCRIPT_DIR = Path(__file__).parent
+
+SIMULATORS = ["nvc", "ghdl"]
+
+
+def parse_simulators(value: str) -> list[str]:
+    """
+    Parse a comma separated list of simulators, such as nvc,ghdl
+    """
+    names = [s.strip() for s in value.split(",") if s.strip()]
+    for name in names:
+        if name not in SIMULATORS:
+            raise ValueError(f"Unknown simulator '{name}' in --simulators, expected any of {', '.join(SIMULATORS)}")
+    if not names or len(set(names)) != len(names):
+        raise ValueError(f"--simulators expects a list of different simulators, got '{value}'")
+    return names
+
+
+def _forward(name: str, stream):
+    """
+    Print the output of a run line by line, with its simulator in front
+    """
+    for line in iter(stream.readline, ""):
+        sys.stdout.write(f"[{name}] {line}")
+        sys.stdout.flush()
+
+
+def main(simulators: str, sim_argv: list[str]) -> int:
+    """
+    Run sim.py with sim_argv once per simulator, at the same time, and merge
+    their reports. Returns the exit code of the whole matrix.
+    """
+    try:
+        names = parse_simulators(simulators)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    # Every run gets its own output path and report below the common ones
+    argv = list(sim_argv)
+    output_path = Path(sim_args.pop_option(argv, "--output-path") or sim_args.pop_option(argv, "-o") or "vunit_out")
+    xunit_xml = sim_args.pop_option(argv, "--xunit-xml") or sim_args.pop_option(argv, "-x")
+    num_threads = sim_args.pop_option(argv, "--num-threads") or sim_args.pop_option(argv, "-p")
+    # Same default as VUnit, so a run has the same parallelism with or without
+    # the matrix
+    num_threads = int(num_threads) if num_threads is not None else 1
+
+    # Every run of a seed sweep has to sweep the same seeds
+    if sim_args.pop_option(list(argv), "--seeds") is not None and sim_args.pop_option(list(argv), "--seed") is None:
+        argv += ["--seed", os.urandom(8).hex()]
+
+    # Generated sources are shared, so they are written once up front
+    ebtb.generate(sim_utils.GEN_DIR / "ebtb")
+
+    pool_path = output_path / "worker_pool"
+    sim_sched.WorkerPool.create(pool_path, num_threads)
+    print(f"INFO: Running {', '.join(names)} at the same time on {num_threads} shared worker(s).")
+
+    runs = {}
+    for name in names:
+        run_path = output_path / name
+        (run_path / "report.xml").unlink(missing_ok=True)
+        cmd = [
+            sys.executable, str(SCRIPT_DIR / "sim.py"), *argv,
+            "--output-path", str(run_path),
+            "--xunit-xml", str(run_path / "report.xml"),
+            "--num-threads", str(num_threads),
+            "--worker-pool", str(pool_path),
+        ]
+        proc = subprocess.Popen(
+            cmd, cwd=SCRIPT_DIR, env={**os.environ, "VUNIT_SIMULATOR": name},
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1,
+        )
+        thread = threading.Thread(target=_forward, args=(name, proc.stdout), daemon=True)
+        thread.start()
+        runs[name] = (proc, thread, run_path / "report.xml")
+
+    returncodes = {}
+    try:
+        for name, (proc, thread, _) in runs.items():
+            returncodes[name] = proc.wait()
+            thread.join()
+    except KeyboardInterrupt:
+        for proc, _, _ in runs.values():
+            proc.terminate()
+        raise
+
+    reports = [(name, report) for name, (_, _, report) in runs.items() if report.exists()]
+    if reports:
+        output = Path(xunit_xml) if xunit_xml is not None else output_path / "report.xml"
+        sim_shard.merge_xunit(output, [r for _, r in reports], simulators=[name for name, _ in reports])
+
+    for name, code in returncodes.items():
+        print(f"INFO: {name}: {'passed' if code == 0 else f'failed with exit code {code}'}")
+    return 0 if all(code == 0 for code in returncodes.values()) else 1
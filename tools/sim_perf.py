@@ -0,0 +1,180 @@
+################################################################################
+# File : sim_perf.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Performance characterization
+# ..In characterization mode, sim.py runs only the test_characterize test of
+# the characterization configs. Each one logs its traffic with axis_perf_mon,
+# and the post_check of the config turns the log into the sustained
+# throughput, first beat latency and fill level histogram of the module at
+# that parameter point. At the end of the run, the results of every test
+# bench are merged into build/perf/<test bench>.json and .csv, one row per
+# config, so a partial run only updates the configs that it ran.
+################################################################################
+
+import csv
+import json
+import threading
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+RESULTS_DIR = SCRIPT_DIR.parent / "build" / "perf"
+
+# Name of the log that axis_perf_mon writes to the test output path
+LOG_FILE = "perf.txt"
+
+# Results of the configs that were measured in this run, by test bench and
+# config name
+RESULTS = {}
+_lock = threading.Lock()
+
+
+def read_log(path: Path) -> tuple[list, list, list]:
+    """
+    Return the input packets, output packets and fill level changes in an
+    axis_perf_mon log. Packets are (first cycle, last cycle, beats, first time
+    in ps) and fill level changes are (cycle, spec, comm).
+    """
+    s_pkts, m_pkts, depths = [], [], []
+    for line in Path(path).read_text().splitlines():
+        fields = line.split()
+        if not fields:
+            continue
+        if fields[0] in ("S", "M"):
+            # The time is followed by its unit, which is always ps
+            pkt = (int(fields[1]), int(fields[2]), int(fields[3]), float(fields[4]))
+            (s_pkts if fields[0] == "S" else m_pkts).append(pkt)
+        elif fields[0] == "D":
+            depths.append((int(fields[1]), int(fields[2]), int(fields[3])))
+    return s_pkts, m_pkts, depths
+
+
+def _percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def beats_per_cycle(pkts: list) -> float | None:
+    """
+    Return the beats per cycle from the first beat of the first packet to the
+    last beat of the last packet
+    """
+    if not pkts:
+        return None
+    cycles = pkts[-1][1] - pkts[0][0] + 1
+    return sum(p[2] for p in pkts) / cycles
+
+
+def histogram(depths: list, start_cycle: int, end_cycle: int, field: int) -> dict[int, int]:
+    """
+    Return the number of cycles spent at each fill level from start_cycle to
+    end_cycle
+    """
+    hist = {}
+    for (cycle, *levels), nxt in zip(depths, depths[1:] + [(end_cycle + 1,)]):
+        cycles = min(nxt[0], end_cycle + 1) - max(cycle, start_cycle)
+        if cycles > 0:
+            hist[levels[field]] = hist.get(levels[field], 0) + cycles
+    return dict(sorted(hist.items()))
+
+
+def analyze(path: Path) -> dict:
+    """
+    Return the characterization figures of one axis_perf_mon log. Raises
+    ValueError if not every input packet came out, since the latency pairs
+    them up by their order.
+    """
+    s_pkts, m_pkts, depths = read_log(path)
+    if len(s_pkts) != len(m_pkts):
+        raise ValueError(f"{len(s_pkts)} packet(s) went in but {len(m_pkts)} came out")
+    result = {
+        "packets": len(m_pkts),
+        "beats": sum(p[2] for p in m_pkts),
+        "s_beats_per_cycle": beats_per_cycle(s_pkts),
+        "m_beats_per_cycle": beats_per_cycle(m_pkts),
+    }
+
+    # Packets leave in the order that they arrived, so the n-th output packet
+    # is the n-th input packet
+    latency = [(m[3] - s[3]) / 1000 for s, m in zip(s_pkts, m_pkts)]
+    if latency:
+        result.update({
+            "latency_ns_min": min(latency),
+            "latency_ns_mean": sum(latency) / len(latency),
+            "latency_ns_p99": _percentile(latency, 99),
+            "latency_ns_max": max(latency),
+        })
+        # Also in cycles of the output clock, if its period can be measured
+        if len(m_pkts) > 1 and m_pkts[-1][0] > m_pkts[0][0]:
+            period = (m_pkts[-1][3] - m_pkts[0][3]) / (m_pkts[-1][0] - m_pkts[0][0]) / 1000
+            result["m_clk_period_ns"] = period
+            result["latency_cycles_mean"] = result["latency_ns_mean"] / period
+            result["latency_cycles_max"] = result["latency_ns_max"] / period
+
+    # Modules without a fill level leave it at zero. The histogram covers the
+    # traffic, from the first input beat until the module is empty again.
+    if s_pkts and any(spec or comm for _, spec, comm in depths):
+        end_cycle = max(depths[-1][0], s_pkts[-1][1])
+        for field, name in enumerate(["spec", "comm"]):
+            hist = histogram(depths, s_pkts[0][0], end_cycle, field)
+            cycles = sum(hist.values())
+            result[f"depth_{name}_max"] = max(level for level, n in hist.items() if n)
+            result[f"depth_{name}_mean"] = sum(level * n for level, n in hist.items()) / cycles
+            result[f"depth_{name}_histogram"] = hist
+    return result
+
+
+def post_check(tb_name: str, cfg_name: str, generics: dict):
+    """
+    Return a VUnit post_check that records the figures of a characterization
+    config. Configs that drop packets can not be characterized.
+    """
+    if generics.get("G_DROP_OVERSIZE", False):
+        raise ValueError(f"{tb_name}.{cfg_name}: G_DROP_OVERSIZE configs drop packets and can not be characterized")
+
+    def check(output_path):
+        log = Path(output_path) / LOG_FILE
+        if not log.exists():
+            print(f"ERROR: {log} was not written, is G_PERF set?")
+            return False
+        try:
+            figures = analyze(log)
+        except ValueError as e:
+            print(f"ERROR: {log}: {e}")
+            return False
+        result = {"config": cfg_name, **generics, **figures}
+        with _lock:
+            RESULTS.setdefault(tb_name, {})[cfg_name] = result
+        return True
+    return check
+
+
+def write_results():
+    """
+    Merge the results of this run into the result files of each test bench
+    """
+    for tb_name, results in sorted(RESULTS.items()):
+        json_file = RESULTS_DIR / f"{tb_name}.json"
+        try:
+            merged = json.loads(json_file.read_text())
+        except (OSError, ValueError):
+            merged = {}
+        merged.update(json.loads(json.dumps(results)))
+        merged = dict(sorted(merged.items()))
+
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        json_file.write_text(json.dumps(merged, indent=2) + "\n")
+
+        # The histograms only go to the JSON file
+        columns = []
+        for row in merged.values():
+            for k, v in row.items():
+                if k not in columns and not isinstance(v, dict):
+                    columns.append(k)
+        csv_file = RESULTS_DIR / f"{tb_name}.csv"
+        with open(csv_file, "w", newline="") as f:
+            writer = csv.DictWriter(f, columns, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(merged.values())
+        print(f"INFO: Wrote {len(results)} characterization result(s) to {csv_file} and {json_file.name}")
@@ -0,0 +1,219 @@
+################################################################################
+# File : sim_profile.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# HDL profiling
+# ..In profile mode, every simulator process is run under Linux perf, which
+# samples where the simulator spends its CPU time. The samples are attributed
+# to the symbols of the compiled design, which both simulators name after the
+# VHDL processes and subprograms that they were generated from. At the end of
+# the run, the samples of every test suite are added up into one report that
+# ranks the design units and packages, and the processes and subprograms, by
+# their CPU time across the suite.
+# ..NVC normally compiles the design just in time, which leaves its code
+# without symbols, so it generates the code before the run in profile mode.
+# GHDL has to use its LLVM or GCC backend, since mcode has no symbols either.
+# Samples without a symbol are counted against the library they are in.
+################################################################################
+
+import itertools
+import json
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import vunit.sim_if.ghdl
+import vunit.sim_if.nvc
+
+import sim_sched
+
+SCRIPT_DIR = Path(__file__).parent
+RESULTS_DIR = SCRIPT_DIR.parent / "build" / "profile"
+
+# Sampling frequency in Hz. Samples are taken on the CPU clock, so every
+# sample stands for the same CPU time.
+SAMPLE_FREQ = 999
+
+# Number of rows in each ranking of the text report
+REPORT_ROWS = 30
+
+# Directory of the perf data files of this run, see install
+DATA_DIR = None
+
+# Test names of the test suite profiled into each perf data file
+PROFILES: dict[Path, list[str]] = {}
+_counter = itertools.count()
+
+
+def perf() -> str | None:
+    """
+    Return the path of the perf executable, or None if it is not installed
+    """
+    return shutil.which("perf")
+
+
+class ProfiledProcess(sim_sched.MeasuredProcess):
+    """
+    Simulator process that runs under perf, writing one perf data file per
+    test suite
+    """
+
+    def __init__(self, args, cwd=None, env=None):
+        test_names = sim_sched.current_test_names()
+        name = f"{next(_counter):04d}"
+        if test_names:
+            name += "_" + re.sub(r"[^\w.=-]", "_", test_names[0])[:100]
+        data_file = DATA_DIR / f"{name}.data"
+        PROFILES[data_file] = test_names
+        args = [perf(), "record", "-e", "cpu-clock", "-F", str(SAMPLE_FREQ), "-q", "-o", str(data_file), "--", *args]
+        super().__init__(args, cwd=cwd, env=env)
+
+
+def install(output_path: Path):
+    """
+    Make the simulator interfaces run every simulator process under perf,
+    writing the data files to output_path
+    """
+    global DATA_DIR
+    DATA_DIR = Path(output_path).resolve()
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    vunit.sim_if.nvc.Process = ProfiledProcess
+    vunit.sim_if.ghdl.Process = ProfiledProcess
+
+    nvc_init = vunit.sim_if.nvc.NVCInterface.__init__
+    def no_jit_init(self, *args, **kwargs):
+        nvc_init(self, *args, **kwargs)
+        self._supports_jit = False
+    vunit.sim_if.nvc.NVCInterface.__init__ = no_jit_init
+
+
+def attribute(symbol: str, dso: str) -> tuple[str, str]:
+    """
+    Return the design unit or package, and the process or subprogram, that a
+    sampled symbol belongs to. NVC names code like WORK.TB.U_DUT.PRC_MAIN or
+    WORK.PKG.PROC(signature), and GHDL like work__pkg__proc. Anything else is
+    simulator runtime code, and is attributed to its library as [library].
+    """
+    library = f"[{Path(dso).name}]"
+    if symbol in ("", "[unknown]"):
+        return library, library
+    name = symbol.split("(", 1)[0]
+    if re.match(r"^[a-z][a-z0-9_]*__[a-z0-9_]+", name):
+        parts = name.split("__")
+        return f"{parts[0]}.{parts[1]}", ".".join(parts).lower()
+    if re.match(r"^[A-Z][A-Z0-9_]*\.[A-Z0-9_]+", name):
+        parts = name.lower().split(".")
+        return ".".join(parts[:2]), name.lower()
+    return library, f"{symbol} {library}"
+
+
+def read_samples(data_file: Path) -> dict[tuple[str, str], int]:
+    """
+    Return the number of samples of each (unit, process) in a perf data file
+    """
+    out = subprocess.run(
+        [perf(), "script", "-i", str(data_file), "-F", "ip,sym,dso"],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    samples = {}
+    for line in out.splitlines():
+        m = re.match(r"^\s*[0-9a-f]+\s+(.*?)\s*\((.*)\)\s*$", line)
+        if m is None:
+            continue
+        key = attribute(m.group(1), m.group(2))
+        samples[key] = samples.get(key, 0) + 1
+    return samples
+
+
+def _ranking(totals: dict[str, int], tests: dict[str, set], total: int) -> list[dict]:
+    return [
+        {
+            "name": name,
+            "seconds": n / SAMPLE_FREQ,
+            "share": n / total,
+            "tests": len(tests[name]),
+        }
+        for name, n in sorted(totals.items(), key=lambda kv: -kv[1])
+    ]
+
+
+def aggregate(profiles: dict[Path, list[str]]) -> dict:
+    """
+    Add up the samples of every profiled test suite
+    """
+    def read(item):
+        data_file, test_names = item
+        try:
+            return test_names, read_samples(data_file)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"WARNING: Could not read the profile {data_file}: {e}")
+            return test_names, {}
+
+    units, procs = {}, {}
+    unit_tests, proc_tests = {}, {}
+    suites = []
+    with ThreadPoolExecutor() as pool:
+        for test_names, samples in pool.map(read, [(f, t) for f, t in profiles.items() if f.exists()]):
+            for (unit, proc), n in samples.items():
+                units[unit] = units.get(unit, 0) + n
+                procs[proc] = procs.get(proc, 0) + n
+                unit_tests.setdefault(unit, set()).update(test_names)
+                proc_tests.setdefault(proc, set()).update(test_names)
+            if samples:
+                top = max(samples, key=samples.get)
+                suites.append({
+                    "tests": test_names,
+                    "seconds": sum(samples.values()) / SAMPLE_FREQ,
+                    "top": top[1],
+                })
+
+    total = sum(units.values())
+    return {
+        "sample_freq": SAMPLE_FREQ,
+        "seconds": total / SAMPLE_FREQ,
+        "units": _ranking(units, unit_tests, total),
+        "processes": _ranking(procs, proc_tests, total),
+        "suites": sorted(suites, key=lambda s: -s["seconds"]),
+    }
+
+
+def format_report(profile: dict) -> str:
+    """
+    Return the text report of an aggregated profile
+    """
+    lines = [
+        f"Profile of {len(profile['suites'])} test suite(s), "
+        f"{profile['seconds']:.1f} s of CPU time sampled at {profile['sample_freq']} Hz",
+    ]
+    for key, title in [("units", "Design units and packages"), ("processes", "Processes and subprograms")]:
+        lines += ["", title, f"{'Rank':>5} {'Time [s]':>9} {'Share':>6} {'Tests':>6}  Name"]
+        for i, row in enumerate(profile[key][:REPORT_ROWS]):
+            lines.append(f"{i + 1:>5} {row['seconds']:>9.2f} {row['share']:>6.1%} {row['tests']:>6}  {row['name']}")
+    lines += ["", "Test suites", f"{'Rank':>5} {'Time [s]':>9}  Test suite (top process)"]
+    for i, suite in enumerate(profile["suites"][:REPORT_ROWS]):
+        name = suite["tests"][0] if suite["tests"] else "?"
+        if len(suite["tests"]) > 1:
+            name += f" (+{len(suite['tests']) - 1})"
+        lines.append(f"{i + 1:>5} {suite['seconds']:>9.2f}  {name} ({suite['top']})")
+    return "\n".join(lines) + "\n"
+
+
+def write_report(simulator: str):
+    """
+    Write the aggregated profile of this run to build/profile/<simulator>.txt
+    and .json
+    """
+    profile = aggregate(PROFILES)
+    if not profile["suites"]:
+        print("WARNING: No profiles were recorded.")
+        return
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    txt_file = RESULTS_DIR / f"{simulator}.txt"
+    txt_file.write_text(format_report(profile))
+    (RESULTS_DIR / f"{simulator}.json").write_text(json.dumps(profile, indent=2) + "\n")
+    print(f"INFO: Profile of {len(profile['suites'])} test suite(s) written to {txt_file} and {txt_file.stem}.json")
+    for row in profile["units"][:5]:
+        print(f"INFO:   {row['share']:6.1%}  {row['name']}")
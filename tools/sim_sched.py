@@ -0,0 +1,342 @@
+################################################################################
+# File : sim_sched.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# VUnit test scheduling
+# ..VUnit's own "--test-prio opt" ordering runs the tests that failed or whose
+# sources changed first, and only orders by runtime within those groups,
+# shortest first. Its history lives in the database of the output path, which
+# every CI job and shard starts without. It has no memory budget, shared
+# worker pool or early stop of a seed sweep, and no hook to add them, so in
+# every mode except "--test-prio ordered" it is replaced by the longest-first
+# scheduler here, which takes its runtimes from build/sim_history.json.
+# ..VUnit does not have a public hook for test ordering, so the scheduler is
+# swapped out for one of these classes. They depend on the TestScheduler
+# interface of the VUnit version that is pinned in the Makefile.
+# ..The simulator processes are wrapped in the same way to measure their peak
+# memory use, which is what the scheduler's memory budget is checked against.
+# ..In a seed sweep, the scheduler also stops handing out the seeded copies of
+# a config once one of them has failed.
+# ..Several sim.py processes that run at the same time, such as the simulators
+# of a matrix run, can share one pool of workers.
+################################################################################
+
+import math
+import os
+import threading
+import time
+from pathlib import Path
+
+import vunit.sim_if.ghdl
+import vunit.sim_if.nvc
+import vunit.test.runner
+from vunit import ostools
+from vunit.ostools import Process
+from vunit.test.report import PASSED, SKIPPED
+from vunit.test.runner import TestScheduler
+
+import sim_seeds
+from sim_history import History, makespan
+
+# Part of the physical memory used by an automatic memory budget
+AUTO_BUDGET_FRACTION = 0.8
+
+# NVC heap size bounds in MiB, and the factor between the measured peak memory
+# use of a test bench and its heap size
+HEAP_MIN = 256
+HEAP_MAX = 4096
+HEAP_MARGIN = 2
+
+# Test suite that is running on the current worker thread
+_current = threading.local()
+
+
+def current_test_names() -> list[str]:
+    """
+    Return the test names of the test suite running on the current worker
+    thread, or an empty list if they are not known
+    """
+    return list(getattr(_current, "test_names", []))
+
+
+class MeasuredProcess(Process):
+    """
+    Simulator process that records its peak resident memory against the test
+    suite running on the current thread. Only supported on POSIX systems.
+    """
+
+    # Peak memory use in MiB of each test that has run, by full test name
+    peak_rss: dict[str, float] = {}
+
+    def wait(self):
+        pid = self._process.pid
+        while self._process.returncode is None:
+            ostools.PROGRAM_STATUS.check_for_shutdown()
+            try:
+                done, status, usage = os.wait4(pid, os.WNOHANG)
+            except ChildProcessError:
+                # Already reaped elsewhere, so the usage is lost
+                return self._process.wait()
+            if done:
+                self._process.returncode = os.waitstatus_to_exitcode(status)
+                self._record(usage.ru_maxrss / 1024)
+            else:
+                time.sleep(0.05)
+        return self._process.returncode
+
+    def _record(self, rss: float):
+        for name in getattr(_current, "test_names", []):
+            self.peak_rss[name] = max(rss, self.peak_rss.get(name, 0.0))
+
+
+class WorkerPool:
+    """
+    Worker slots shared by several sim.py processes. The pool is a directory of
+    slot files, and a test suite holds an exclusive lock on one of them while
+    it runs, so the processes together never run more test suites at once than
+    there are slots. The locks are released by the OS if a process dies. Only
+    supported on POSIX systems.
+    """
+
+    # Time between attempts to take a slot while all of them are in use, in
+    # seconds
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, path: Path):
+        self.slots = sorted(Path(path).glob("slot*"))
+        if not self.slots:
+            raise ValueError(f"No worker slots in {path}")
+        self._held = {}
+
+    @staticmethod
+    def create(path: Path, size: int):
+        path.mkdir(parents=True, exist_ok=True)
+        for slot in path.glob("slot*"):
+            slot.unlink()
+        for i in range(size):
+            (path / f"slot{i}").touch()
+
+    def acquire(self, thread_id):
+        import fcntl
+        while True:
+            for slot in self.slots:
+                fd = os.open(slot, os.O_RDWR)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    os.close(fd)
+                    continue
+                self._held[thread_id] = fd
+                return
+            ostools.PROGRAM_STATUS.check_for_shutdown()
+            time.sleep(self.POLL_INTERVAL)
+
+    def release(self, thread_id):
+        # Closing the file drops its lock
+        fd = self._held.pop(thread_id, None)
+        if fd is not None:
+            os.close(fd)
+
+
+class LongestFirstScheduler(TestScheduler):
+    """
+    Hand out test suites longest-first according to the runtime history, so
+    that the long tests start early and the run does not end with one long
+    test running alone. Tests without any history are assumed to take the
+    average time of the known tests.
+
+    With a memory budget, a test suite is only started when its recorded peak
+    memory use fits in what the running suites leave of the budget. The
+    longest suite that fits is taken, and a thread waits when none does. A
+    suite that does not fit in the whole budget still runs, but on its own.
+
+    In a seed sweep, the seeded copies of a config that start after one of
+    them has failed are skipped.
+
+    With a worker pool, a thread holds a slot of the pool while it runs a
+    test suite.
+    """
+
+    history: History = None
+    mem_budget: float | None = None
+    pool: WorkerPool | None = None
+    last = None
+
+    def __init__(self, test_suites, num_threads, latest_dependency_updates, test_history):
+        super().__init__(test_suites, num_threads, latest_dependency_updates, test_history)
+        LongestFirstScheduler.last = self
+
+        default = self.history.mean()
+        default_rss = self.history.mean_rss() or 0.0
+        self._queue = []
+        for test_suite in test_suites:
+            estimate = self.history.estimate(test_suite.test_names)
+            rss = self.history.rss(test_suite.test_names)
+            self._queue.append((
+                default if estimate is None else estimate,
+                default_rss if rss is None else rss,
+                test_suite,
+            ))
+        self._queue.sort(key=lambda item: item[0], reverse=True)
+        self._cond = threading.Condition(self._lock)
+        self._mem_in_use = {}
+        self._failed_configs = set()
+
+        self.predicted = makespan([t for t, _, _ in self._queue], num_threads)
+        self.start_time = None
+        self.end_time = None
+        print("INFO: Scheduling longest-first from the runtime history, in place of VUnit's --test-prio opt")
+        print(
+            f"INFO: Predicted makespan {self.predicted:.1f} s for "
+            f"{len(self._queue)} test suite(s) on {num_threads} thread(s)"
+        )
+        if self.mem_budget is not None:
+            print(f"INFO: Memory budget {self.mem_budget:.0f} MiB")
+
+    def _admissible(self) -> int | None:
+        """
+        Return the queue index of the next test suite to start, or None if
+        none of them fits in the memory budget right now
+        """
+        if self.mem_budget is None or not self._mem_in_use:
+            return 0
+        free = self.mem_budget - sum(self._mem_in_use.values())
+        return next((i for i, (_, rss, _) in enumerate(self._queue) if rss <= free), None)
+
+    def next(self, thread_id):
+        ostools.PROGRAM_STATUS.check_for_shutdown()
+        if self.pool is None:
+            return self._next(thread_id)
+
+        # Take a slot before the test suite, so that the other processes can
+        # use the slot until then
+        with self._cond:
+            if not self._queue:
+                _current.test_names = []
+                raise StopIteration
+        self.pool.acquire(thread_id)
+        try:
+            return self._next(thread_id)
+        except BaseException:
+            self.pool.release(thread_id)
+            raise
+
+    def _next(self, thread_id):
+        with self._cond:
+            while True:
+                if not self._queue:
+                    _current.test_names = []
+                    raise StopIteration
+                i = self._admissible()
+                if i is not None:
+                    break
+                # Wake up regularly to notice a shutdown
+                self._cond.wait(0.5)
+                ostools.PROGRAM_STATUS.check_for_shutdown()
+            if self.start_time is None:
+                self.start_time = time.time()
+            _, rss, test_suite = self._queue.pop(i)
+            self._mem_in_use[thread_id] = rss
+            _current.test_names = test_suite.test_names
+            config = sim_seeds.config_of(test_suite.test_names[0])
+            if config is not None:
+                self._stop_on_failure(test_suite, sim_seeds.SEEDED[config][0])
+            return test_suite
+
+    def _stop_on_failure(self, test_suite, config: str):
+        """
+        Make a test suite of a seed sweep record when it fails, or skip it if
+        another copy of its config has already failed
+        """
+        run = test_suite.run
+
+        def run_or_skip(*args, **kwargs):
+            with self._lock:
+                failed = config in self._failed_configs
+            if failed:
+                return {name: SKIPPED for name in test_suite.test_names}
+            results = run(*args, **kwargs)
+            if any(value != PASSED for value in results.values()):
+                with self._lock:
+                    self._failed_configs.add(config)
+            return results
+
+        test_suite.run = run_or_skip
+
+    def test_done(self, thread_id):
+        super().test_done(thread_id)
+        if self.pool is not None:
+            self.pool.release(thread_id)
+        with self._cond:
+            self._mem_in_use.pop(thread_id, None)
+            self._cond.notify_all()
+        self.end_time = time.time()
+
+    @property
+    def actual(self) -> float | None:
+        if self.start_time is None or self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+
+def install(scheduler_class, history: History, mem_budget: float | None = None, pool: WorkerPool | None = None):
+    """
+    Make VUnit's test runner use the given scheduler
+    """
+    scheduler_class.history = history
+    scheduler_class.mem_budget = mem_budget
+    scheduler_class.pool = pool
+    vunit.test.runner.TestScheduler = scheduler_class
+
+
+def install_memory_measurement() -> bool:
+    """
+    Make the simulator interfaces measure the peak memory use of every
+    simulator process. Returns False if this is not supported.
+    """
+    if not hasattr(os, "wait4"):
+        return False
+    vunit.sim_if.nvc.Process = MeasuredProcess
+    vunit.sim_if.ghdl.Process = MeasuredProcess
+    return True
+
+
+def parse_mem_size(value: str) -> float:
+    """
+    Parse a memory size such as 512m or 48g into MiB. "auto" is a part of the
+    physical memory of this machine.
+    """
+    if value == "auto":
+        total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        return AUTO_BUDGET_FRACTION * total / 2**20
+    units = {"k": 2**-10, "m": 1, "g": 2**10}
+    try:
+        if value[-1:].lower() in units:
+            size = float(value[:-1]) * units[value[-1].lower()]
+        else:
+            size = float(value)
+    except ValueError:
+        raise ValueError(f"Invalid memory size '{value}', expected a size such as 512m or 48g, or auto")
+    if size <= 0:
+        raise ValueError(f"Invalid memory size '{value}', expected a positive size")
+    return size
+
+
+def heap_size(rss: float) -> str:
+    """
+    Return the NVC heap size for a test bench with the given peak memory use in
+    MiB, rounded up to a power of two
+    """
+    size = 2 ** math.ceil(math.log2(max(rss * HEAP_MARGIN, 1)))
+    return f"{min(max(size, HEAP_MIN), HEAP_MAX)}m"
+
+
+def report_makespan(scheduler_class):
+    scheduler = scheduler_class.last
+    if scheduler is None or scheduler.actual is None:
+        return
+    print(
+        f"INFO: Makespan predicted {scheduler.predicted:.1f} s, "
+        f"actual {scheduler.actual:.1f} s"
+    )
@@ -0,0 +1,104 @@
+################################################################################
+# File : sim_seeds.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Seed sweeps
+# ..In a seed sweep, every config is replaced by a number of seeded copies.
+# Each copy gets its own VUnit seed, derived from the base seed and the name of
+# the config, so the whole sweep repeats with the same base seed. The scheduler
+# stops handing out the copies of a config once one of them has failed, and a
+# failing copy reproduces as its original config with --seed set to the seed
+# of that copy.
+################################################################################
+
+import hashlib
+import os
+import re
+
+# Number of seeded copies of every config, or None to run every config once
+SEEDS = None
+
+# Base seed of the sweep, 16 hex digits like a VUnit seed
+BASE_SEED = None
+
+# Full name of every seeded config, mapped to the full name of its original
+# config and its seed
+SEEDED = {}
+
+
+def setup(seeds: str, base_seed: str | None):
+    """
+    Start a sweep of a number of seeds per config. A random base seed is used
+    unless one is given.
+    """
+    global SEEDS, BASE_SEED
+    if not seeds.isdigit() or int(seeds) < 1:
+        raise ValueError(f"--seeds expects a positive number of seeds, got '{seeds}'")
+    if base_seed is None:
+        base_seed = os.urandom(8).hex()
+    if not re.fullmatch(r"[0-9a-fA-F]{16}", base_seed):
+        raise ValueError(f"--seed with --seeds expects 16 hex digits, got '{base_seed}'")
+    SEEDS = int(seeds)
+    BASE_SEED = base_seed.lower()
+    print(f"INFO: Sweeping {SEEDS} seed(s) per config from base seed {BASE_SEED}")
+
+
+def seed(config: str, i: int) -> str:
+    """
+    Return the seed of the i-th copy of a config
+    """
+    return hashlib.blake2b(f"{BASE_SEED}.{config}.{i}".encode(), digest_size=8).hexdigest()
+
+
+def expand(tb, cfg_name: str | None) -> list[tuple[str, dict]]:
+    """
+    Return the name and sim options of every copy of a config of a test bench.
+    cfg_name is None for the default config of a test bench without configs.
+    """
+    if SEEDS is None:
+        return [(cfg_name, {})]
+    original = f"{tb.library.name}.{tb.name}" + ("" if cfg_name is None else f".{cfg_name}")
+    result = []
+    for i in range(SEEDS):
+        name = f"seed={i}" if cfg_name is None else f"{cfg_name}-seed={i}"
+        s = seed(original, i)
+        SEEDED[f"{tb.library.name}.{tb.name}.{name}"] = (original, s)
+        result.append((name, {"seed": s}))
+    return result
+
+
+def config_of(test_name: str) -> str | None:
+    """
+    Return the seeded config that a test belongs to, or None if it is not part
+    of a sweep
+    """
+    config = test_name.rsplit(".", 1)[0]
+    return config if config in SEEDED else None
+
+
+def reproduction(test_name: str) -> tuple[str, str] | None:
+    """
+    Return the name of a seeded test in its original config, and its seed
+    """
+    config = config_of(test_name)
+    if config is None:
+        return None
+    original, s = SEEDED[config]
+    return f"{original}.{test_name.rsplit('.', 1)[1]}", s
+
+
+def report(results):
+    """
+    Print how to reproduce every test of a sweep that failed, from a VUnit
+    post_run results object
+    """
+    tests = results.get_report().tests
+    skipped = sum(1 for name, t in tests.items() if t.status == "skipped" and config_of(name))
+    for name, test in tests.items():
+        found = reproduction(name) if test.status == "failed" else None
+        if found is not None:
+            original, s = found
+            print(f"ERROR: {name} failed with seed {s}, reproduce with: python sim.py --seed {s} {original}")
+    if skipped:
+        print(f"INFO: Skipped {skipped} seeded run(s) of configs that had already failed.")
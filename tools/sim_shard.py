@@ -0,0 +1,204 @@
+################################################################################
+# File : sim_shard.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Split the simulation suite into balanced shards for running across several
+# machines, and merge the per-shard xunit reports back together.
+# ..Every shard has to partition the suite from the same runtime history, or
+# the shards disagree on which configs they run. Each shard writes the units
+# of the whole suite and its own share of them next to its xunit report, and
+# the merge checks that the shards agree and together ran every unit.
+################################################################################
+
+import json
+import sys
+import xml.etree.ElementTree as ET
+from fnmatch import fnmatch
+from pathlib import Path
+
+import sim_utils
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """
+    Parse a shard given as "i/n", where i counts from 1
+    """
+    try:
+        i, n = (int(x) for x in value.split("/"))
+    except ValueError:
+        sys.exit(f"ERROR: Invalid shard '{value}', expected i/n")
+    if not 1 <= i <= n:
+        sys.exit(f"ERROR: Invalid shard '{value}', expected 1 <= i <= n")
+    return i, n
+
+
+def units(lib) -> list[str]:
+    """
+    Return the units of work that are split between shards: one per named
+    config, or one per test bench for test benches without named configs.
+    """
+    result = [f"{l}.{tb}.{cfg}" for l, tb, cfg in sim_utils.CONFIGS if l == lib.name]
+    configured = {tb for l, tb, _ in sim_utils.CONFIGS if l == lib.name}
+    for tb in lib.get_test_benches(allow_empty=True):
+        if tb.name not in configured:
+            result.append(f"{lib.name}.{tb.name}")
+    return result
+
+
+def partition(names: list[str], n: int, history) -> list[list[str]]:
+    """
+    Split units into n shards with about the same expected runtime, by
+    handing the longest remaining unit to the least loaded shard. Units
+    without any history are assumed to take the average time of the known
+    ones. With no history at all, every unit counts the same, which balances
+    the number of configs per shard instead.
+    """
+    known = {}
+    for name in names:
+        times = [t["time"] for k, t in history.tests.items() if k.startswith(name + ".")]
+        if times:
+            known[name] = sum(times)
+    default = sum(known.values()) / len(known) if known else 1.0
+    estimates = {name: known.get(name, default) for name in names}
+
+    shards = [[] for _ in range(n)]
+    loads = [0.0] * n
+    for name in sorted(names, key=lambda k: (-estimates[k], k)):
+        i = loads.index(min(loads))
+        shards[i].append(name)
+        loads[i] += estimates[name]
+
+    for i, load in enumerate(loads):
+        print(f"INFO: Shard {i + 1}/{n}: {len(shards[i])} unit(s), expected {load:.1f} s")
+    return shards
+
+
+def manifest_path(xunit_file: Path) -> Path:
+    """
+    Return the shard manifest that belongs to an xunit report
+    """
+    return Path(xunit_file).with_suffix(".shard.json")
+
+
+def select(args, lib, shard: str, history):
+    """
+    Restrict the tests that VUnit runs to a single shard, and write the shard
+    manifest next to the xunit report, if there is one.
+
+    VUnit builds its test filter from args.test_patterns when it is created,
+    and keeps a reference to that list, so the list is updated in place.
+    prepare_args must have been called before the VUnit object was created.
+    """
+    i, n = parse_shard(shard)
+    user_patterns = list(args.test_patterns)
+    names = [
+        u for u in units(lib)
+        if any(fnmatch(u + ".*", p) or fnmatch(u, p) for p in user_patterns)
+    ]
+    own = partition(names, n, history)[i - 1]
+    args.test_patterns[:] = [u + ".*" for u in own]
+
+    if args.xunit_xml is not None:
+        manifest = manifest_path(args.xunit_xml)
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        manifest.write_text(json.dumps({"shard": i, "shards": n, "units": sorted(names), "own": sorted(own)}, indent=2))
+
+
+def check_shards(inputs: list[Path]) -> list[str]:
+    """
+    Check that the shard reports were partitioned the same way and together
+    ran every unit of the suite. Returns a list of problems, which is empty
+    when the reports are complete or none of them came from a shard.
+    """
+    manifests = {f: manifest_path(f) for f in inputs}
+    if not any(m.exists() for m in manifests.values()):
+        return []
+    missing = [str(f) for f, m in manifests.items() if not m.exists()]
+    if missing:
+        return [f"No shard manifest for {', '.join(missing)}"]
+
+    shards = [json.loads(m.read_text()) for m in manifests.values()]
+    problems = []
+    n = shards[0]["shards"]
+    if any(s["shards"] != n or s["units"] != shards[0]["units"] for s in shards):
+        problems.append("The shards did not split the same suite the same way, were they run with different histories?")
+    indices = sorted(s["shard"] for s in shards)
+    if indices != list(range(1, n + 1)):
+        problems.append(f"Expected the reports of shards 1 to {n}, got shard(s) {indices}")
+
+    owners = {}
+    for s in shards:
+        for u in s["own"]:
+            owners.setdefault(u, []).append(s["shard"])
+    for u in shards[0]["units"]:
+        if len(owners.get(u, [])) != 1:
+            problems.append(f"{u} was run by {len(owners.get(u, []))} shards")
+
+    # Every unit has to show up in the reports, which it does not if a shard
+    # stopped early
+    tests = set()
+    for f in inputs:
+        for tc in ET.parse(f).getroot().iter("testcase"):
+            tests.add(f"{tc.get('classname')}.{tc.get('name')}" if tc.get("classname") else tc.get("name"))
+    for u in sorted(set().union(*(s["own"] for s in shards))):
+        if not any(t.startswith(u + ".") for t in tests):
+            problems.append(f"{u} has no tests in the shard reports")
+    return problems
+
+
+def prepare_args(args):
+    if not isinstance(args.test_patterns, list):
+        args.test_patterns = [args.test_patterns]
+
+
+def merge_xunit(output: Path, inputs: list[Path], simulators: list[str] | None = None):
+    """
+    Merge several VUnit xunit reports into one. With the simulator of each
+    report, the tests of each report are prefixed with its simulator and get
+    it as a property, so that the same test from two simulators stays apart.
+    """
+    root = ET.Element("testsuite")
+    root.attrib["name"] = "testsuite"
+    counts = {"errors": 0, "failures": 0, "skipped": 0, "tests": 0}
+    for i, f in enumerate(inputs):
+        suite = ET.parse(f).getroot()
+        for k in counts:
+            counts[k] += int(suite.get(k, 0))
+        for tc in suite.iter("testcase"):
+            if simulators is not None:
+                _tag(tc, simulators[i])
+            root.append(tc)
+    for k, v in counts.items():
+        root.attrib[k] = str(v)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(root).write(output, encoding="unicode")
+    print(f"INFO: Merged {len(inputs)} report(s), {counts['tests']} test(s), "
+          f"{counts['failures']} failure(s) into {output}")
+    return counts["failures"] + counts["errors"] == 0
+
+
+def _tag(tc, simulator: str):
+    """
+    Prefix a testcase with its simulator and record it as a property
+    """
+    tc.set("classname", f"{simulator}.{tc.get('classname')}" if tc.get("classname") else simulator)
+    properties = tc.find("properties")
+    if properties is None:
+        properties = ET.Element("properties")
+        tc.insert(0, properties)
+    ET.SubElement(properties, "property", name="simulator", value=simulator)
+
+
+if __name__ == "__main__":
+    # Usage: python sim_shard.py merge <output.xml> [<shard.xml> ...]
+    # ..With no shard reports, an empty report is written.
+    if len(sys.argv) < 3 or sys.argv[1] != "merge":
+        sys.exit("Usage: python sim_shard.py merge <output.xml> [<shard.xml> ...]")
+    inputs = [Path(f) for f in sys.argv[3:]]
+    ok = merge_xunit(Path(sys.argv[2]), inputs)
+    problems = check_shards(inputs)
+    for problem in problems:
+        print(f"ERROR: {problem}")
+    sys.exit(0 if ok and not problems else 1)
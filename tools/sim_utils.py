@@ -6,6 +6,210 @@
 # Common VUnit sim utilities
 ################################################################################
 
-def named_config(tb, map : dict):
+import threading
+from pathlib import Path
+
+import sim_coverage
+import sim_perf
+import sim_seeds
+
+ROOT_DIR = Path(__file__).parent.parent
+
+# Sources and test vectors generated by the Python models
+GEN_DIR = ROOT_DIR / "build" / "sim_gen"
+
+# Source files of the simulation library
+SOURCES = [
+    ROOT_DIR / "src" / "**" / "hdl" / "*.vhd",
+    ROOT_DIR / "src" / "**" / "sim" / "*.vhd",
+    ROOT_DIR / "lib" / "**" / "src" / "**" / "hdl" / "*.vhd",
+    ROOT_DIR / "lib" / "**" / "src" / "**" / "sim" / "*.vhd",
+    ROOT_DIR / "test" / "**" / "*.vhd",
+    ROOT_DIR / "build" / "regs_out" / "**" / "hdl" / "*.vhd",
+    GEN_DIR / "**" / "*.vhd",
+]
+
+# Platform sources, which are not simulated but are included in the VHDL LS
+# config
+PLATFORM_SOURCES = [
+    ROOT_DIR / "platforms" / "**" / "hdl" / "*.vhd",
+]
+
+
+class SkippedTestBench:
+    """
+    Stand-in for a test bench that was not loaded by a lazy sim run. Anything
+    done to it is ignored.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getattr__(self, attr):
+        return lambda *args, **kwargs: None
+
+
+class LazyLibrary:
+    """
+    Wraps a VUnit library that only holds some of the test benches, so that
+    sim_configs can still add configs for all of them.
+    """
+
+    def __init__(self, lib, test_benches):
+        self._lib = lib
+        self._test_benches = set(test_benches)
+
+    def test_bench(self, name: str):
+        if name not in self._test_benches:
+            return SkippedTestBench(name)
+        return self._lib.test_bench(name)
+
+    def __getattr__(self, attr):
+        return getattr(self._lib, attr)
+
+
+# Every (library, test bench, config) added through named_config, in the order
+# they were added.
+CONFIGS = []
+
+# Number of packets sent by the test benches that support offline checking, or
+# None to check their output in the simulator as usual.
+OFFLINE_PACKETS = None
+
+# If True, test benches that check offline and support it send the packets of
+# a pre-generated file instead of random packets, see axis_stimulus.
+STIM_FILES = False
+
+# If True, only the characterization configs are added, see perf_configs
+CHARACTERIZE = False
+
+
+def named_config(tb, map: dict, model_check=None, stimulus=None):
+    """
+    Add a config named after its generics. model_check is the post_check to
+    use when the test bench checks its output offline, see offline_check.
+    stimulus returns the packet file and pre_config for a generic map, see
+    axis_stimulus.
+    """
+    if isinstance(tb, SkippedTestBench) or CHARACTERIZE:
+        return
     cfg_name = "-".join([f"{k}={v}" for k, v in map.items()])
-    tb.add_config(name=cfg_name, generics = map)
+    # In a seed sweep, the config is replaced by its seeded copies
+    for name, sim_options in sim_seeds.expand(tb, cfg_name):
+        if model_check is not None and OFFLINE_PACKETS is not None:
+            generics = {**map, "G_CHECK_OFFLINE": True, "G_NUM_PACKETS": OFFLINE_PACKETS}
+            pre_config = None
+            if stimulus is not None and STIM_FILES:
+                stim_file, pre_config = stimulus(map)
+                generics["G_STIM_FILE"] = str(stim_file)
+            tb.add_config(
+                name=name, generics = generics, pre_config = pre_config, post_check = model_check,
+                sim_options = sim_options,
+            )
+        else:
+            tb.add_config(name=name, generics = map, sim_options = sim_options)
+        CONFIGS.append((tb.library.name, tb.name, name))
+
+
+def named_configs(tb, generics: dict, constraint=None, coverage: str | None = None, model_check=None, stimulus=None):
+    """
+    Add a named config for each generic map in the expansion of generics
+    """
+    for cfg in sim_coverage.expand(generics, constraint, coverage):
+        named_config(tb, cfg, model_check, stimulus)
+
+
+def perf_configs(tb, generics: dict, constraint=None):
+    """
+    Add a characterization config for each generic map in the full product of
+    generics, in characterization mode only. The configs set G_PERF and
+    record their figures with sim_perf.
+    """
+    if isinstance(tb, SkippedTestBench) or not CHARACTERIZE:
+        return
+    for cfg in sim_coverage.expand(generics, constraint, "full"):
+        name = "-".join([f"{k}={v}" for k, v in cfg.items()])
+        tb.add_config(
+            name=name, generics = {**cfg, "G_PERF": True},
+            post_check = sim_perf.post_check(tb.name, name, cfg),
+        )
+        CONFIGS.append((tb.library.name, tb.name, name))
+
+
+def seeded_default_configs(lib):
+    """
+    Add the seeded copies of the default config of every test bench without
+    named configs, during a seed sweep
+    """
+    configured = {tb for l, tb, _ in CONFIGS if l == lib.name}
+    for tb in lib.get_test_benches(allow_empty=True):
+        if tb.name in configured:
+            continue
+        for name, sim_options in sim_seeds.expand(tb, None):
+            tb.add_config(name=name, sim_options = sim_options)
+            CONFIGS.append((lib.name, tb.name, name))
+
+
+def offline_check(model: str, **kwargs):
+    """
+    Return a VUnit post_check that checks the streams dumped by a test bench
+    with tools/models/<model>.py. The models need NumPy, so they are only
+    imported once a check runs.
+    """
+    def post_check(output_path):
+        import importlib
+        return importlib.import_module(f"models.{model}").post_check(output_path, **kwargs)
+    return post_check
+
+
+def trace_replay(tb, model: str, **kwargs):
+    """
+    Make every config of a test bench trace its handshakes with G_TRACE, and
+    replay the trace through the transaction-level model in
+    tools/models/<model>.py after each test. Must be called before the
+    configs are added, since they copy the default config.
+    """
+    if CHARACTERIZE:
+        return
+    tb.set_generic("G_TRACE", True)
+    tb.set_post_check(offline_check(model, **kwargs))
+
+
+# Names of the runtime generics of each (library, test bench)
+RUNTIME_GENERICS = {}
+
+
+def runtime_generics(tb, names: list[str]):
+    """
+    Mark generics of a test bench that only set up the test, such as stall
+    probabilities, and do not change the design. Configs that only differ in
+    these share one elaborated test bench where the simulator supports it,
+    see sim_elab.py.
+    """
+    if isinstance(tb, SkippedTestBench):
+        return
+    RUNTIME_GENERICS[(tb.library.name, tb.name)] = set(names)
+
+
+# Serializes the generation of packet files, which configs running in
+# parallel may share
+_stimulus_lock = threading.Lock()
+
+
+def axis_stimulus(kw: int, dbw: int, ubw: int, packed: bool, max_lanes: int):
+    """
+    Return the packet file of OFFLINE_PACKETS random packets of 1 to max_lanes
+    lanes on a bus with kw lanes, and a VUnit pre_config that generates it
+    with tools/models/axis_traffic.py if it is not up to date. Every config
+    with the same bus shares the file. The models need NumPy, so they are only
+    imported when packet files are used.
+    """
+    from models import axis_traffic
+    name = axis_traffic.file_name(kw, dbw, ubw, packed, OFFLINE_PACKETS, max_lanes)
+    path = GEN_DIR / "axis_traffic" / name
+    def pre_config(output_path):
+        with _stimulus_lock:
+            axis_traffic.generate(path, kw, dbw, ubw, packed, OFFLINE_PACKETS, max_lanes)
+        return True
+    return path, pre_config
+
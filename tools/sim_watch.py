@@ -0,0 +1,213 @@
+################################################################################
+# File : sim_watch.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Watch mode for sim.py
+# ..Waits for saved changes to the HDL sources and register TOML files, then
+# regenerates the registers of any changed TOML file and re-runs only the test
+# benches whose dependency closure includes a changed file. The source index
+# stays in memory between runs, and each run is a lazy sim.py run in the same
+# output path, so VUnit only recompiles the changed files and their
+# dependents. Changes are picked up with inotify on Linux, and by polling
+# elsewhere.
+################################################################################
+
+import ctypes
+import ctypes.util
+import glob
+import os
+import select
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import sim_index
+import sim_utils
+
+SCRIPT_DIR = Path(__file__).parent
+
+# Directories watched for changes, and the register files within them
+WATCH_DIRS = [sim_utils.ROOT_DIR / "src", sim_utils.ROOT_DIR / "lib", sim_utils.ROOT_DIR / "test"]
+REGS_PATTERN = sim_utils.ROOT_DIR / "src" / "**" / "regs" / "*.toml"
+
+# Time to wait for an editor to finish writing a set of files, and the polling
+# interval when inotify is not available, in seconds
+SETTLE_TIME = 0.2
+POLL_INTERVAL = 1.0
+
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+class Inotify:
+    """
+    Minimal inotify wrapper that reports that something changed below a set
+    of directory trees, without caring about what
+    """
+
+    def __init__(self, roots: list[Path]):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.roots = roots
+        self._watched = set()
+        self.add_watches()
+
+    def add_watches(self):
+        """
+        Watch every directory below the roots, including new ones
+        """
+        for root in self.roots:
+            for path, _, _ in os.walk(root):
+                if path not in self._watched:
+                    self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+                    self._watched.add(path)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Wait for changes and return True once there were any
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        # Let the editor finish, then drain all pending events
+        time.sleep(SETTLE_TIME)
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        self.add_watches()
+        return True
+
+
+class Poller:
+    """
+    Fallback for systems without inotify that reports a change whenever the
+    size or modification time of any watched file changes
+    """
+
+    def __init__(self, roots: list[Path]):
+        self.roots = roots
+        self._state = self._scan()
+
+    def _scan(self) -> dict:
+        state = {}
+        for root in self.roots:
+            for path, _, names in os.walk(root):
+                for name in names:
+                    try:
+                        st = os.stat(os.path.join(path, name))
+                    except OSError:
+                        continue
+                    state[os.path.join(path, name)] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def wait(self, timeout: float | None = None) -> bool:
+        time.sleep(POLL_INTERVAL)
+        state = self._scan()
+        changed = state != self._state
+        self._state = state
+        return changed
+
+
+def regs_state() -> dict[str, int]:
+    return {f: os.stat(f).st_mtime_ns for f in glob.glob(str(REGS_PATTERN), recursive=True)}
+
+
+def changed_files(old: sim_index.Index, new: sim_index.Index) -> set[str]:
+    """
+    Return the files that were added to or changed in an index
+    """
+    return {
+        f for f, entry in new.files.items()
+        if f not in old.files
+        or (old.files[f]["mtime"], old.files[f]["size"]) != (entry["mtime"], entry["size"])
+    }
+
+
+def affected_test_benches(index: sim_index.Index, changed: set[str], selected: list[str] | None) -> list[str]:
+    """
+    Return the test benches whose dependency closure includes a changed file,
+    out of the selected test benches, or all of them if selected is None
+    """
+    result = []
+    for tb, f in index.test_benches().items():
+        if selected is not None and tb not in selected:
+            continue
+        if changed.intersection(index.closure([f])):
+            result.append(tb)
+    return sorted(result)
+
+
+def main(test_patterns, sim_argv: list[str]):
+    """
+    Watch for changes until interrupted. test_patterns limits the test benches
+    that are run, and sim_argv is passed on to every sim.py run.
+    """
+    roots = [d for d in WATCH_DIRS if d.exists()]
+    try:
+        watcher = Inotify(roots)
+    except (OSError, AttributeError):
+        print("INFO: inotify is not available, polling for changes instead.")
+        watcher = Poller(roots)
+
+    index = sim_index.Index(sim_utils.SOURCES)
+    index.save()
+    regs = regs_state()
+    selected = None
+    if isinstance(test_patterns, list):
+        selected = sim_index.match_test_benches(index.test_benches(), "lib", test_patterns)
+    print(f"INFO: Watching {len(index.files)} source file(s) and {len(regs)} register file(s). Press Ctrl+C to stop.")
+
+    try:
+        while True:
+            if not watcher.wait():
+                continue
+
+            # Regenerate the registers of changed TOML files first, so that
+            # their generated packages are part of the same run
+            new_regs = regs_state()
+            changed_regs = sorted(f for f, t in new_regs.items() if regs.get(f) != t)
+            regs = new_regs
+            if changed_regs:
+                print(f"INFO: Regenerating registers for {len(changed_regs)} file(s)")
+                subprocess.run([sys.executable, str(SCRIPT_DIR / "regs.py"), *changed_regs], cwd=SCRIPT_DIR)
+
+            try:
+                new_index = sim_index.Index(sim_utils.SOURCES)
+            except OSError:
+                # A file was moved while it was scanned, try again on the
+                # next change
+                continue
+            new_index.save()
+            changed = changed_files(index, new_index)
+            index = new_index
+            if not changed:
+                continue
+            if isinstance(test_patterns, list):
+                selected = sim_index.match_test_benches(index.test_benches(), "lib", test_patterns)
+            test_benches = affected_test_benches(index, changed, selected)
+            names = ", ".join(Path(f).name for f in sorted(changed))
+            if not test_benches:
+                print(f"INFO: Changed {names}, no test benches affected.")
+                continue
+
+            print(f"INFO: Changed {names}, running {len(test_benches)} test bench(es).")
+            patterns = [f"lib.{tb}.*" for tb in test_benches]
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, str(SCRIPT_DIR / "sim.py"), *sim_argv, "--lazy", *patterns], cwd=SCRIPT_DIR)
+            status = "passed" if result.returncode == 0 else "FAILED"
+            print(f"INFO: Run {status} in {time.perf_counter() - start:.1f} s. Watching for changes...")
+    except KeyboardInterrupt:
+        print()
@@ -0,0 +1,94 @@
+################################################################################
+# File : sim_waves.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Waveform capture for failing tests
+# ..The suite runs without writing any waves. Each failing test is then run
+# again on its own, with the seed that VUnit recorded for it, while dumping a
+# wave file into the test's output path. The wave file paths are attached to
+# the xunit report. A failed run of a seed sweep is re-run as its original
+# config, with the seed of that run.
+################################################################################
+
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import sim_seeds
+
+SCRIPT_DIR = Path(__file__).parent
+
+# Wave file format written by each simulator
+WAVE_FORMATS = {"nvc": "fst", "ghdl": "ghw"}
+
+# Limit on the number of failures that are re-run, so that a broken build
+# does not run the whole suite twice
+MAX_RERUNS = 10
+
+
+def sim_flags(simulator: str, wave_file: Path) -> list[str]:
+    """
+    Return the simulator flags that dump all signals to a wave file
+    """
+    if simulator == "nvc":
+        return ["--dump-arrays", f"--wave={wave_file}"]
+    return [f"--wave={wave_file}"]
+
+
+def rerun_failures(results, simulator: str, argv: list[str]) -> dict[str, Path]:
+    """
+    Re-run every failed test from a VUnit post_run results object with wave
+    capture, passing argv to sim.py. The seed is repeated from the VUnit test
+    history in the same output path. Returns the wave file of each test.
+    """
+    failed = [(name, test) for name, test in results.get_report().tests.items() if test.status == "failed"]
+    if not failed:
+        return {}
+    if len(failed) > MAX_RERUNS:
+        print(f"WARNING: {len(failed)} tests failed, only capturing waves for the first {MAX_RERUNS}.")
+
+    waves = {}
+    print(f"INFO: Re-running {min(len(failed), MAX_RERUNS)} failed test(s) with wave capture.")
+    for name, test in failed[:MAX_RERUNS]:
+        wave_file = test.path.resolve() / f"wave.{WAVE_FORMATS.get(simulator, 'fst')}"
+        log_file = test.path.parent / f"{test.path.name}_wave.log"
+        seed, test = "repeat", name
+        if sim_seeds.reproduction(name) is not None:
+            test, seed = sim_seeds.reproduction(name)
+        cmd = [sys.executable, str(SCRIPT_DIR / "sim.py"), *argv, "--seed", seed, "--wave-file", str(wave_file), test]
+        with open(log_file, "w") as log:
+            returncode = subprocess.run(cmd, cwd=SCRIPT_DIR, stdout=log, stderr=subprocess.STDOUT).returncode
+        if not wave_file.exists():
+            print(f"WARNING: No waves captured for {name}, see {log_file}")
+            continue
+        if returncode == 0:
+            print(f"WARNING: {name} passed when it was re-run with the same seed.")
+        print(f"INFO: Waves for {name}: {wave_file}")
+        waves[name] = wave_file
+    return waves
+
+
+def attach(xunit_file: Path, waves: dict[str, Path]):
+    """
+    Add the wave file of each test to an xunit report, both as a property and
+    as a Jenkins style attachment in its output
+    """
+    tree = ET.parse(xunit_file)
+    for tc in tree.getroot().iter("testcase"):
+        name = tc.get("name")
+        if tc.get("classname"):
+            name = f"{tc.get('classname')}.{name}"
+        if name not in waves:
+            continue
+        properties = tc.find("properties")
+        if properties is None:
+            properties = ET.Element("properties")
+            tc.insert(0, properties)
+        ET.SubElement(properties, "property", name="wave_file", value=str(waves[name]))
+        out = tc.find("system-out")
+        if out is None:
+            out = ET.SubElement(tc, "system-out")
+        out.text = (out.text or "") + f"\n[[ATTACHMENT|{waves[name]}]]\n"
+    tree.write(xunit_file, encoding="unicode")
@@ -0,0 +1,172 @@
+################################################################################
+# File : style.py
+# Auth : David Gussler
+# Lang : python3
+# ==============================================================================
+# Incremental VHDL style check
+# ..Runs vsg over only the files that changed since they were last checked.
+# The violations and output of every file are cached, keyed on the file's
+# content, the vsg rules file and the vsg version. The changed files are
+# checked by one vsg run spread over a process pool, and the results of all
+# files are merged into one quality report in the same format that
+# `vsg --quality_report` writes.
+#
+# Usage:
+#   python style.py -c <vsg_rules.yaml> [--quality_report <report.json>]
+#                   [-p <jobs>] <files...>
+################################################################################
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from importlib.metadata import version
+from pathlib import Path
+
+from vsg.report import quality_report
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT_DIR = SCRIPT_DIR.parent
+CACHE_FILE = ROOT_DIR / "build" / "style_cache.json"
+
+# Header that vsg prints in front of the output of each file, and the error it
+# prints for a file that it could not parse
+PARSE_ERROR = re.compile(r"^Error while processing (.+?): ", re.MULTILINE)
+FILE_HEADER = re.compile(r"^={80}\nFile:  (.+)\n={80}\n", re.MULTILINE)
+
+
+def load_cache() -> dict:
+    try:
+        return json.loads(CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache: dict):
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = CACHE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache, indent=2, sort_keys=True))
+    tmp.replace(CACHE_FILE)
+
+
+def file_key(path: str, rules_key: str) -> str:
+    """
+    Return the hash that determines whether a file must be checked again
+    """
+    h = hashlib.sha256(rules_key.encode())
+    h.update(Path(path).read_bytes())
+    return h.hexdigest()
+
+
+def cache_name(path: str) -> str:
+    """
+    Return the cache entry name of a file, relative to the repository root so
+    that the cache can be restored into another checkout
+    """
+    p = Path(path).resolve()
+    return p.relative_to(ROOT_DIR).as_posix() if p.is_relative_to(ROOT_DIR) else str(p)
+
+
+def split_output(output: str) -> dict[str, str]:
+    """
+    Split the output of a vsg run into the output of each file
+    """
+    result = {}
+    matches = list(FILE_HEADER.finditer(output))
+    for m, end in zip(matches, [m.start() for m in matches[1:]] + [len(output)]):
+        result[m.group(1)] = output[m.start():end]
+    return result
+
+
+def run_vsg(files: list[str], rules: Path, jobs: int) -> tuple[int, dict[str, str], dict[str, list]]:
+    """
+    Check a set of files with one vsg run, and return the exit code, and the
+    output and violations of each file that vsg could parse
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = Path(tmp) / "style.json"
+        cmd = [
+            "vsg", "-f", *files, "-c", str(rules), "-of", "vsg", "--all_phases",
+            "--json", str(json_file), "-p", str(jobs),
+        ]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        try:
+            entries = json.loads(json_file.read_text())["files"]
+        except (OSError, ValueError):
+            entries = []
+    print(result.stderr, end="", file=sys.stderr)
+    unparsed = set(PARSE_ERROR.findall(result.stderr))
+    violations = {e["file_path"]: e["violations"] for e in entries if e["file_path"] not in unparsed}
+    return result.returncode, split_output(result.stdout), violations
+
+
+def has_errors(violations: list) -> bool:
+    return any(v["severity"] == "Error" for v in violations)
+
+
+def main(files: list[str], rules: Path, report: Path | None, jobs: int) -> bool:
+    """
+    Check the style of a set of files and return True if all of them passed
+    """
+    cache = load_cache()
+    rules_key = f"{version('vsg')}\n{rules.read_text()}"
+    keys = {f: file_key(f, rules_key) for f in files}
+
+    stale = [f for f in files if cache.get(cache_name(f), {}).get("key") != keys[f]]
+    results = {f: cache[cache_name(f)] for f in files if f not in stale}
+
+    if stale:
+        print(f"INFO: Checking {len(stale)} of {len(files)} file(s), {len(files) - len(stale)} unchanged.")
+        returncode, outputs, violations = run_vsg(stale, rules, max(1, min(jobs, len(stale))))
+        for f in stale:
+            if f not in violations:
+                continue
+            results[f] = {"key": keys[f], "violations": violations[f], "output": outputs.get(f, "")}
+        # Files that vsg could not parse are not cached, so that they are
+        # checked again next time. If vsg failed without reporting any
+        # errors, nothing from the run is trusted.
+        missing = [f for f in stale if f not in results]
+        if returncode != 0 and not any(has_errors(results[f]["violations"]) for f in stale if f in results):
+            missing = stale
+        for f in stale:
+            if f not in missing:
+                cache[cache_name(f)] = results[f]
+        save_cache(cache)
+    else:
+        missing = []
+        print(f"INFO: All {len(files)} file(s) are unchanged.")
+
+    # Show the full output of every file that failed, fresh or cached
+    failed = [f for f in files if f in results and has_errors(results[f]["violations"])]
+    for f in failed:
+        print(results[f]["output"])
+
+    if report is not None:
+        # Build the report the same way vsg does, so that the fingerprints
+        # match those of a single vsg run over all files
+        entries = [{"file_path": f, "violations": results[f]["violations"]} for f in files if f in results]
+        report.parent.mkdir(parents=True, exist_ok=True)
+        report.write_text(json.dumps(quality_report.build_report({"files": entries}), indent=2) + "\n")
+
+    for f in missing:
+        print(f"ERROR: vsg did not check {f}")
+    print(f"INFO: {len(failed)} of {len(files)} file(s) have style errors.")
+    return not failed and not missing
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental VHDL style check")
+    parser.add_argument("files", nargs="+", help="VHDL files to check")
+    parser.add_argument("-c", "--configuration", type=Path, required=True, help="vsg rules file")
+    parser.add_argument("--quality_report", type=Path, help="Code quality report to write")
+    parser.add_argument(
+        "-p", "--jobs", type=int, default=os.cpu_count(),
+        help="Number of vsg worker processes",
+    )
+    args = parser.parse_args()
+    if not main(args.files, args.configuration, args.quality_report, args.jobs):
+        sys.exit(1)